@@ -0,0 +1,318 @@
+"""
+Agent Execution Runtime
+
+Awaitable execution layer shared by the Planner, Generator and Healer agents.
+
+The agents used to call time.sleep() inside async handlers, which froze the
+whole event loop for the duration of the "AI thinking" time. Everything that
+waits (simulated reasoning or a delegated LLM call) now goes through
+asyncio primitives, and CPU-bound artifact building runs in the default
+thread pool, so a single worker can serve many agent calls concurrently.
+
+The reasoning phase is an LLM call through the configured backend
+(app/llm_backends.py); the default "simulated" backend just waits for the
+agent's think time. Per-item prompts (one per test case) are micro-batched
+into a few backend requests (app/micro_batcher.py). Prompts are assembled
+with shared prefixes by app/prompt_cache.py.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+
+from app.determinism import rng_for
+from app.llm_backends import (
+    DISCOUNT_SERVICE_TIER, LLMRequest, LLMResponse, join_prompts, resolve_model, split_results
+)
+from app.metrics import AGENTS_IN_FLIGHT, registry, time_stage
+from app.micro_batcher import MicroBatcher
+from app.prompt_cache import prompt_cache
+from app.resilience import llm_client, response_cost
+
+T = TypeVar("T")
+
+# Simulated reasoning time per agent (seconds, min/max)
+AGENT_THINK_TIME = {
+    "planner": (1.5, 2.5),
+    "generator": (2.0, 3.0),
+    "healer": (1.5, 2.5),
+    "execution": (2.5, 3.5),
+}
+
+
+class AgentRuntimeStats:
+    """Counters for agent executions on this worker"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "inFlight": self.in_flight,
+            "peakInFlight": self.peak_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+runtime_stats = AgentRuntimeStats()
+
+
+async def simulate_thinking(agent: str, think_time: Tuple[float, float] = None, key: str = "") -> float:
+    """
+    Wait for the simulated reasoning time of an agent without blocking the loop.
+
+    In deterministic mode the time is drawn from the seed, the agent and `key`
+    (e.g. the prompt), so the same call always waits the same time.
+
+    Returns the number of seconds waited.
+    """
+    low, high = think_time or AGENT_THINK_TIME.get(agent, (1.0, 2.0))
+    delay = rng_for("think", agent, key).uniform(low, high)
+    await asyncio.sleep(delay)
+    return delay
+
+
+async def reason(
+    agent: str,
+    model: Optional[str] = None,
+    prompt: str = "",
+    think_time: Tuple[float, float] = None,
+    context: str = ""
+) -> Optional[LLMResponse]:
+    """
+    The agent's reasoning phase: one LLM call through the configured backend.
+
+    The call is hedged and circuit-broken (app/resilience.py), and each
+    attempt first waits for the model's RPM/TPM budget (app/rate_limiter.py).
+
+    `prompt` is the task; it is sent after the shared system prompt, the
+    application `context` and the agent's instructions (app/prompt_cache.py).
+
+    An explicit think_time skips the backend and only waits that long
+    (used when a stored analysis is reused, and by tests).
+    """
+    if think_time is not None:
+        await simulate_thinking(agent, think_time)
+        return None
+
+    model = resolve_model(model)
+    with time_stage(agent, "reason"):
+        response = await llm_client.complete(LLMRequest(agent, model, prompt_cache.build(agent, model, context, prompt)))
+    prompt_cache.record_usage(response)
+    return response
+
+
+# Completion tokens budgeted per item of a batched prompt
+BATCH_ITEM_MAX_TOKENS = 256
+
+
+class ItemCompletion(NamedTuple):
+    text: str
+    cost_usd: float  # this item's share of its batch's cost
+    batch_size: int
+
+
+async def _send_prompt(key: Hashable, prompt: str, max_tokens: int) -> LLMResponse:
+    agent, model, service_tier, context = key
+    response = await llm_client.complete(LLMRequest(
+        agent, model, prompt_cache.build(agent, model, context, prompt),
+        max_tokens=max_tokens,
+        service_tier=service_tier
+    ))
+    prompt_cache.record_usage(response)
+    return response
+
+
+async def _send_prompt_batch(key: Hashable, prompts: List[str]) -> List[Any]:
+    """
+    One backend request for a whole batch of prompts, split back out in order.
+    Prompts whose result the model left out of the batched answer are sent
+    again on their own; if that fails too, only that item fails (the
+    exception is its result), not the whole batch.
+    """
+    response = await _send_prompt(key, join_prompts(prompts), BATCH_ITEM_MAX_TOKENS * len(prompts))
+    share = response_cost(response) / len(prompts)
+    completions: List[Any] = [
+        text if text is None else ItemCompletion(text, share, len(prompts))
+        for text in split_results(response.text, len(prompts))
+    ]
+
+    missing = [index for index, completion in enumerate(completions) if completion is None]
+    retries = await asyncio.gather(
+        *(_send_prompt(key, prompts[index], BATCH_ITEM_MAX_TOKENS) for index in missing),
+        return_exceptions=True
+    )
+    for index, retry in zip(missing, retries):
+        # Answered alone; its share of the batch was paid for as well
+        completions[index] = retry if isinstance(retry, Exception) else ItemCompletion(
+            retry.text, share + response_cost(retry), 1
+        )
+    return completions
+
+
+# Realtime batches, and bigger, slower-filling ones sent on the discounted service tier
+prompt_batcher = MicroBatcher(
+    "realtime", _send_prompt_batch,
+    max_batch_size=int(os.getenv("QA_AGENT_BATCH_SIZE", "16")),
+    max_wait_ms=float(os.getenv("QA_AGENT_BATCH_WAIT_MS", "20")),
+)
+discount_prompt_batcher = MicroBatcher(
+    "discount", _send_prompt_batch,
+    max_batch_size=int(os.getenv("QA_AGENT_DISCOUNT_BATCH_SIZE", "64")),
+    max_wait_ms=float(os.getenv("QA_AGENT_DISCOUNT_BATCH_WAIT_MS", "500")),
+)
+
+
+async def reason_each(
+    agent: str,
+    model: Optional[str],
+    prompts: List[str],
+    discount: bool = False,
+    context: str = ""
+) -> List[ItemCompletion]:
+    """
+    Per-item reasoning: one prompt per item, micro-batched into a few backend
+    requests (also across concurrent agent runs for the same model and
+    context). Results come back in prompt order.
+
+    With discount=True, batches go out on the discounted service tier
+    (cheaper, higher latency).
+    """
+    batcher, key = _batch_key(agent, model, discount, context)
+    with time_stage(agent, "reason"):
+        return await batcher.submit_many(key, prompts)
+
+
+async def stream_each(
+    agent: str,
+    model: Optional[str],
+    prompts: List[str],
+    discount: bool = False,
+    context: str = ""
+) -> AsyncIterator[ItemCompletion]:
+    """
+    reason_each, yielding each item's completion in prompt order as soon as
+    it (and every item before it) is back, so callers can stream the first
+    batch's results while later batches are still in flight.
+    """
+    batcher, key = _batch_key(agent, model, discount, context)
+    # All items are queued up front, so they batch exactly as in reason_each
+    tasks = [asyncio.ensure_future(batcher.submit(key, prompt)) for prompt in prompts]
+    try:
+        with time_stage(agent, "reason"):
+            for task in tasks:
+                yield await task
+    finally:
+        # The consumer stopped early (e.g. the client disconnected)
+        for task in tasks:
+            task.cancel()
+
+
+def _batch_key(agent: str, model: Optional[str], discount: bool, context: str) -> Tuple[MicroBatcher, Hashable]:
+    """Batcher and batch key for per-item prompts (discount batches use the discounted service tier)"""
+    if discount:
+        batcher, service_tier = discount_prompt_batcher, DISCOUNT_SERVICE_TIER
+    else:
+        batcher, service_tier = prompt_batcher, None
+    return batcher, (agent, resolve_model(model), service_tier, context)
+
+
+async def run_in_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a CPU-bound artifact builder off the event loop"""
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def execute_agent(
+    agent: str,
+    build: Callable[..., T],
+    *args: Any,
+    think_time: Tuple[float, float] = None,
+    model: Optional[str] = None,
+    prompt: str = "",
+    context: str = "",
+    **kwargs: Any
+) -> T:
+    """
+    Execute one agent run: await the reasoning phase, then build the artifact.
+
+    Args:
+        agent: Agent name ('planner', 'generator', 'healer')
+        build: Synchronous function producing the agent artifact
+        think_time: Optional (min, max) override for the simulated reasoning time
+        model: Model named in the agent request (resolved to an LLM_CATEGORIES id)
+        prompt: Task prompt sent to the LLM backend
+        context: Application context placed before the agent instructions (shared prefix)
+
+    Returns:
+        Whatever `build` returns
+    """
+    runtime_stats.in_flight += 1
+    runtime_stats.peak_in_flight = max(runtime_stats.peak_in_flight, runtime_stats.in_flight)
+    # Read once, so the gauge is decremented only if it was incremented
+    instrumented = registry.enabled
+    if instrumented:
+        AGENTS_IN_FLIGHT.inc(agent)
+    try:
+        await reason(agent, model, prompt, think_time, context)
+        with time_stage(agent, "build"):
+            result = await run_in_thread(build, *args, **kwargs)
+        runtime_stats.completed += 1
+        return result
+    except Exception:
+        runtime_stats.failed += 1
+        raise
+    finally:
+        runtime_stats.in_flight -= 1
+        if instrumented:
+            AGENTS_IN_FLIGHT.dec(agent)
+
+
+async def iter_bounded(
+    calls: Iterable[Callable[[], Awaitable[T]]],
+    limit: int
+) -> AsyncIterator[Tuple[int, Any, float]]:
+    """
+    Run zero-argument coroutine factories with at most `limit` in flight.
+
+    Yields (index, result_or_exception, elapsed_seconds) in completion order.
+    Only `limit` tasks exist at any time, so very large batches don't create
+    thousands of idle tasks up front.
+    """
+
+    async def timed_call(index: int, call: Callable[[], Awaitable[T]]):
+        start = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as e:
+            result = e
+        return index, result, time.perf_counter() - start
+
+    pending_calls = iter(enumerate(calls))
+    in_flight = set()
+
+    def launch_next() -> bool:
+        try:
+            index, call = next(pending_calls)
+        except StopIteration:
+            return False
+        in_flight.add(asyncio.create_task(timed_call(index, call)))
+        return True
+
+    try:
+        while len(in_flight) < limit and launch_next():
+            pass
+
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                in_flight.discard(task)
+                yield task.result()
+                launch_next()
+    finally:
+        for task in in_flight:
+            task.cancel()
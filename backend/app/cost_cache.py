@@ -0,0 +1,140 @@
+"""
+Cost Result Cache
+
+Memoization of calculate_costs. Most /api/cost/calculate traffic repeats a
+small set of configurations (tier defaults, common user counts), and each
+one rebuilds every breakdown from scratch.
+
+A result is keyed on a canonical hash of the request *after*
+apply_service_tier_config, so requests that differ only in fields the tier
+overrides (llm_mix, caching, reserved instances) share an entry. Every
+lookup passes the current pricing data version; when it changes, all
+entries are dropped, so a result is never served against prices it wasn't
+calculated with. Requests that use measured cache hit rates depend on live
+traffic and are not cached.
+
+Entries expire after a TTL and the cache is bounded with LRU eviction.
+Memory use is estimated from each result's JSON size. Cached responses are
+shared between callers and must be treated as read-only.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.metrics import CACHE_BYTES, CACHE_ENTRIES, CACHE_HIT_RATIO, CACHE_LOOKUPS, registry
+
+CACHE_NAME = "cost"
+
+
+def cost_cache_key(params: BaseModel) -> str:
+    """SHA-256 of the canonical JSON encoding of a tier-applied cost request"""
+    canonical = json.dumps(params.model_dump(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CostCache:
+    """Size-bounded LRU cache with per-entry TTL, invalidated on pricing version changes"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version: Optional[str] = None
+        # key → (stored_at, estimated bytes, response)
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _check_version(self, version: str):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self.version = version
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def get(self, key: str, version: str) -> Optional[Any]:
+        self._check_version(version)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            if registry.enabled:
+                CACHE_LOOKUPS.inc(CACHE_NAME, "miss")
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if registry.enabled:
+            CACHE_LOOKUPS.inc(CACHE_NAME, "hit")
+        return entry[2]
+
+    def put(self, key: str, version: str, response: BaseModel):
+        if not self.enabled:
+            return
+        self._check_version(version)
+        if key in self._entries:
+            self._remove(key)
+        size = len(response.model_dump_json())
+        self._entries[key] = (time.monotonic(), size, response)
+        self.bytes += size
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def collect_metrics(self):
+        """Refresh the cache gauges (run at each /metrics scrape)"""
+        CACHE_ENTRIES.set(len(self._entries), CACHE_NAME)
+        CACHE_BYTES.set(self.bytes, CACHE_NAME)
+        CACHE_HIT_RATIO.set(round(self.hit_rate(), 4), CACHE_NAME)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "estimatedBytes": self.bytes,
+            "pricingVersion": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hit_rate(), 4),
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Singleton instance
+cost_cache = CostCache(
+    max_entries=int(os.getenv("QA_AGENT_COST_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("QA_AGENT_COST_CACHE_TTL", "600")),
+)
+registry.add_collector(cost_cache.collect_metrics)
@@ -0,0 +1,54 @@
+"""
+Deterministic Mode
+
+With QA_AGENT_SEED set, every random draw the agents make comes from a
+generator seeded with it:
+
+- rng_for(*parts): a generator derived from the seed and the content being
+  produced (e.g. the healer's commit and ticket ids for a given script and
+  log, the simulated think time for a given prompt). The same input gets the
+  same draws whatever order requests arrive in.
+- stream(): one seeded generator for draws with no natural key (retry jitter)
+
+Two runs over the same requests then produce the same artifacts and the
+same simulated latencies, so load-test results are comparable between
+commits (see load_test.py). Without a seed, draws are unseeded as before.
+Planner output is already deterministic per request (app/plan_cache.py).
+"""
+
+import hashlib
+import os
+import random
+from typing import Any, Optional
+
+_seed: Optional[int] = None
+_stream = random.Random()
+
+
+def set_seed(seed: Optional[int]):
+    """Enable deterministic mode with `seed` (None turns it off)"""
+    global _seed, _stream
+    _seed = seed
+    _stream = random.Random(seed) if seed is not None else random.Random()
+
+
+def get_seed() -> Optional[int]:
+    return _seed
+
+
+def rng_for(*parts: Any) -> random.Random:
+    """Generator for one artifact: seeded from the seed and `parts` in deterministic mode"""
+    if _seed is None:
+        return random.Random()
+    material = "\x1f".join([str(_seed), *map(str, parts)]).encode("utf-8")
+    return random.Random(int.from_bytes(hashlib.sha256(material).digest()[:8], "big"))
+
+
+def stream() -> random.Random:
+    """Shared generator for draws without a natural key"""
+    return _stream
+
+
+_configured = os.getenv("QA_AGENT_SEED")
+if _configured:
+    set_seed(int(_configured))
@@ -0,0 +1,318 @@
+"""
+Failure-Signature Index
+
+Most CI failures repeat across runs. The healer records the outcome of each
+root-cause analysis against a signature of the failure, and a later failure
+that is a near-duplicate reuses that analysis instead of running a new one.
+
+A failure's text (error messages and stack lines) is normalized first: ids,
+hex addresses, timestamps, numbers, URLs and directory prefixes are masked,
+so the same failure on another run, build or machine looks identical.
+Normalized text is indexed two ways:
+
+- exact: SHA-256 of the normalized text → entry (dict lookup)
+- similar: MinHash signature over word shingles, bucketed with LSH bands;
+  a lookup touches a fixed number of buckets, and a candidate is accepted
+  when its estimated Jaccard similarity reaches the threshold
+
+The index is bounded (least recently seen entries are evicted) and persisted
+to a JSON file with an atomic replace, so it survives restarts.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+DEFAULT_INDEX_PATH = Path(__file__).parent.parent / "data" / "failure_index.json"
+
+# MinHash / LSH parameters (NUM_PERM = BANDS * ROWS)
+NUM_PERM = 64
+BANDS = 16
+ROWS = 4
+SHINGLE_SIZE = 2
+MINHASH_SEED = 1
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Applied in order to the lowercased text
+_NORMALIZERS = [
+    (re.compile(r"\x1b\[[0-9;]*m"), ""),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), "<uuid>"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?z?"), "<ts>"),
+    (re.compile(r"\b0x[0-9a-f]+\b"), "<hex>"),
+    (re.compile(r"\b[0-9a-f]{12,}\b"), "<hex>"),
+    (re.compile(r"https?://\S+"), "<url>"),
+    (re.compile(r"(?:[a-z]:)?(?:[\\/][\w.@-]+)+[\\/]"), ""),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+# Stored with the index; signatures built with other parameters aren't comparable
+_PARAMS = {"numPerm": NUM_PERM, "bands": BANDS, "shingleSize": SHINGLE_SIZE, "seed": MINHASH_SEED}
+
+_PERMUTATIONS = [
+    (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+    for rng in [random.Random(MINHASH_SEED)]
+    for _ in range(NUM_PERM)
+]
+
+
+def normalize_failure(text: str) -> str:
+    """Mask the run-specific parts of a failure message or stack trace"""
+    text = text.lower()
+    for pattern, replacement in _NORMALIZERS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def shingles(normalized: str, size: int = SHINGLE_SIZE) -> set:
+    """
+    Word 1..size-gram shingles, hashed to 32 bits (stable across processes).
+
+    Error messages are short, so unigrams are included: one changed word
+    then costs a few shingles instead of most of them.
+    """
+    words = normalized.split()
+    grams = [
+        " ".join(words[i:i + n])
+        for n in range(1, size + 1)
+        for i in range(len(words) - n + 1)
+    ]
+    return {zlib.crc32(gram.encode("utf-8")) for gram in grams}
+
+
+def minhash(hashes: set) -> List[int]:
+    """MinHash signature: minimum of each universal hash permutation"""
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERM
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(left: List[int], right: List[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(left, right) if x == y) / NUM_PERM
+
+
+def _band_keys(signature: List[int]) -> List[tuple]:
+    return [tuple(signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+class SignatureMatch(NamedTuple):
+    signature_id: str
+    similarity: float  # 1.0 for an exact match
+    exact: bool
+    analysis: Dict[str, Any]
+    hits: int
+
+
+class FailureSignatureIndex:
+    """Persistent exact + MinHash/LSH index of analysed failures (thread-safe)"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 10000,
+        threshold: float = 0.8,
+        save_interval: float = 5.0
+    ):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.save_interval = save_interval
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._buckets: List[Dict[tuple, set]] = [{} for _ in range(BANDS)]
+        self._dirty = False
+        self._last_saved = 0.0
+
+        self.lookups = 0
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.evictions = 0
+
+        if self.path is not None:
+            self.load()
+
+    # ---------- lookup / record ----------
+
+    def lookup(self, failure_text: str) -> Optional[SignatureMatch]:
+        """Find a previously analysed failure that is the same or a near-duplicate"""
+        normalized = normalize_failure(failure_text)
+        signature_id = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(signature_id)
+            if entry is not None:
+                self.exact_hits += 1
+                return self._touch(signature_id, entry, 1.0, exact=True)
+
+        signature = minhash(shingles(normalized))
+
+        with self._lock:
+            best_id, best_similarity = None, 0.0
+            for band, key in enumerate(_band_keys(signature)):
+                for candidate_id in self._buckets[band].get(key, ()):
+                    similarity = estimate_similarity(signature, self._entries[candidate_id]["signature"])
+                    if similarity > best_similarity:
+                        best_id, best_similarity = candidate_id, similarity
+
+            if best_id is None or best_similarity < self.threshold:
+                return None
+            self.similar_hits += 1
+            return self._touch(best_id, self._entries[best_id], best_similarity, exact=False)
+
+    def record(self, failure_text: str, analysis: Dict[str, Any]) -> str:
+        """Store the analysis for a failure; returns its signature id"""
+        normalized = normalize_failure(failure_text)
+        signature_id = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+        signature = minhash(shingles(normalized))
+        now = time.time()
+
+        with self._lock:
+            if signature_id in self._entries:
+                self._unindex(signature_id)
+            self._entries[signature_id] = {
+                "signature": signature,
+                "example": normalized[:500],
+                "analysis": analysis,
+                "hits": 0,
+                "createdAt": now,
+                "lastSeenAt": now,
+            }
+            self._index(signature_id, signature)
+
+            while len(self._entries) > self.max_entries:
+                evicted_id = next(iter(self._entries))
+                self._unindex(evicted_id)
+                del self._entries[evicted_id]
+                self.evictions += 1
+
+            self._dirty = True
+
+        self.maybe_save()
+        return signature_id
+
+    def _touch(self, signature_id: str, entry: Dict[str, Any], similarity: float, exact: bool) -> SignatureMatch:
+        entry["hits"] += 1
+        entry["lastSeenAt"] = time.time()
+        self._entries.move_to_end(signature_id)
+        self._dirty = True
+        return SignatureMatch(signature_id, round(similarity, 4), exact, entry["analysis"], entry["hits"])
+
+    def _index(self, signature_id: str, signature: List[int]):
+        for band, key in enumerate(_band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(signature_id)
+
+    def _unindex(self, signature_id: str):
+        for band, key in enumerate(_band_keys(self._entries[signature_id]["signature"])):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(signature_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    # ---------- persistence ----------
+
+    def load(self):
+        """Load entries from the index file (missing file = empty index)"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Error parsing failure index {self.path}: {e}")
+
+        if data.get("params") != _PARAMS:
+            return
+
+        with self._lock:
+            self._entries.clear()
+            self._buckets = [{} for _ in range(BANDS)]
+            entries = sorted(data.get("entries", {}).items(), key=lambda item: item[1].get("lastSeenAt", 0))
+            for signature_id, entry in entries[-self.max_entries:]:
+                self._entries[signature_id] = entry
+                self._index(signature_id, entry["signature"])
+
+    def save(self):
+        """Write the index atomically (temp file + rename)"""
+        if self.path is None:
+            return
+        with self._lock:
+            payload = json.dumps({
+                "params": _PARAMS,
+                "entries": self._entries,
+            })
+            self._dirty = False
+            self._last_saved = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".failure_index-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def maybe_save(self):
+        """Save if there are unsaved changes and the save interval has passed"""
+        if self._dirty and time.monotonic() - self._last_saved >= self.save_interval:
+            self.save()
+
+    def flush(self):
+        """Save any unsaved changes (hit counters included)"""
+        if self._dirty:
+            self.save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets = [{} for _ in range(BANDS)]
+            self._dirty = True
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.exact_hits + self.similar_hits
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "similarityThreshold": self.threshold,
+            "lookups": self.lookups,
+            "exactHits": self.exact_hits,
+            "similarHits": self.similar_hits,
+            "misses": self.lookups - hits,
+            "reuseHitRate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            "evictions": self.evictions,
+            "path": str(self.path) if self.path else None,
+        }
+
+
+def _index_path() -> Optional[str]:
+    path = os.getenv("QA_AGENT_FAILURE_INDEX", str(DEFAULT_INDEX_PATH))
+    # An empty value keeps the index in memory only
+    return path or None
+
+
+# Singleton instance
+failure_index = FailureSignatureIndex(
+    path=_index_path(),
+    max_entries=int(os.getenv("QA_AGENT_FAILURE_INDEX_SIZE", "10000")),
+    threshold=float(os.getenv("QA_AGENT_FAILURE_SIMILARITY", "0.8")),
+)
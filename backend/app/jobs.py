@@ -0,0 +1,214 @@
+"""
+Agent Job Queue
+
+Runs agent requests in the background on a bounded pool of asyncio workers,
+so callers (e.g. CI) can submit hundreds of plan/generate/heal requests,
+get a job id back immediately, and poll for the result.
+
+The pool size caps how many agent runs happen at once; the queue size caps
+how much work can be waiting. Finished jobs are retained (the earliest
+finished evicted first) so results can be fetched after completion.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from app.metrics import QUEUE_DEPTH, QUEUE_WAIT, registry
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+
+class Job:
+    """A single queued agent run"""
+
+    def __init__(self, agent: str, runner: Callable[[Any], Awaitable[Any]], request: Any):
+        self.id = uuid.uuid4().hex
+        self.agent = agent
+        self.runner = runner
+        self.request = request
+        self.status = JobStatus.QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        queue_wait = None
+        if self.started_at is not None:
+            queue_wait = round(self.started_at - self.created_at, 4)
+        run_time = None
+        if self.started_at is not None and self.finished_at is not None:
+            run_time = round(self.finished_at - self.started_at, 4)
+
+        return {
+            "jobId": self.id,
+            "agent": self.agent,
+            "status": self.status.value,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "queueWaitSeconds": queue_wait,
+            "runSeconds": run_time,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Bounded worker pool that executes queued agent jobs"""
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 1000, max_retained: int = 5000):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.max_retained = max_retained
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        # Ids of finished jobs in completion order (eviction order)
+        self._finished: Deque[str] = deque()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """Start the worker pool (called from the application lifespan)"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"agent-job-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+
+    async def stop(self):
+        """Cancel all workers; queued jobs are marked cancelled"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for job in self._jobs.values():
+            if not job.finished:
+                self._finish(job, JobStatus.CANCELLED, error="Server shutting down")
+
+    def submit(self, agent: str, runner: Callable[[Any], Awaitable[Any]], request: Any) -> Job:
+        """Queue an agent run and return its job immediately"""
+        if self._queue is None:
+            raise RuntimeError("Job manager has not been started")
+
+        job = Job(agent, runner, request)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_queue_size} jobs waiting)")
+
+        self._jobs[job.id] = job
+        self._evict_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job. Finished jobs are left untouched."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        was_running = job.status == JobStatus.RUNNING
+        self._finish(job, JobStatus.CANCELLED, error="Cancelled by client")
+        if was_running and job._task is not None:
+            job._task.cancel()
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+
+        return {
+            "workers": self.max_workers,
+            "maxQueueSize": self.max_queue_size,
+            "queueDepth": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": counts,
+        }
+
+    def collect_metrics(self):
+        """Refresh the queue depth gauge (run at each /metrics scrape)"""
+        QUEUE_DEPTH.set(self._queue.qsize() if self._queue is not None else 0, "jobs", "all")
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status != JobStatus.QUEUED:
+                    # Cancelled while waiting in the queue
+                    continue
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        if registry.enabled:
+            QUEUE_WAIT.observe(job.started_at - job.created_at, "jobs", job.agent)
+        job._task = asyncio.create_task(job.runner(job.request))
+        try:
+            result = await job._task
+            self._finish(job, JobStatus.SUCCEEDED, result=result)
+        except asyncio.CancelledError:
+            if job.status != JobStatus.CANCELLED:
+                # The worker itself is being stopped
+                job._task.cancel()
+                raise
+        except Exception as e:
+            self._finish(job, JobStatus.FAILED, error=str(e))
+        finally:
+            job._task = None
+
+    def _finish(self, job: Job, status: JobStatus, result: Any = None, error: Optional[str] = None):
+        if not job.finished:
+            self._finished.append(job.id)
+        job.status = status
+        job.finished_at = time.time()
+        job.result = result
+        job.error = error
+
+    def _evict_finished(self):
+        """Drop the earliest finished jobs once more than max_retained are stored"""
+        while len(self._jobs) > self.max_retained and self._finished:
+            self._jobs.pop(self._finished.popleft(), None)
+
+
+# Singleton instance
+job_manager = JobManager(
+    max_workers=int(os.getenv("QA_AGENT_JOB_WORKERS", "4")),
+    max_queue_size=int(os.getenv("QA_AGENT_JOB_QUEUE_SIZE", "1000")),
+    max_retained=int(os.getenv("QA_AGENT_JOB_RETAINED", "5000")),
+)
+registry.add_collector(job_manager.collect_metrics)
@@ -0,0 +1,362 @@
+"""
+LLM Backends
+
+Pluggable backend layer for the agents' LLM calls. Every backend takes an
+LLMRequest (agent, model, prompt) and returns an LLMResponse; timeouts and
+retries are handled here, per backend, so the agents only await `complete()`.
+
+Built-in backends:
+- simulated: no network, waits for the agent's simulated reasoning time
+  (the default, same behaviour as before this layer existed)
+- http: any OpenAI-compatible /chat/completions endpoint, through one pooled
+  keep-alive httpx.AsyncClient per backend; point it at the local stub
+  server (app/llm_stub_server.py) to load-test agent throughput offline
+
+The active backend is picked with QA_AGENT_LLM_BACKEND. Other backends can be
+added with register_backend().
+"""
+
+import asyncio
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+from app import determinism
+
+# Make backend/config importable regardless of the working directory
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.service_tiers import LLM_CATEGORIES
+
+# Model used when an agent request names a model we don't know
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Display names used by the frontend → model ids from LLM_CATEGORIES
+MODEL_ALIASES = {
+    "gpt-4": "gpt-4o",
+    "claude-3": "claude-3-5-haiku",
+    "gemini": "gemini-1.5-flash-8b",
+    "custom llm": "llama-3.1-8b",
+}
+
+KNOWN_MODELS = {
+    model["id"]
+    for category in LLM_CATEGORIES.values()
+    for deployment in category.values()
+    for model in deployment
+}
+
+
+def resolve_model(name: Optional[str]) -> str:
+    """Map a model name from an agent request to a model id from LLM_CATEGORIES"""
+    if not name:
+        return DEFAULT_MODEL
+    key = name.lower().replace("(simulated)", "").strip()
+    if key in KNOWN_MODELS:
+        return key
+    return MODEL_ALIASES.get(key, DEFAULT_MODEL)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+# Service tier for discounted, higher-latency processing (OpenAI "flex" / batch pricing)
+DISCOUNT_SERVICE_TIER = "flex"
+BATCH_DISCOUNT = 0.5
+
+# Several independent prompts sent as one request: each under a task header,
+# answered under the matching result header
+_BATCH_TASK_HEADER = "### TASK {index}"
+_BATCH_TASK_PATTERN = re.compile(r"^### TASK (\d+)\s*$", re.MULTILINE)
+_BATCH_RESULT_PATTERN = re.compile(r"^### RESULT (\d+)\s*$", re.MULTILINE)
+
+
+def join_prompts(prompts: List[str]) -> str:
+    """Combine independent prompts into one batched prompt"""
+    sections = [
+        f"Complete each of the {len(prompts)} independent tasks below. Answer task N under a line "
+        f"'### RESULT N', in order, and nothing else."
+    ]
+    for index, prompt in enumerate(prompts, 1):
+        sections.append(f"{_BATCH_TASK_HEADER.format(index=index)}\n{prompt}")
+    return "\n\n".join(sections)
+
+
+def count_batch_tasks(prompt: str) -> int:
+    """Number of tasks in a batched prompt (0 for a plain prompt)"""
+    return len(_BATCH_TASK_PATTERN.findall(prompt))
+
+
+def format_batch_results(results: List[str]) -> str:
+    """How a backend answers a batched prompt (used by the simulated backend and stub server)"""
+    return "\n".join(f"### RESULT {index}\n{result}" for index, result in enumerate(results, 1))
+
+
+def split_results(text: str, count: int) -> List[Optional[str]]:
+    """
+    Split a batched completion back into `count` results, in task order.
+    Models don't always follow the format: a result whose header is missing
+    or out of range is None, so the caller can retry just that task.
+    """
+    parts = _BATCH_RESULT_PATTERN.split(text)
+    results: Dict[int, str] = {int(index): body.strip() for index, body in zip(parts[1::2], parts[2::2])}
+    return [results.get(index) for index in range(1, count + 1)]
+
+
+class LLMRequest(NamedTuple):
+    agent: str
+    model: str
+    prompt: str
+    max_tokens: int = 1024
+    service_tier: Optional[str] = None
+
+
+class LLMResponse(NamedTuple):
+    text: str
+    model: str
+    backend: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_seconds: float
+    attempts: int
+    service_tier: Optional[str] = None
+    # Prompt tokens the provider served from its prompt cache (None: not reported)
+    cached_tokens: Optional[int] = None
+
+
+class LLMBackendError(Exception):
+    """Raised when a backend call fails after all retries"""
+
+    def __init__(self, backend: str, message: str):
+        super().__init__(f"{backend}: {message}")
+        self.backend = backend
+
+
+class RetryableError(Exception):
+    """A failure worth retrying (timeouts, connection errors, 429, 5xx)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMBackend:
+    """
+    Base class: per-backend timeout, retries with exponential backoff and jitter,
+    and call statistics. Subclasses implement _complete().
+    """
+
+    def __init__(self, name: str, timeout: float = 30.0, max_retries: int = 2, backoff: float = 0.5):
+        self.name = name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.requests = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_latency = 0.0
+
+    async def _complete(self, request: LLMRequest) -> Tuple[str, int, int, Optional[int]]:
+        """One attempt: returns (text, prompt_tokens, completion_tokens, cached_tokens or None)"""
+        raise NotImplementedError
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        self.requests += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            for attempt in range(1, self.max_retries + 2):
+                try:
+                    text, prompt_tokens, completion_tokens, cached_tokens = await asyncio.wait_for(
+                        self._complete(request), timeout=self.timeout
+                    )
+                    break
+                except (RetryableError, asyncio.TimeoutError) as e:
+                    if attempt > self.max_retries:
+                        raise LLMBackendError(self.name, f"{type(e).__name__} after {attempt} attempt(s): {e}")
+                    self.retries += 1
+                    delay = getattr(e, "retry_after", None) or self.backoff * (2 ** (attempt - 1))
+                    await asyncio.sleep(delay * determinism.stream().uniform(0.5, 1.0))
+
+            latency = time.perf_counter() - started
+            self.succeeded += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.total_latency += latency
+            return LLMResponse(
+                text, request.model, self.name, prompt_tokens, completion_tokens, latency, attempt,
+                request.service_tier, cached_tokens
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def close(self):
+        """Release pooled resources"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "timeoutSeconds": self.timeout,
+            "maxRetries": self.max_retries,
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "inFlight": self.in_flight,
+            "promptTokens": self.prompt_tokens,
+            "completionTokens": self.completion_tokens,
+            "avgLatencySeconds": round(self.total_latency / self.succeeded, 4) if self.succeeded else 0.0,
+        }
+
+
+class SimulatedBackend(LLMBackend):
+    """No network: waits for the agent's simulated reasoning time"""
+
+    def __init__(self, name: str = "simulated", **kwargs):
+        super().__init__(name, **kwargs)
+
+    async def _complete(self, request: LLMRequest) -> Tuple[str, int, int, Optional[int]]:
+        # Imported here: agent_runtime depends on this module
+        from app.agent_runtime import simulate_thinking
+        await simulate_thinking(request.agent, key=request.prompt)
+        text = f"[simulated {request.model} response]"
+        tasks = count_batch_tasks(request.prompt)
+        if tasks:
+            text = format_batch_results([text] * tasks)
+        completion_tokens = min(request.max_tokens, 256 * max(tasks, 1))
+        # No provider, so no cached-token count to report
+        return text, estimate_tokens(request.prompt), completion_tokens, None
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """
+    Backend for OpenAI-compatible chat completion APIs.
+
+    One httpx.AsyncClient per backend keeps connections alive and pooled
+    across agent calls (no TCP/TLS handshake per request).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        api_key: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        **kwargs
+    ):
+        super().__init__(name, **kwargs)
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to the running event loop
+        if self._client is None or self._client.is_closed:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                limits=self.limits,
+                timeout=httpx.Timeout(self.timeout),
+            )
+        return self._client
+
+    async def _complete(self, request: LLMRequest) -> Tuple[str, int, int, Optional[int]]:
+        payload = {
+            "model": request.model,
+            "messages": [{"role": "user", "content": request.prompt}],
+            "max_tokens": request.max_tokens,
+        }
+        if request.service_tier:
+            payload["service_tier"] = request.service_tier
+        try:
+            response = await self.client.post("/chat/completions", json=payload)
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            raise RetryableError(f"{type(e).__name__}: {e}")
+
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("retry-after")
+            raise RetryableError(
+                f"HTTP {response.status_code}",
+                retry_after=float(retry_after) if retry_after and retry_after.replace(".", "", 1).isdigit() else None
+            )
+        if response.status_code >= 400:
+            raise LLMBackendError(self.name, f"HTTP {response.status_code}: {response.text[:200]}")
+
+        body = response.json()
+        usage = body.get("usage") or {}
+        text = body["choices"][0]["message"]["content"]
+        return (
+            text,
+            usage.get("prompt_tokens", estimate_tokens(request.prompt)),
+            usage.get("completion_tokens", estimate_tokens(text)),
+            (usage.get("prompt_tokens_details") or {}).get("cached_tokens"),
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "baseUrl": self.base_url, "maxConnections": self.limits.max_connections}
+
+
+_BACKENDS: Dict[str, LLMBackend] = {}
+
+
+def register_backend(backend: LLMBackend):
+    """Register (or replace) a backend by name"""
+    _BACKENDS[backend.name] = backend
+
+
+def get_backend(name: Optional[str] = None) -> LLMBackend:
+    """The named backend, or the one selected with QA_AGENT_LLM_BACKEND"""
+    name = name or os.getenv("QA_AGENT_LLM_BACKEND", "simulated")
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}'. Available: {sorted(_BACKENDS)}")
+    return _BACKENDS[name]
+
+
+def list_backends() -> List[Dict[str, Any]]:
+    return [backend.stats() for backend in _BACKENDS.values()]
+
+
+async def close_backends():
+    for backend in _BACKENDS.values():
+        await backend.close()
+
+
+# ========== BUILT-IN BACKENDS ==========
+
+register_backend(SimulatedBackend())
+
+register_backend(OpenAICompatibleBackend(
+    name="http",
+    base_url=os.getenv("QA_AGENT_LLM_BASE_URL", "http://127.0.0.1:8001/v1"),
+    api_key=os.getenv("QA_AGENT_LLM_API_KEY"),
+    timeout=float(os.getenv("QA_AGENT_LLM_TIMEOUT", "30")),
+    max_retries=int(os.getenv("QA_AGENT_LLM_RETRIES", "2")),
+    max_connections=int(os.getenv("QA_AGENT_LLM_MAX_CONNECTIONS", "100")),
+))
@@ -0,0 +1,188 @@
+"""
+Local Stub LLM Server
+
+OpenAI-compatible /v1/chat/completions endpoint with configurable latency and
+token rates, for load-testing agent throughput offline. Point the "http" LLM
+backend at it:
+
+    uvicorn app.llm_stub_server:app --port 8001
+    QA_AGENT_LLM_BACKEND=http QA_AGENT_LLM_BASE_URL=http://127.0.0.1:8001/v1 uvicorn app.main:app
+
+A response takes latencyMs (± jitterMs) to the first token plus
+completionTokens / tokensPerSecond to generate. errorRate and
+rateLimitRate inject 503 and 429 responses. Every setting can be overridden
+per model, and changed at runtime with PUT /stub/config.
+
+Batched prompts ("### TASK N" sections, see app/llm_backends.py) are answered
+with one "### RESULT N" section per task and completionTokens per task.
+Requests on the discounted service tier take flexLatencyMultiplier times
+longer.
+"""
+
+import asyncio
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from app.llm_backends import DISCOUNT_SERVICE_TIER, count_batch_tasks, format_batch_results
+
+
+class ModelProfile(BaseModel):
+    latencyMs: Optional[float] = Field(None, ge=0)
+    jitterMs: Optional[float] = Field(None, ge=0)
+    tokensPerSecond: Optional[float] = Field(None, gt=0)
+    completionTokens: Optional[int] = Field(None, ge=1)
+    errorRate: Optional[float] = Field(None, ge=0, le=1)
+    rateLimitRate: Optional[float] = Field(None, ge=0, le=1)
+
+
+class StubConfig(BaseModel):
+    latencyMs: float = Field(float(os.getenv("QA_AGENT_STUB_LATENCY_MS", "300")), ge=0)
+    jitterMs: float = Field(float(os.getenv("QA_AGENT_STUB_JITTER_MS", "100")), ge=0)
+    tokensPerSecond: float = Field(float(os.getenv("QA_AGENT_STUB_TOKENS_PER_SECOND", "80")), gt=0)
+    completionTokens: int = Field(int(os.getenv("QA_AGENT_STUB_COMPLETION_TOKENS", "128")), ge=1)
+    errorRate: float = Field(float(os.getenv("QA_AGENT_STUB_ERROR_RATE", "0")), ge=0, le=1)
+    rateLimitRate: float = Field(float(os.getenv("QA_AGENT_STUB_RATE_LIMIT_RATE", "0")), ge=0, le=1)
+    flexLatencyMultiplier: float = Field(float(os.getenv("QA_AGENT_STUB_FLEX_LATENCY_MULTIPLIER", "3")), ge=1)
+    models: Dict[str, ModelProfile] = {}
+
+    def for_model(self, model: str) -> Dict[str, Any]:
+        """Effective settings for a model (per-model overrides win)"""
+        settings = self.dict(exclude={"models"})
+        override = self.models.get(model)
+        if override is not None:
+            settings.update({key: value for key, value in override.dict().items() if value is not None})
+        return settings
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: str
+
+
+class ChatCompletionRequest(BaseModel):
+    model: str
+    messages: List[ChatMessage]
+    max_tokens: Optional[int] = None
+    service_tier: Optional[str] = None
+
+
+class StubStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.batched_requests = 0
+        self.batched_tasks = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.started = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rateLimited": self.rate_limited,
+            "batchedRequests": self.batched_requests,
+            "avgTasksPerBatch": round(self.batched_tasks / self.batched_requests, 2) if self.batched_requests else 0.0,
+            "inFlight": self.in_flight,
+            "peakInFlight": self.peak_in_flight,
+            "requestsPerSecond": round(self.requests / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+app = FastAPI(title="QA AI Agent - Stub LLM Server", version="1.0.0")
+
+config = StubConfig()
+stats = StubStats()
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: ChatCompletionRequest):
+    settings = config.for_model(request.model)
+    stats.requests += 1
+    stats.in_flight += 1
+    stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+    try:
+        roll = random.random()
+        if roll < settings["rateLimitRate"]:
+            stats.rate_limited += 1
+            return JSONResponse(status_code=429, headers={"retry-after": "1"}, content={
+                "error": {"type": "rate_limit_exceeded", "message": "Stub rate limit"}
+            })
+        if roll < settings["rateLimitRate"] + settings["errorRate"]:
+            stats.errors += 1
+            return JSONResponse(status_code=503, content={
+                "error": {"type": "server_error", "message": "Stub injected failure"}
+            })
+
+        tasks = count_batch_tasks(request.messages[-1].content) if request.messages else 0
+        if tasks:
+            stats.batched_requests += 1
+            stats.batched_tasks += tasks
+        budget = settings["completionTokens"] * max(tasks, 1)
+        completion_tokens = min(request.max_tokens or budget, budget)
+        latency = max(0.0, settings["latencyMs"] + random.uniform(-1, 1) * settings["jitterMs"]) / 1000
+        if request.service_tier == DISCOUNT_SERVICE_TIER:
+            latency *= settings["flexLatencyMultiplier"]
+        await asyncio.sleep(latency + completion_tokens / settings["tokensPerSecond"])
+
+        if tasks:
+            per_task = max(1, completion_tokens // tasks)
+            content = format_batch_results([" ".join(["token"] * per_task)] * tasks)
+        else:
+            content = " ".join(["token"] * completion_tokens)
+        prompt_tokens = sum(max(1, len(message.content) // 4) for message in request.messages)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "length",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+    finally:
+        stats.in_flight -= 1
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": model, "object": "model"} for model in config.models]}
+
+
+@app.get("/stub/config")
+async def get_config():
+    return config
+
+
+@app.put("/stub/config")
+async def update_config(new_config: StubConfig):
+    """Replace the latency/token-rate settings (stats are kept)"""
+    global config
+    config = new_config
+    return config
+
+
+@app.get("/stub/stats")
+async def get_stats():
+    return stats.snapshot()
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("QA_AGENT_STUB_PORT", "8001")))
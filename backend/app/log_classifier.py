@@ -0,0 +1,244 @@
+"""
+Streaming Execution-Log Classifier
+
+Classifies CI/test-runner logs line by line, as they stream in, into a
+failure category per test. The healer used to lowercase the whole log and
+run substring checks on it; this works incrementally on a compiled rule set
+and keeps only the current test's state, so memory stays constant no matter
+how large the log is.
+
+Test boundaries are recognised from common runner output (Playwright, Jest,
+Mocha/Cypress, pytest, unittest/JUnit style). Evidence lines (errors, stack
+messages) are attributed to the most recent test. Lines seen before any test
+marker are attributed to a pseudo test named "(run)".
+"""
+
+import codecs
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Failure categories, highest priority first
+SELECTOR_CHANGE = "selector_change"
+ENVIRONMENT = "environment"
+TIMEOUT = "timeout"
+ASSERTION = "assertion"
+FAILURE = "failure"
+
+CATEGORY_PRIORITY = [SELECTOR_CHANGE, ENVIRONMENT, TIMEOUT, ASSERTION, FAILURE]
+
+# (category, pattern) - lowercase patterns, matched against the lowercased line
+DEFAULT_RULES: List[Tuple[str, str]] = [
+    (SELECTOR_CHANGE, r"css selector change|selector|locator\b.*\b(?:not found|resolved to 0|strict mode violation)"
+                      r"|no such element|unable to locate element|element (?:is )?not (?:found|attached|visible)"
+                      r"|expected to find element|stale element"),
+    (ENVIRONMENT, r"environment issue|econnrefused|econnreset|enotfound|eai_again|net::err_|connection (?:refused|reset)"
+                  r"|service unavailable|\b50[234]\b|dns|certificate|ssl|out of memory|no space left"),
+    (TIMEOUT, r"timed? ?out|timeout(?:error)?\b|exceeded \d+ ?m?s"),
+    (ASSERTION, r"assertionerror|assert(?:ion)? failed|expect(?:ed)?\([^)]*\)\.to|expected .* (?:to|but)|tohave\w+"),
+    (FAILURE, r"\bfail(?:ed|ure)?\b|\berror\b|\bexception\b"),
+]
+
+# (status, pattern) - `name` group captures the test title
+DEFAULT_TEST_MARKERS: List[Tuple[str, str]] = [
+    ("passed", r"^\s*(?:✓|✔|√)\s+(?:\d+\s+)?(?P<name>.+?)(?:\s+\(\d+(?:\.\d+)?m?s\))?\s*$"),
+    ("failed", r"^\s*(?:✘|✖|×|✗)\s+(?:\d+\s+)?(?P<name>.+?)(?:\s+\(\d+(?:\.\d+)?m?s\))?\s*$"),
+    ("failed", r"^\s*\d+\)\s+(?P<name>.+?)\s*:?\s*$"),
+    ("passed", r"^\s*PASSED\s+(?P<name>\S+::\S+)"),
+    ("failed", r"^\s*(?:FAILED|ERROR)\s+(?P<name>\S+::\S+)"),
+    ("passed", r"^\s*(?P<name>\S+::\S+)\s+PASSED\b"),
+    ("failed", r"^\s*(?P<name>\S+::\S+)\s+(?:FAILED|ERROR)\b"),
+    ("failed", r"^\s*(?:FAIL|ERROR):\s+(?P<name>\w+\s+\([\w.]+\))"),
+    ("passed", r"^\s*Test(?: case)?[:\s]+['\"]?(?P<name>.+?)['\"]?\s+passed\b"),
+    ("failed", r"^\s*Test(?: case)?[:\s]+['\"]?(?P<name>.+?)['\"]?\s+failed\b"),
+]
+
+RUN_PSEUDO_TEST = "(run)"
+
+# Longest partial line kept while waiting for a newline
+MAX_LINE_LENGTH = 64 * 1024
+MAX_EVIDENCE_LENGTH = 300
+
+
+class TestClassification(NamedTuple):
+    test: str
+    status: str  # "passed" or "failed"
+    category: Optional[str]  # None for passed tests
+    line: Optional[int]  # line number of the deciding evidence
+    evidence: Optional[str]
+
+    def to_dict(self) -> Dict:
+        return self._asdict()
+
+
+class CompiledRules:
+    """Category rules and test markers compiled once"""
+
+    def __init__(self, rules: List[Tuple[str, str]] = None, test_markers: List[Tuple[str, str]] = None):
+        rules = rules or DEFAULT_RULES
+        test_markers = test_markers or DEFAULT_TEST_MARKERS
+
+        priority = {category: i for i, category in enumerate(CATEGORY_PRIORITY)}
+        self.rules = sorted(
+            ((category, re.compile(pattern)) for category, pattern in rules),
+            key=lambda rule: priority.get(rule[0], len(priority))
+        )
+        # One combined search rejects the (common) lines that match no rule
+        self.any_rule = re.compile("|".join(f"(?:{pattern})" for _, pattern in rules))
+        # Markers are combined into one alternation; each keeps its own `nameN` group
+        self.marker_statuses = [status for status, _ in test_markers]
+        self.any_marker = re.compile("|".join(
+            "(?:" + pattern.replace("(?P<name>", f"(?P<name{i}>") + ")"
+            for i, (_, pattern) in enumerate(test_markers)
+        ))
+        self.priority = priority
+
+    def categorize(self, line: str) -> Optional[str]:
+        """Highest-priority category mentioned on the line, if any"""
+        # Lowercasing once is much cheaper than re.IGNORECASE on every rule
+        line = line.lower()
+        if not self.any_rule.search(line):
+            return None
+        for category, pattern in self.rules:
+            if pattern.search(line):
+                return category
+        return None
+
+    def test_marker(self, line: str) -> Optional[Tuple[str, str, int]]:
+        """(status, test name, end offset of the name) if the line starts or reports a test"""
+        match = self.any_marker.match(line)
+        if match is None:
+            return None
+        for i, status in enumerate(self.marker_statuses):
+            name = match.group(f"name{i}")
+            if name is not None:
+                return status, name.strip(), match.end(f"name{i}")
+        return None
+
+
+DEFAULT_COMPILED_RULES = CompiledRules()
+
+
+class LogClassifier:
+    """
+    Incremental classifier. Feed text chunks or lines; finished tests are
+    yielded as soon as the next test starts (or the log ends).
+    """
+
+    def __init__(self, rules: CompiledRules = DEFAULT_COMPILED_RULES):
+        self.rules = rules
+        self.lines_processed = 0
+        self.tests_seen = 0
+        self.failures_by_category: Dict[str, int] = {}
+        self.passed = 0
+        self._partial = ""
+        self._decoder = None
+        self._current: Optional[Dict] = None
+        self._start_test(RUN_PSEUDO_TEST, None)
+
+    # ---------- input ----------
+
+    def feed(self, chunk: str) -> Iterator[TestClassification]:
+        """Feed an arbitrary text chunk (may contain partial lines)"""
+        data = self._partial + chunk
+        lines = data.split("\n")
+        self._partial = lines.pop()[-MAX_LINE_LENGTH:]
+        for line in lines:
+            yield from self.feed_line(line)
+
+    def feed_bytes(self, chunk: bytes) -> Iterator[TestClassification]:
+        """Feed raw bytes (UTF-8, decoded incrementally)"""
+        if self._decoder is None:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        yield from self.feed(self._decoder.decode(chunk))
+
+    def feed_line(self, line: str) -> Iterator[TestClassification]:
+        self.lines_processed += 1
+        line = line.rstrip("\r")
+
+        marker = self.rules.test_marker(line)
+        if marker is not None:
+            status, name, name_end = marker
+            yield from self._finish_current()
+            self._start_test(name, status)
+            # Runners like pytest put the error on the result line itself
+            line = line[name_end:]
+
+        category = self.rules.categorize(line)
+        if category is not None:
+            self._record_evidence(category, line)
+
+    def close(self) -> Iterator[TestClassification]:
+        """Flush the trailing partial line and the last test"""
+        if self._decoder is not None:
+            self._partial += self._decoder.decode(b"", final=True)
+        if self._partial:
+            partial, self._partial = self._partial, ""
+            yield from self.feed_line(partial)
+        yield from self._finish_current()
+        self._current = None
+
+    # ---------- state ----------
+
+    def _start_test(self, name: str, status: Optional[str]):
+        self._current = {"test": name, "status": status, "category": None, "line": None, "evidence": None}
+
+    def _record_evidence(self, category: str, line: str):
+        current = self._current
+        if current["category"] is None or self.rules.priority[category] < self.rules.priority[current["category"]]:
+            current["category"] = category
+            current["line"] = self.lines_processed
+            current["evidence"] = line.strip()[:MAX_EVIDENCE_LENGTH]
+
+    def _finish_current(self) -> Iterator[TestClassification]:
+        current = self._current
+        if current is None:
+            return
+
+        status = current["status"]
+        if current["test"] == RUN_PSEUDO_TEST:
+            if current["category"] is None:
+                return
+            # Unattributed evidence (e.g. a one-line run summary)
+            status = "failed"
+        elif status is None:
+            status = "failed" if current["category"] is not None else "passed"
+
+        self.tests_seen += current["test"] != RUN_PSEUDO_TEST
+        if status == "passed":
+            self.passed += 1
+            yield TestClassification(current["test"], "passed", None, None, None)
+            return
+
+        category = current["category"] or FAILURE
+        self.failures_by_category[category] = self.failures_by_category.get(category, 0) + 1
+        yield TestClassification(current["test"], "failed", category, current["line"], current["evidence"])
+
+    # ---------- results ----------
+
+    @property
+    def overall_category(self) -> Optional[str]:
+        """Highest-priority failure category across the log (None if nothing failed)"""
+        for category in CATEGORY_PRIORITY:
+            if self.failures_by_category.get(category):
+                return category
+        return None
+
+    def summary(self) -> Dict:
+        return {
+            "linesProcessed": self.lines_processed,
+            "testsSeen": self.tests_seen,
+            "passed": self.passed,
+            "failed": sum(self.failures_by_category.values()),
+            "failuresByCategory": dict(self.failures_by_category),
+            "overallCategory": self.overall_category,
+        }
+
+
+def classify_log(lines: Iterable[str]) -> Tuple[List[TestClassification], LogClassifier]:
+    """Classify a complete log (any iterable of lines, e.g. an open file)"""
+    classifier = LogClassifier()
+    results = []
+    for line in lines:
+        results.extend(classifier.feed_line(line.rstrip("\n")))
+    results.extend(classifier.close())
+    return results, classifier
@@ -1,11 +1,35 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import planner, generator, healer, cost_calculator_v2
+from fastapi.responses import Response
+from app.routers import planner, generator, healer, jobs, pipeline, llm, cost_calculator_v2, cost_sweep, cost_monte_carlo, cost_optimizer, cost_scenarios
+from app.jobs import job_manager
+from app.failure_index import failure_index
+from app.llm_backends import close_backends
+from app.pricing_store import pricing_store
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the background agent job workers
+    await job_manager.start()
+    # Watch the pricing files for hot reload
+    await pricing_store.start()
+    yield
+    await pricing_store.stop()
+    await job_manager.stop()
+    # Persist hit counters and any signatures recorded since the last save
+    failure_index.flush()
+    # Close pooled LLM backend connections
+    await close_backends()
+
 
 app = FastAPI(
     title="QA AI Agent API",
     description="Backend API for Multi-Agent QA Automation System & Production Cost Calculator",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for frontend communication
@@ -17,13 +41,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, status, payload size and in-flight metrics (served on /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers for the 3 main agents
 app.include_router(planner.router, prefix="/api", tags=["Planner Agent"])
 app.include_router(generator.router, prefix="/api", tags=["Generator Agent"])
 app.include_router(healer.router, prefix="/api", tags=["Healer Agent"])
 
+# Include background job queue for the agents
+app.include_router(jobs.router, prefix="/api", tags=["Agent Jobs"])
+
+# Include server-side Planner → Generator → Healer pipeline
+app.include_router(pipeline.router, prefix="/api", tags=["Agent Pipeline"])
+
+# Include LLM backend status
+app.include_router(llm.router, prefix="/api", tags=["LLM Backends"])
+
 # Include cost calculator V2 (Production-ready with AI agents)
 app.include_router(cost_calculator_v2.router, prefix="/api/cost", tags=["Cost Calculator"])
+app.include_router(cost_sweep.router, prefix="/api/cost", tags=["Cost Calculator"])
+app.include_router(cost_monte_carlo.router, prefix="/api/cost", tags=["Cost Calculator"])
+app.include_router(cost_optimizer.router, prefix="/api/cost", tags=["Cost Calculator"])
+app.include_router(cost_scenarios.router, prefix="/api/cost", tags=["Cost Calculator"])
 
 @app.get("/")
 async def root():
@@ -36,3 +76,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "qa-ai-agent-api"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of the API, agent, pipeline and queue metrics"""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
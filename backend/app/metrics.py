@@ -0,0 +1,296 @@
+"""
+Metrics
+
+Prometheus instrumentation without a client library dependency: counters,
+gauges and fixed-bucket histograms kept in plain dicts, rendered in the
+Prometheus text exposition format (0.0.4) on GET /metrics.
+
+Recording a sample is a dict lookup plus a bisect, so the instrumentation
+stays on in production. Series are labelled with route templates, agent,
+stage, queue and model names only (never raw paths or ids), which keeps
+cardinality bounded. QA_AGENT_METRICS=0 turns recording off: every caller
+checks registry.enabled before recording a sample.
+
+- MetricsMiddleware: per-route request latency, count by status, request and
+  response payload sizes, and requests in flight
+- Agents (app/agent_runtime.py): per-stage latency and runs in flight
+- Pipeline (app/pipeline.py): per-stage latency
+- Queues: job queue and LLM rate-limiter wait times
+- Caches: lookups by result, entries, estimated memory use and hit ratio
+- Pricing: hot reloads of the pricing files by result
+- Collectors refresh point-in-time gauges (queue depths) at scrape time
+"""
+
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; agent stages take seconds, cost calculations milliseconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _labels(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self.samples()]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{self._labels(labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+    def clear(self):
+        self._values.clear()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels → [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total) in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{self._labels(labels, le)} {cumulative}"
+            yield f"{self.name}_sum{self._labels(labels)} {_format_value(total)}"
+            yield f"{self.name}_count{self._labels(labels)} {cumulative}"
+
+
+class MetricsRegistry:
+    """Metrics by name, plus collectors run before each scrape"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run `collector` before each scrape (to refresh point-in-time gauges)"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Singleton instance
+registry = MetricsRegistry(enabled=os.getenv("QA_AGENT_METRICS", "1") != "0")
+
+HTTP_REQUESTS = registry.counter(
+    "qa_agent_http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+HTTP_DURATION = registry.histogram(
+    "qa_agent_http_request_duration_seconds", "HTTP request latency until the last body byte", ("method", "route"))
+HTTP_IN_FLIGHT = registry.gauge(
+    "qa_agent_http_requests_in_flight", "HTTP requests being served")
+HTTP_REQUEST_SIZE = registry.histogram(
+    "qa_agent_http_request_size_bytes", "HTTP request body size", ("method", "route"), SIZE_BUCKETS)
+HTTP_RESPONSE_SIZE = registry.histogram(
+    "qa_agent_http_response_size_bytes", "HTTP response body size", ("method", "route"), SIZE_BUCKETS)
+
+STAGE_DURATION = registry.histogram(
+    "qa_agent_stage_duration_seconds", "Agent and pipeline stage latency", ("agent", "stage"))
+AGENTS_IN_FLIGHT = registry.gauge(
+    "qa_agent_agent_runs_in_flight", "Agent runs in progress", ("agent",))
+QUEUE_WAIT = registry.histogram(
+    "qa_agent_queue_wait_seconds", "Time spent waiting in a queue before being served", ("queue", "name"))
+QUEUE_DEPTH = registry.gauge(
+    "qa_agent_queue_depth", "Items waiting in a queue at scrape time", ("queue", "name"))
+
+CACHE_LOOKUPS = registry.counter(
+    "qa_agent_cache_lookups_total", "Cache lookups by result (hit or miss)", ("cache", "result"))
+CACHE_ENTRIES = registry.gauge(
+    "qa_agent_cache_entries", "Entries in a cache at scrape time", ("cache",))
+CACHE_BYTES = registry.gauge(
+    "qa_agent_cache_bytes", "Estimated memory used by a cache's entries", ("cache",))
+CACHE_HIT_RATIO = registry.gauge(
+    "qa_agent_cache_hit_ratio", "Cache hits / lookups since start", ("cache",))
+
+PRICING_RELOADS = registry.counter(
+    "qa_agent_pricing_reloads_total", "Pricing file reloads by file and result (ok or error)", ("file", "result"))
+
+
+class StageTimer:
+    """Context manager observing the block's duration as one stage"""
+
+    __slots__ = ("agent", "stage", "started")
+
+    def __init__(self, agent: str, stage: str):
+        self.agent = agent
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if registry.enabled:
+            STAGE_DURATION.observe(time.perf_counter() - self.started, self.agent, self.stage)
+        return False
+
+
+def time_stage(agent: str, stage: str) -> StageTimer:
+    return StageTimer(agent, stage)
+
+
+def route_template(scope) -> str:
+    """
+    Template of the route that served a request (e.g. /api/jobs/{job_id}).
+
+    Routes of included routers may only know their path relative to the
+    router prefix, so the prefix is recovered from the concrete path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    path = scope.get("path", "")
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if concrete and path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status, payload sizes and in-flight
+    requests per route template (e.g. /api/jobs/{job_id}). Requests that
+    match no route are recorded as "unmatched". Streaming bodies are timed
+    and measured until their last chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        sizes = [0, 0]  # request, response body bytes
+        status = [500]
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes[0] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes[1] += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route, str(status[0]))
+            HTTP_DURATION.observe(time.perf_counter() - started, method, route)
+            HTTP_REQUEST_SIZE.observe(sizes[0], method, route)
+            HTTP_RESPONSE_SIZE.observe(sizes[1], method, route)
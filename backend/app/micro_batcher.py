@@ -0,0 +1,116 @@
+"""
+Micro-Batcher
+
+Groups small requests into batches: items submitted under the same key are
+collected until either max_batch_size items are waiting or max_wait_ms has
+passed since the first one arrived, then the whole batch is handed to a
+single send_batch(key, items) call. The results are split back out in
+submission order, one per caller. A result that is an exception fails only
+its own caller; an exception raised by send_batch fails the whole batch.
+
+Used to send the generator's per-test-case prompts to the LLM backend as a
+few large requests instead of one request per test case.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+
+SendBatch = Callable[[Hashable, List[Any]], Awaitable[List[Any]]]
+
+
+class MicroBatcher:
+    """Size- and time-bounded batching of concurrent submissions"""
+
+    def __init__(self, name: str, send_batch: SendBatch, max_batch_size: int = 16, max_wait_ms: float = 20.0):
+        self.name = name
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        # key → (items, futures, timer) of the batch being collected
+        self._pending: Dict[Hashable, Tuple[List[Any], List[asyncio.Future], asyncio.TimerHandle]] = {}
+        self._in_flight = set()
+
+        self.items = 0
+        self.batches = 0
+        self.flushed_full = 0
+        self.flushed_on_timeout = 0
+        self.failed_batches = 0
+        self.total_send_seconds = 0.0
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """Queue one item; resolves to its own result once its batch comes back"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.get(key)
+        if batch is None:
+            timer = loop.call_later(self.max_wait_ms / 1000, self._flush, key, False)
+            batch = self._pending[key] = ([], [], timer)
+        items, futures, _ = batch
+        items.append(item)
+        futures.append(future)
+        self.items += 1
+
+        if len(items) >= self.max_batch_size:
+            self._flush(key, True)
+        return await future
+
+    async def submit_many(self, key: Hashable, items: List[Any]) -> List[Any]:
+        """Submit several items at once; results come back in the same order"""
+        return list(await asyncio.gather(*(self.submit(key, item) for item in items)))
+
+    def _flush(self, key: Hashable, full: bool):
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        items, futures, timer = batch
+        timer.cancel()
+
+        self.batches += 1
+        if full:
+            self.flushed_full += 1
+        else:
+            self.flushed_on_timeout += 1
+
+        task = asyncio.ensure_future(self._send(key, items, futures))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, key: Hashable, items: List[Any], futures: List[asyncio.Future]):
+        started = time.perf_counter()
+        try:
+            results = await self.send_batch(key, items)
+            if len(results) != len(items):
+                raise ValueError(f"{self.name}: batch of {len(items)} returned {len(results)} result(s)")
+        except Exception as e:
+            self.failed_batches += 1
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.total_send_seconds += time.perf_counter() - started
+
+        for future, result in zip(futures, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "maxBatchSize": self.max_batch_size,
+            "maxWaitMs": self.max_wait_ms,
+            "items": self.items,
+            "batches": self.batches,
+            "avgBatchSize": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "flushedFull": self.flushed_full,
+            "flushedOnTimeout": self.flushed_on_timeout,
+            "failedBatches": self.failed_batches,
+            "avgSendSeconds": round(self.total_send_seconds / self.batches, 4) if self.batches else 0.0,
+        }
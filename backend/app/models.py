@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
 # === Request Models ===
@@ -11,15 +11,39 @@ class PlannerRequest(BaseModel):
     testTypes: List[str]
     reasoningModel: str
 
+class PlannerBatchRequest(BaseModel):
+    apps: List[PlannerRequest] = Field(..., min_length=1)
+    maxConcurrency: int = Field(default=8, ge=1, le=256)
+
 class GeneratorRequest(BaseModel):
     testPlan: Dict[str, Any]
     automationFramework: str
     generationModel: str
+    # "discount": per-test-case prompts go out in larger batches on the discounted service tier
+    batchMode: str = Field(default="realtime", pattern="^(realtime|discount)$")
 
 class HealerRequest(BaseModel):
     testScript: str
     executionResult: str
     automationFramework: str
+    # Extra old→new selector mappings, merged over config/selector_mappings.json
+    selectorMap: Optional[Dict[str, str]] = None
+    # Model for root-cause analysis (defaults to the backend's default model)
+    healingModel: Optional[str] = None
+
+class PipelineRequest(BaseModel):
+    # Planner inputs
+    appName: str
+    appType: str
+    testUrl: str
+    scope: str
+    testTypes: List[str]
+    reasoningModel: str
+    # Generator inputs
+    automationFramework: str
+    generationModel: str
+    # Execution result to heal; simulated server-side when omitted
+    executionResult: Optional[str] = None
 
 # === Response Models ===
 
@@ -28,3 +52,14 @@ class AgentResponse(BaseModel):
     message: str
     data: Optional[Dict[str, Any]] = None
     error_details: Optional[str] = None
+
+class JobResponse(BaseModel):
+    jobId: str
+    agent: str
+    status: str  # "queued", "running", "succeeded", "failed" or "cancelled"
+    createdAt: float
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    queueWaitSeconds: Optional[float] = None
+    runSeconds: Optional[float] = None
+    error: Optional[str] = None
@@ -0,0 +1,114 @@
+"""
+Agent Pipeline (Planner → Generator → Execution → Healer)
+
+Runs the agent workflow server-side as a small DAG. Each stage receives the
+artifacts of the stages it depends on in memory, so the test plan and test
+script never travel back to the client between stages. Stage progress is
+reported as a stream of events that the router turns into Server-Sent Events.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+from app.metrics import STAGE_DURATION, registry
+
+
+StageRunner = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class PipelineStage:
+    """One node of the pipeline DAG"""
+
+    def __init__(self, name: str, run: StageRunner, depends_on: List[str] = None):
+        self.name = name
+        self.run = run
+        self.depends_on = depends_on or []
+
+
+class PipelineError(Exception):
+    """Raised when a stage fails; carries the stage name"""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+
+def validate_stages(stages: List[PipelineStage]):
+    """Reject unknown dependencies and cycles"""
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.depends_on if dep not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {missing}")
+
+    resolved = set()
+    remaining = list(stages)
+    while remaining:
+        ready = [stage for stage in remaining if all(dep in resolved for dep in stage.depends_on)]
+        if not ready:
+            raise ValueError(f"Pipeline has a dependency cycle: {[stage.name for stage in remaining]}")
+        for stage in ready:
+            resolved.add(stage.name)
+            remaining.remove(stage)
+
+
+async def iter_pipeline_events(stages: List[PipelineStage]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the DAG and yield progress events as stages start and finish.
+
+    Stages whose dependencies are satisfied run concurrently. Each stage's
+    runner gets a dict of {stage_name: result} for everything finished so far.
+
+    Events:
+        {"event": "stage_started", "stage": ...}
+        {"event": "stage_completed", "stage": ..., "durationSeconds": ..., "result": ...}
+        {"event": "stage_failed", "stage": ..., "error": ...}
+        {"event": "pipeline_completed", "durationSeconds": ...}
+    """
+    validate_stages(stages)
+
+    started = time.perf_counter()
+    artifacts: Dict[str, Any] = {}
+    pending = list(stages)
+    running: Dict[asyncio.Task, PipelineStage] = {}
+    stage_started_at: Dict[str, float] = {}
+
+    try:
+        while pending or running:
+            for stage in [s for s in pending if all(dep in artifacts for dep in s.depends_on)]:
+                pending.remove(stage)
+                stage_started_at[stage.name] = time.perf_counter()
+                running[asyncio.create_task(stage.run(dict(artifacts)))] = stage
+                yield {"event": "stage_started", "stage": stage.name}
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage = running.pop(task)
+                try:
+                    artifacts[stage.name] = task.result()
+                except Exception as e:
+                    yield {"event": "stage_failed", "stage": stage.name, "error": str(e)}
+                    raise PipelineError(stage.name, str(e))
+
+                duration = time.perf_counter() - stage_started_at[stage.name]
+                if registry.enabled:
+                    STAGE_DURATION.observe(duration, "pipeline", stage.name)
+                yield {
+                    "event": "stage_completed",
+                    "stage": stage.name,
+                    "durationSeconds": round(duration, 4),
+                    "result": artifacts[stage.name],
+                }
+    finally:
+        # Client disconnected or a stage failed: don't leave stages running
+        for task in running:
+            task.cancel()
+
+    duration = time.perf_counter() - started
+    if registry.enabled:
+        STAGE_DURATION.observe(duration, "pipeline", "total")
+    yield {
+        "event": "pipeline_completed",
+        "durationSeconds": round(duration, 4),
+    }
@@ -0,0 +1,122 @@
+"""
+Test Plan Cache
+
+Content-addressed memoization of Planner Agent output. A plan is keyed on a
+canonical hash of the normalized PlannerRequest, so identical requests for
+an unchanged app return the stored plan in microseconds instead of running
+the agent again.
+
+Each key also gets a deterministic seed, so the plan built for a key is the
+same whether it comes from the cache or is regenerated after eviction.
+
+The normalization only affects the key: the plan is built from the
+normalized request, and every response echoes the caller's own appName,
+appType, testUrl and scope (see routers/planner.py).
+
+Entries expire after a TTL and the cache is bounded with LRU eviction.
+Cached plans are shared between callers and must be treated as read-only.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.models import PlannerRequest
+
+
+def normalize_planner_request(request: PlannerRequest) -> Dict[str, Any]:
+    """
+    Canonical form of a planner request.
+
+    Strings are stripped, a trailing slash on the URL is ignored, and test
+    types are sorted (their order doesn't change the plan). Repeated test
+    types are kept: the number of test cases scales with the list length.
+    """
+    return {
+        "appName": request.appName.strip(),
+        "appType": request.appType.strip(),
+        "testUrl": request.testUrl.strip().rstrip("/"),
+        "scope": request.scope.strip(),
+        "testTypes": sorted(test_type.strip() for test_type in request.testTypes),
+        "reasoningModel": request.reasoningModel.strip(),
+    }
+
+
+def plan_cache_key(request: PlannerRequest) -> str:
+    """SHA-256 of the canonical JSON encoding of the normalized request"""
+    canonical = json.dumps(normalize_planner_request(request), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def seed_for_key(key: str) -> int:
+    """Deterministic RNG seed derived from a cache key"""
+    return int(key[:16], 16)
+
+
+class PlanCache:
+    """Size-bounded LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, plan = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return plan
+
+    def put(self, key: str, plan: Dict[str, Any]):
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic(), plan)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
+
+
+# Singleton instance
+plan_cache = PlanCache(
+    max_entries=int(os.getenv("QA_AGENT_PLAN_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("QA_AGENT_PLAN_CACHE_TTL", "3600")),
+)
@@ -3,14 +3,94 @@ Pricing Configuration Loader
 
 Loads pricing data from YAML configuration file and provides
 helper functions to access pricing information.
+
+Catalog lookups (VM SKUs, instance types, LLM models, MCP tools, data
+sources, monitoring services) go through hash indexes built once per load,
+so they are O(1) however large the catalog grows. Indexes are read-only
+(MappingProxyType). Where several entries share a key, the first one in the
+file wins, as with the linear scans they replace. Data source and
+monitoring service names are matched case-insensitively (case-folded).
+
+The loaded configuration and its indexes are published together as one
+immutable, versioned ConfigSnapshot. reload() (and the hot reload in
+app/pricing_store.py) builds the new snapshot completely and then swaps the
+reference, so a concurrent reader sees either the old catalog or the new
+one, never a half-updated mix.
 """
 
+import hashlib
+import json
 import yaml
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Any
 from functools import lru_cache
 
 
+def freeze(value: Any) -> Any:
+    """Read-only deep copy: dicts become MappingProxyType, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def index_by(entries: Iterable[Dict], field: str, casefold: bool = False) -> Dict[Any, Dict]:
+    """entry[field] → entry, keeping the first entry for each key"""
+    index: Dict[Any, Dict] = {}
+    for entry in entries:
+        key = entry.get(field)
+        if key is None:
+            continue
+        if casefold:
+            key = str(key).casefold()
+        index.setdefault(key, entry)
+    return index
+
+
+def build_indexes(config: Dict) -> Mapping[str, Mapping]:
+    """Read-only lookup indexes over a loaded pricing configuration"""
+    config = config or {}
+    llm_models: Dict[tuple, Dict] = {}
+    for provider, provider_config in (config.get('llm_providers') or {}).items():
+        for name, model in index_by((provider_config or {}).get('models', []), 'name').items():
+            llm_models[(provider, name)] = model
+
+    tools = config.get('mcp_tools') or {}
+    monitoring = config.get('monitoring') or {}
+    indexes = {
+        'azure_vms': index_by(config.get('azure', {}).get('compute', {}).get('virtual_machines', []), 'sku'),
+        'aws_ec2': index_by(config.get('aws', {}).get('compute', {}).get('ec2', []), 'type'),
+        'gcp_compute': index_by(config.get('gcp', {}).get('compute', {}).get('compute_engine', []), 'type'),
+        'llm_models': llm_models,
+        # Servers take precedence over functions with the same name
+        'mcp_tools': index_by([*tools.get('servers', []), *tools.get('functions', [])], 'name'),
+        'data_sources': index_by(config.get('data_sources', []), 'name', casefold=True),
+        # Azure Monitor services take precedence over third-party ones
+        'monitoring_services': index_by(
+            [*monitoring.get('azure_monitor', []), *monitoring.get('third_party', [])], 'name', casefold=True
+        ),
+    }
+    return MappingProxyType({name: MappingProxyType(index) for name, index in indexes.items()})
+
+
+class ConfigSnapshot(NamedTuple):
+    version: str
+    config: Mapping[str, Any]
+    indexes: Mapping[str, Mapping]
+
+
+def build_config_snapshot(config: Any) -> ConfigSnapshot:
+    """Validate, freeze and index a parsed pricing configuration"""
+    if not isinstance(config, dict):
+        raise ValueError(f"Pricing configuration must be a mapping, got {type(config).__name__}")
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    frozen = freeze(config)
+    return ConfigSnapshot(version, frozen, build_indexes(frozen))
+
+
 class PricingConfig:
     """Load and manage pricing configuration from YAML file"""
 
@@ -21,7 +101,7 @@ class PricingConfig:
             config_path = base_dir / "config" / "pricing.yaml"
 
         self.config_path = Path(config_path)
-        self.config = self._load_config()
+        self.snapshot = self.load_snapshot()
 
     def _load_config(self) -> Dict:
         """Load YAML configuration file"""
@@ -36,9 +116,29 @@ class PricingConfig:
         except yaml.YAMLError as e:
             raise ValueError(f"Error parsing YAML configuration: {e}")
 
+    def load_snapshot(self) -> ConfigSnapshot:
+        """Read, validate and index the configuration file (blocking; not published)"""
+        return build_config_snapshot(self._load_config())
+
+    def publish(self, snapshot: ConfigSnapshot):
+        """Make `snapshot` current (a single reference assignment)"""
+        self.snapshot = snapshot
+
     def reload(self):
         """Reload configuration from file (useful for manual updates)"""
-        self.config = self._load_config()
+        self.publish(self.load_snapshot())
+
+    @property
+    def config(self) -> Mapping[str, Any]:
+        return self.snapshot.config
+
+    @property
+    def indexes(self) -> Mapping[str, Mapping]:
+        return self.snapshot.indexes
+
+    @property
+    def version(self) -> str:
+        return self.snapshot.version
 
     @property
     def metadata(self) -> Dict:
@@ -59,11 +159,7 @@ class PricingConfig:
 
     def get_azure_vm(self, sku: str) -> Optional[Dict]:
         """Get Azure VM pricing by SKU"""
-        vms = self.config.get('azure', {}).get('compute', {}).get('virtual_machines', [])
-        for vm in vms:
-            if vm.get('sku') == sku:
-                return vm
-        return None
+        return self.indexes['azure_vms'].get(sku)
 
     def get_azure_vm_hourly_cost(self, sku: str, use_reserved: bool = True) -> float:
         """Get hourly cost for Azure VM in AUD"""
@@ -107,11 +203,7 @@ class PricingConfig:
 
     def get_aws_ec2(self, instance_type: str) -> Optional[Dict]:
         """Get AWS EC2 pricing by instance type"""
-        instances = self.config.get('aws', {}).get('compute', {}).get('ec2', [])
-        for instance in instances:
-            if instance.get('type') == instance_type:
-                return instance
-        return None
+        return self.indexes['aws_ec2'].get(instance_type)
 
     def get_aws_s3_cost(self, storage_class: str = 'standard') -> float:
         """Get AWS S3 cost per GB/month in USD"""
@@ -123,24 +215,13 @@ class PricingConfig:
 
     def get_gcp_compute(self, instance_type: str) -> Optional[Dict]:
         """Get GCP Compute Engine pricing"""
-        instances = self.config.get('gcp', {}).get('compute', {}).get('compute_engine', [])
-        for instance in instances:
-            if instance.get('type') == instance_type:
-                return instance
-        return None
+        return self.indexes['gcp_compute'].get(instance_type)
 
     # ========== LLM PRICING ==========
 
     def get_llm_pricing(self, provider: str, model_name: str) -> Optional[Dict]:
         """Get LLM pricing for a specific model"""
-        providers = self.config.get('llm_providers', {})
-        provider_config = providers.get(provider, {})
-        models = provider_config.get('models', [])
-
-        for model in models:
-            if model.get('name') == model_name:
-                return model
-        return None
+        return self.indexes['llm_models'].get((provider, model_name))
 
     def get_llm_input_cost(self, provider: str, model_name: str) -> float:
         """Get LLM input cost per 1M tokens in USD"""
@@ -169,15 +250,14 @@ class PricingConfig:
 
         if provider:
             provider_config = providers.get(provider, {})
-            return provider_config.get('models', [])
+            return list(provider_config.get('models', []))
 
-        # Return all models from all providers
+        # Return all models from all providers (copies: the snapshot is read-only)
         all_models = []
         for prov_name, prov_config in providers.items():
             models = prov_config.get('models', [])
             for model in models:
-                model['_provider'] = prov_name
-                all_models.append(model)
+                all_models.append({**model, '_provider': prov_name})
         return all_models
 
     # ========== MEMORY SYSTEMS PRICING ==========
@@ -232,22 +312,8 @@ class PricingConfig:
     # ========== MCP TOOLS PRICING ==========
 
     def get_mcp_tool_pricing(self, tool_name: str) -> Optional[Dict]:
-        """Get pricing for an MCP tool by name"""
-        tools_config = self.config.get('mcp_tools', {})
-
-        # Check servers
-        servers = tools_config.get('servers', [])
-        for server in servers:
-            if server.get('name') == tool_name:
-                return server
-
-        # Check functions
-        functions = tools_config.get('functions', [])
-        for function in functions:
-            if function.get('name') == tool_name:
-                return function
-
-        return None
+        """Get pricing for an MCP tool (server or function) by name"""
+        return self.indexes['mcp_tools'].get(tool_name)
 
     def calculate_mcp_tools_cost(self, selected_tools: List[str],
                                    num_assessments: int = 4000) -> float:
@@ -284,12 +350,8 @@ class PricingConfig:
     # ========== DATA SOURCES PRICING ==========
 
     def get_data_source_pricing(self, source_name: str) -> Optional[Dict]:
-        """Get pricing for a data source by name"""
-        sources = self.config.get('data_sources', [])
-        for source in sources:
-            if source.get('name').lower() == source_name.lower():
-                return source
-        return None
+        """Get pricing for a data source by name (case-insensitive)"""
+        return self.indexes['data_sources'].get(source_name.casefold())
 
     def get_data_source_cost(self, source_name: str) -> float:
         """Get monthly cost for a data source in USD"""
@@ -300,27 +362,13 @@ class PricingConfig:
 
     def list_data_sources(self) -> List[Dict]:
         """List all configured data sources"""
-        return self.config.get('data_sources', [])
+        return list(self.config.get('data_sources', []))
 
     # ========== MONITORING PRICING ==========
 
     def get_monitoring_service_pricing(self, service_name: str) -> Optional[Dict]:
-        """Get pricing for a monitoring service"""
-        monitoring = self.config.get('monitoring', {})
-
-        # Check Azure Monitor services
-        azure_monitor = monitoring.get('azure_monitor', [])
-        for service in azure_monitor:
-            if service.get('name').lower() == service_name.lower():
-                return service
-
-        # Check third-party services
-        third_party = monitoring.get('third_party', [])
-        for service in third_party:
-            if service.get('name').lower() == service_name.lower():
-                return service
-
-        return None
+        """Get pricing for a monitoring service (case-insensitive)"""
+        return self.indexes['monitoring_services'].get(service_name.casefold())
 
     def list_monitoring_services(self) -> List[Dict]:
         """List all monitoring services"""
@@ -0,0 +1,217 @@
+"""
+Pricing Store (hot reload)
+
+LLM token prices (config/LLM_Pricing.json) and the infrastructure catalog
+(config/pricing.yaml, app/pricing_config.py) can change while the API is
+running. The store holds the LLM prices as an immutable, versioned snapshot,
+and a background task polls both files' modification time and size. A
+changed file is read, parsed, validated and indexed in a worker thread
+(asyncio.to_thread), so the event loop never waits on file I/O or parsing,
+and the new snapshot is then published with a single reference assignment.
+
+Readers take the snapshot reference once and see either the old prices or
+the new ones, never a mix. A file that fails to parse or validate is
+reported (stats, metrics) and the previous snapshot stays in use. Snapshots
+are published from the event loop, so a synchronous calculation such as
+/calculate always runs against one version. The version is a content hash;
+cached cost results are tied to it (app/cost_cache.py) and are dropped as
+soon as new prices are published.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from app.metrics import PRICING_RELOADS, registry
+from app.pricing_config import freeze, get_pricing_config
+
+
+def pricing_fingerprint(pricing: Dict[str, Any]) -> str:
+    """Short content hash identifying a version of the pricing data"""
+    canonical = json.dumps(pricing, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMPricingSnapshot(NamedTuple):
+    version: str
+    # model id → {"input", "output", "cache_read"} in USD per 1M tokens
+    models: Mapping[str, Mapping[str, Any]]
+    last_updated: Optional[str] = None
+
+
+def _valid_price(price: Any) -> bool:
+    """A price is a non-negative number, null (not offered) or {tier: number}"""
+    if price is None:
+        return True
+    if isinstance(price, dict):
+        return all(_valid_price(tier) and tier is not None for tier in price.values())
+    return (isinstance(price, (int, float)) and not isinstance(price, bool)
+            and math.isfinite(price) and price >= 0)
+
+
+def parse_llm_pricing(data: Any) -> LLMPricingSnapshot:
+    """Flatten and validate LLM_Pricing.json (providers → model id → prices)"""
+    if not isinstance(data, dict) or not isinstance(data.get('providers'), dict):
+        raise ValueError("LLM pricing must be an object with a 'providers' object")
+
+    pricing = {}
+    for provider, models in data['providers'].items():
+        if not isinstance(models, dict):
+            raise ValueError(f"Provider {provider!r} must map model ids to prices")
+        for model_id, model_data in models.items():
+            if not isinstance(model_data, dict):
+                raise ValueError(f"{provider}/{model_id}: prices must be an object")
+            prices = {
+                'input': model_data.get('input', 0.0),
+                'output': model_data.get('output', 0.0),
+                'cache_read': model_data.get('cachedInput', 0.0)
+            }
+            for name, price in prices.items():
+                if not _valid_price(price):
+                    raise ValueError(f"{provider}/{model_id}: invalid {name} price {price!r}")
+            pricing[model_id] = prices
+
+    if not pricing:
+        raise ValueError("LLM pricing lists no models")
+    return LLMPricingSnapshot(pricing_fingerprint(pricing), freeze(pricing), data.get('lastUpdated'))
+
+
+EMPTY_LLM_PRICING = LLMPricingSnapshot(pricing_fingerprint({}), MappingProxyType({}))
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime in ns, size) of a file, or None if it can't be read"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PricingStore:
+    """Versioned LLM pricing snapshot with polling hot reload of the pricing files"""
+
+    def __init__(self, llm_pricing_path: Path, poll_seconds: float = 5.0):
+        self.llm_pricing_path = Path(llm_pricing_path)
+        self.poll_seconds = poll_seconds
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # Initial load at import time, as before: a missing or invalid file
+        # leaves the calculator on its default prices
+        self._signatures['llm_pricing'] = file_signature(self.llm_pricing_path)
+        try:
+            self.llm = self._read_llm_pricing()
+        except Exception as e:
+            print(f"Error loading LLM_Pricing.json: {e}")
+            self.llm = EMPTY_LLM_PRICING
+        self.published_at = time.time()
+
+    @property
+    def llm_pricing(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.llm.models
+
+    @property
+    def version(self) -> str:
+        return self.llm.version
+
+    def _read_llm_pricing(self) -> LLMPricingSnapshot:
+        """Read and validate LLM_Pricing.json (blocking)"""
+        with open(self.llm_pricing_path, 'r') as f:
+            return parse_llm_pricing(json.load(f))
+
+    def _publish_llm(self, snapshot: LLMPricingSnapshot):
+        self.llm = snapshot
+
+    def _watched(self) -> List[Tuple[str, Path, Callable[[], Any], Callable[[Any], None]]]:
+        """(name, path, blocking loader, publisher) for each pricing file"""
+        pricing_config = get_pricing_config()
+        return [
+            ('llm_pricing', self.llm_pricing_path, self._read_llm_pricing, self._publish_llm),
+            ('pricing_config', pricing_config.config_path, pricing_config.load_snapshot, pricing_config.publish),
+        ]
+
+    def _load_if_changed(self, name: str, path: Path, load: Callable[[], Any], force: bool):
+        """Runs in a worker thread: the new snapshot, or None if the file is unchanged"""
+        signature = file_signature(path)
+        if not force and (signature is None or signature == self._signatures.get(name)):
+            return None
+        # Recorded before loading, so a broken file is reported once, not on every poll
+        self._signatures[name] = signature
+        return load()
+
+    async def check(self, force: bool = False) -> List[str]:
+        """Reload the pricing files that changed (or all, with force); returns those published"""
+        published = []
+        async with self._lock:
+            for name, path, load, publish in self._watched():
+                try:
+                    snapshot = await asyncio.to_thread(self._load_if_changed, name, path, load, force)
+                except Exception as e:
+                    self.failures += 1
+                    self.last_error = f"{path.name}: {e}"
+                    print(f"Error reloading {path.name}, keeping the previous pricing: {e}")
+                    if registry.enabled:
+                        PRICING_RELOADS.inc(name, "error")
+                    continue
+                if snapshot is None:
+                    continue
+                publish(snapshot)
+                published.append(name)
+                self.reloads += 1
+                self.published_at = time.time()
+                if registry.enabled:
+                    PRICING_RELOADS.inc(name, "ok")
+        return published
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            await self.check()
+
+    async def start(self):
+        """Start polling the pricing files (called from the application lifespan)"""
+        if self._task is not None or self.poll_seconds <= 0:
+            return
+        # The files as loaded so far are the baseline for change detection
+        for name, path, _, _ in self._watched():
+            self._signatures.setdefault(name, await asyncio.to_thread(file_signature, path))
+        self._task = asyncio.create_task(self._watch(), name="pricing-reload")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "llmModels": len(self.llm.models),
+            "llmPricingLastUpdated": self.llm.last_updated,
+            "pricingConfigVersion": get_pricing_config().version,
+            "pollSeconds": self.poll_seconds,
+            "watching": self._task is not None,
+            "publishedAt": self.published_at,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "lastError": self.last_error,
+        }
+
+
+# Singleton instance
+pricing_store = PricingStore(
+    llm_pricing_path=Path(__file__).parent.parent / "config" / "LLM_Pricing.json",
+    poll_seconds=float(os.getenv("QA_AGENT_PRICING_RELOAD_SECONDS", "5")),
+)
@@ -0,0 +1,190 @@
+"""
+Prompt Prefix Cache
+
+Every agent prompt is assembled in the same order:
+
+    shared system prompt → application context → agent instructions → task
+
+so calls from different agents about the same application start with a
+byte-identical prefix, which is what provider-side prompt caching
+(cached input tokens) bills at the cheaper rate. The system and instruction
+segments are rendered once per process and reused.
+
+Per model, the cache hit rate comes from one of two sources:
+
+- measured: the cached prompt tokens the provider reports in its responses
+  (usage.prompt_tokens_details.cached_tokens, recorded by record_usage)
+- estimated: when the backend reports no cached-token counts (e.g. the
+  simulated backend), the cache tracks which prefixes each model has seen
+  recently (a prefix expires after the provider's cache lifetime,
+  QA_AGENT_PREFIX_CACHE_TTL) and estimates how many prompt tokens a
+  provider would have served from its cache
+
+Either rate can replace the calculator's assumed cache_hit_rate (POST
+/api/cost/calculate with use_measured_cache_hit_rates); the response says
+which source each model's rate came from.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.llm_backends import LLMResponse, estimate_tokens
+
+SYSTEM_PROMPT = (
+    "You are part of the QA AI Agent platform, a team of agents (Planner, Generator, Healer) that plan, "
+    "write and repair automated tests for web applications. Be precise and concise, prefer stable "
+    "selectors and deterministic assertions, and answer only with what the task asks for."
+)
+
+# Per-agent instructions, placed after the shared application context
+AGENT_INSTRUCTIONS = {
+    "planner": "Role: Planner. Produce risk-based test cases with steps, priority and risk.",
+    "generator": "Role: Generator. Write executable test code for the requested framework.",
+    "healer": "Role: Healer. Find the root cause of test failures and propose the smallest fix.",
+}
+
+
+def app_context(app_name: str, test_url: str) -> str:
+    """Application context shared by every agent working on the same app"""
+    return f"Application: '{app_name.strip()}' at {test_url.strip().rstrip('/')}"
+
+
+MEASURED = "measured"
+ESTIMATED = "estimated"
+
+
+class PromptPrefixCache:
+    """Per-model LRU of recently sent prompt prefixes, with provider-reported or estimated hit rates"""
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 300, min_requests: int = 20):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_requests = min_requests
+
+        # (model, prefix digest) → last used (monotonic)
+        self._entries: "OrderedDict[tuple, float]" = OrderedDict()
+        # model → {"requests", "prefixHits", "promptTokens", "cachedTokens" (estimated),
+        #          "reportedRequests", "reportedPromptTokens", "reportedCachedTokens" (provider usage)}
+        self._models: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+
+    def build(self, agent: str, model: str, context: str, task: str) -> str:
+        """Assemble a prompt for `model` and record how much of it was a cached prefix"""
+        prefixes = [SYSTEM_PROMPT, context, AGENT_INSTRUCTIONS.get(agent, "")]
+        prompt = "\n\n".join(segment for segment in [*prefixes, task] if segment)
+
+        now = time.monotonic()
+        digest = hashlib.blake2b(digest_size=16)
+        cached_tokens = 0
+        chain_intact = True
+        for segment in prefixes:
+            if not segment:
+                continue
+            digest.update(segment.encode("utf-8"))
+            digest.update(b"\0")
+            key = (model, digest.digest())
+            last_used = self._entries.get(key)
+            if chain_intact and last_used is not None and now - last_used <= self.ttl_seconds:
+                cached_tokens += estimate_tokens(segment)
+            else:
+                # The provider can only reuse a prefix up to the first segment it hasn't seen
+                chain_intact = False
+            self._entries[key] = now
+            self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        counters = self._counters(model)
+        counters["requests"] += 1
+        counters["prefixHits"] += 1 if cached_tokens else 0
+        counters["promptTokens"] += estimate_tokens(prompt)
+        counters["cachedTokens"] += cached_tokens
+        return prompt
+
+    def _counters(self, model: str) -> Dict[str, int]:
+        counters = self._models.get(model)
+        if counters is None:
+            counters = self._models[model] = {
+                "requests": 0, "prefixHits": 0, "promptTokens": 0, "cachedTokens": 0,
+                "reportedRequests": 0, "reportedPromptTokens": 0, "reportedCachedTokens": 0,
+            }
+        return counters
+
+    def record_usage(self, response: LLMResponse):
+        """Record the cached prompt tokens the provider reported for a response (if any)"""
+        if response.cached_tokens is None:
+            return
+        counters = self._counters(response.model)
+        counters["reportedRequests"] += 1
+        counters["reportedPromptTokens"] += response.prompt_tokens
+        counters["reportedCachedTokens"] += response.cached_tokens
+
+    def hit_rate_with_source(self, model: str) -> Optional[Tuple[float, str]]:
+        """
+        (hit rate, source) for a model: provider-reported cached tokens once
+        min_requests responses reported them, else the local estimate once
+        min_requests prompts were built, else None
+        """
+        counters = self._models.get(model)
+        if counters is None:
+            return None
+        if counters["reportedRequests"] >= self.min_requests and counters["reportedPromptTokens"]:
+            return counters["reportedCachedTokens"] / counters["reportedPromptTokens"], MEASURED
+        if counters["requests"] >= self.min_requests and counters["promptTokens"]:
+            return counters["cachedTokens"] / counters["promptTokens"], ESTIMATED
+        return None
+
+    def hit_rate(self, model: str) -> Optional[float]:
+        """Share of the model's prompt tokens served from the provider's cache (None until min_requests)"""
+        rate = self.hit_rate_with_source(model)
+        return rate[0] if rate else None
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Hit rate of every model with enough requests (measured or estimated)"""
+        return {model: rate for model, (rate, _) in self._rates().items()}
+
+    def hit_rate_sources(self) -> Dict[str, str]:
+        """Source ("measured" or "estimated") of every rate in hit_rates()"""
+        return {model: source for model, (_, source) in self._rates().items()}
+
+    def _rates(self) -> Dict[str, Tuple[float, str]]:
+        rates = {model: self.hit_rate_with_source(model) for model in self._models}
+        return {model: rate for model, rate in rates.items() if rate is not None}
+
+    def clear(self):
+        self._entries.clear()
+        self._models.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "minRequests": self.min_requests,
+            "evictions": self.evictions,
+            "models": [
+                {
+                    "model": model,
+                    **counters,
+                    "tokenHitRate": round(counters["cachedTokens"] / counters["promptTokens"], 4)
+                    if counters["promptTokens"] else 0.0,
+                    "reportedHitRate": round(counters["reportedCachedTokens"] / counters["reportedPromptTokens"], 4)
+                    if counters["reportedPromptTokens"] else None,
+                    "hitRateSource": (self.hit_rate_with_source(model) or (None, None))[1],
+                }
+                for model, counters in self._models.items()
+            ],
+        }
+
+
+# Singleton instance
+prompt_cache = PromptPrefixCache(
+    max_entries=int(os.getenv("QA_AGENT_PREFIX_CACHE_SIZE", "4096")),
+    ttl_seconds=float(os.getenv("QA_AGENT_PREFIX_CACHE_TTL", "300")),
+    min_requests=int(os.getenv("QA_AGENT_PREFIX_CACHE_MIN_REQUESTS", "20")),
+)
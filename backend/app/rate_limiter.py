@@ -0,0 +1,289 @@
+"""
+LLM Rate Limiter
+
+Per-model token-bucket scheduler for the agents' LLM calls. Each model id in
+LLM_CATEGORIES gets a requests-per-minute and a tokens-per-minute bucket. A
+call reserves one request plus its estimated tokens (prompt + max_tokens)
+before it is sent, and the unused part of the estimate is refunded once the
+real usage is known.
+
+When a bucket is empty, calls queue instead of being sent (and answered with
+429). Queues are per agent and served round-robin, so a burst of generator
+calls can't starve planner calls for the same model; within an agent, calls
+are served in arrival order. Nothing polls: one timer per model wakes the
+queue when the head call's tokens will be available.
+
+Limits default per LLM_CATEGORIES tier and can be overridden per model with
+QA_AGENT_LLM_LIMITS, e.g. '{"gpt-4o": {"rpm": 500, "tpm": 30000}}'.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.metrics import QUEUE_DEPTH, QUEUE_WAIT, registry
+
+# Make backend/config importable regardless of the working directory
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.service_tiers import LLM_CATEGORIES
+
+# Default limits per tier (requests/min, tokens/min)
+TIER_LIMITS = {
+    ("cheap", "cloud_api"): {"rpm": 10000, "tpm": 10_000_000},
+    ("mid_range", "cloud_api"): {"rpm": 5000, "tpm": 2_000_000},
+    ("expensive", "cloud_api"): {"rpm": 500, "tpm": 300_000},
+    ("cheap", "on_premise"): {"rpm": 1200, "tpm": 1_000_000},
+    ("mid_range", "on_premise"): {"rpm": 600, "tpm": 400_000},
+    ("expensive", "on_premise"): {"rpm": 300, "tpm": 150_000},
+}
+
+# Limits for models that aren't in LLM_CATEGORIES
+FALLBACK_LIMITS = {"rpm": 500, "tpm": 200_000}
+
+
+def default_model_limits() -> Dict[str, Dict[str, int]]:
+    """Limits for every model id in LLM_CATEGORIES, from its tier"""
+    return {
+        model["id"]: dict(TIER_LIMITS.get((category, deployment), FALLBACK_LIMITS))
+        for category, deployments in LLM_CATEGORIES.items()
+        for deployment, models in deployments.items()
+        for model in models
+    }
+
+
+class TokenBucket:
+    """Holds up to `per_minute` units, refilled continuously at per_minute/60 per second"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)"""
+        self.refill(now)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        # May go negative: usage above the estimate is paid back by waiting
+        self.level -= amount
+
+    def give_back(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class Permit:
+    """A granted reservation; set used_tokens once the real usage is known"""
+
+    def __init__(self, model: str, reserved_tokens: int, waited_seconds: float):
+        self.model = model
+        self.reserved_tokens = reserved_tokens
+        self.waited_seconds = waited_seconds
+        self.used_tokens: Optional[int] = None
+
+
+class ModelRateLimiter:
+    """RPM + TPM buckets and the fair wait queue for one model"""
+
+    def __init__(self, model: str, rpm: int, tpm: int):
+        self.model = model
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+        # agent → FIFO of [future, tokens, enqueued_at]; dict order is the round-robin order
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.granted = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self, agent: str, tokens: int) -> Permit:
+        tokens = min(tokens, int(self.tokens.capacity))
+        now = time.monotonic()
+
+        if not self.queue_depth and self._wait_time(tokens, now) == 0:
+            self._grant(tokens, 0.0)
+            return Permit(self.model, tokens, 0.0)
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(agent, deque()).append([future, tokens, now])
+        self.queue_depth += 1
+        self.queued += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        if self._timer is None:
+            self._dispatch()
+
+        try:
+            waited = await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller gave up: return the reservation
+                self.release(Permit(self.model, tokens, 0.0), used_tokens=0)
+            else:
+                future.cancel()
+                self.queue_depth -= 1
+                self._kick()
+            raise
+        return Permit(self.model, tokens, waited)
+
+    def release(self, permit: Permit, used_tokens: Optional[int] = None):
+        """Settle a permit against the real token usage (refund or extra charge)"""
+        used = permit.used_tokens if used_tokens is None else used_tokens
+        if used is None:
+            return
+        difference = used - permit.reserved_tokens
+        if difference > 0:
+            self.tokens.take(difference)
+        elif difference < 0:
+            self.tokens.give_back(-difference)
+            if used_tokens == 0:
+                self.requests.give_back(1)
+            self._kick()
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        return max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+    def _grant(self, tokens: int, waited: float):
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self.granted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def _kick(self):
+        """Re-run the dispatcher now (capacity came back or the head left)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.queue_depth:
+            self._dispatch()
+
+    def _dispatch(self):
+        self._timer = None
+        now = time.monotonic()
+        while self._queues:
+            agent, queue = next(iter(self._queues.items()))
+            if not queue:
+                del self._queues[agent]
+                continue
+
+            future, tokens, enqueued_at = queue[0]
+            if future.done():
+                # Cancelled while waiting
+                queue.popleft()
+                continue
+
+            wait = self._wait_time(tokens, now)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+
+            queue.popleft()
+            self.queue_depth -= 1
+            waited = now - enqueued_at
+            self._grant(tokens, waited)
+            future.set_result(waited)
+
+            # Round-robin: this agent goes to the back of the line
+            if queue:
+                self._queues.move_to_end(agent)
+            else:
+                del self._queues[agent]
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        return {
+            "model": self.model,
+            "rpmLimit": int(self.requests.capacity),
+            "tpmLimit": int(self.tokens.capacity),
+            "availableRequests": int(self.requests.level),
+            "availableTokens": int(self.tokens.level),
+            "queueDepth": self.queue_depth,
+            "peakQueueDepth": self.peak_queue_depth,
+            "queueDepthByAgent": {agent: len(queue) for agent, queue in self._queues.items() if queue},
+            "granted": self.granted,
+            "queued": self.queued,
+            "avgWaitSeconds": round(self.total_wait / self.granted, 4) if self.granted else 0.0,
+            "maxWaitSeconds": round(self.max_wait, 4),
+        }
+
+
+class LLMRateLimiter:
+    """Per-model limiters, created on first use"""
+
+    def __init__(self, limits: Dict[str, Dict[str, int]] = None, enabled: bool = True):
+        self.limits = limits if limits is not None else default_model_limits()
+        self.enabled = enabled
+        self._models: Dict[str, ModelRateLimiter] = {}
+
+    def limiter(self, model: str) -> ModelRateLimiter:
+        limiter = self._models.get(model)
+        if limiter is None:
+            limits = self.limits.get(model, FALLBACK_LIMITS)
+            limiter = self._models[model] = ModelRateLimiter(model, limits["rpm"], limits["tpm"])
+        return limiter
+
+    @asynccontextmanager
+    async def acquire(self, agent: str, model: str, tokens: int) -> AsyncIterator[Optional[Permit]]:
+        """
+        Wait for capacity, then run the block. Set permit.used_tokens inside
+        the block so the reservation is settled against the real usage.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        limiter = self.limiter(model)
+        permit = await limiter.acquire(agent, tokens)
+        if registry.enabled:
+            QUEUE_WAIT.observe(permit.waited_seconds, "llm_rate_limit", model)
+        try:
+            yield permit
+        finally:
+            limiter.release(permit)
+
+    def collect_metrics(self):
+        """Refresh the per-model queue depth gauges (run at each /metrics scrape)"""
+        for model, limiter in list(self._models.items()):
+            QUEUE_DEPTH.set(limiter.queue_depth, "llm_rate_limit", model)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "models": [limiter.stats() for limiter in self._models.values()],
+        }
+
+
+def _configured_limits() -> Dict[str, Dict[str, int]]:
+    limits = default_model_limits()
+    overrides = os.getenv("QA_AGENT_LLM_LIMITS")
+    if overrides:
+        for model, override in json.loads(overrides).items():
+            limits[model] = {**limits.get(model, FALLBACK_LIMITS), **override}
+    return limits
+
+
+# Singleton instance
+llm_rate_limiter = LLMRateLimiter(
+    limits=_configured_limits(),
+    enabled=os.getenv("QA_AGENT_LLM_RATE_LIMITING", "1") != "0",
+)
+registry.add_collector(llm_rate_limiter.collect_metrics)
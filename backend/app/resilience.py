@@ -0,0 +1,320 @@
+"""
+Resilient LLM Calls (hedging + circuit breaking)
+
+Agent latency is dominated by the slowest LLM call. Every agent call goes
+through ResilientLLMClient:
+
+- Hedging: if a call hasn't answered after the p95 latency observed for that
+  agent and model, an identical duplicate is sent and the first response
+  wins (the other is cancelled). Hedging starts once enough samples exist.
+- Circuit breaking: each model has a breaker that opens after consecutive
+  failures and lets a single trial call through after a cooldown. While a
+  model's breaker is open, calls fail over to another model from the same
+  LLM_CATEGORIES tier and deployment (e.g. gpt-4o → gpt-4.1).
+
+Each attempt (including hedges) goes through the per-model rate limiter.
+Stats report the end-to-end p50/p95/p99 latency and the spend on duplicate
+requests that ran to completion, so the hedge percentile can be tuned.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.llm_backends import (
+    BATCH_DISCOUNT, DISCOUNT_SERVICE_TIER, LLMBackendError, LLMRequest, LLMResponse, estimate_tokens, get_backend
+)
+from app.rate_limiter import llm_rate_limiter
+
+# Make backend/config importable regardless of the working directory
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config.service_tiers import LLM_CATEGORIES
+
+# model id → models in the same tier and deployment (LLM_CATEGORIES order)
+TIER_PEERS: Dict[str, List[str]] = {
+    model["id"]: [peer["id"] for peer in models if peer["id"] != model["id"]]
+    for deployments in LLM_CATEGORIES.values()
+    for models in deployments.values()
+    for model in models
+}
+
+# model id → (input, output) USD per 1M tokens; self-hosted models have no per-token price
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    model["id"]: (model.get("input", 0.0), model.get("output", 0.0))
+    for deployments in LLM_CATEGORIES.values()
+    for models in deployments.values()
+    for model in models
+}
+
+
+def percentile(samples, p: float) -> float:
+    """Nearest-rank percentile of a sequence (0.0 if empty)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def response_cost(response: LLMResponse) -> float:
+    """USD cost of a response (discounted when sent on the discount service tier)"""
+    input_price, output_price = MODEL_PRICES.get(response.model, (0.0, 0.0))
+    cost = (response.prompt_tokens * input_price + response.completion_tokens * output_price) / 1_000_000
+    if response.service_tier == DISCOUNT_SERVICE_TIER:
+        cost *= BATCH_DISCOUNT
+    return cost
+
+
+class LatencyTracker:
+    """Rolling window of latencies for one agent + model"""
+
+    def __init__(self, window: int = 1000):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        return percentile(self.samples, p)
+
+
+class CircuitBreaker:
+    """closed → open after N consecutive failures → half-open (one trial call) after a cooldown"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, model: str, failure_threshold: int = 5, cooldown_seconds: float = 30.0):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.opens = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+
+    def release(self):
+        """The call was cancelled: free the trial slot without counting a failure"""
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opens += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "state": self.state,
+            "consecutiveFailures": self.consecutive_failures,
+            "opens": self.opens,
+            "rejected": self.rejected,
+        }
+
+
+class ResilientLLMClient:
+    """Hedged, circuit-broken, rate-limited LLM calls with same-tier failover"""
+
+    def __init__(
+        self,
+        hedging: bool = True,
+        hedge_percentile: float = 95.0,
+        min_samples: int = 20,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0
+    ):
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+
+        self._latency: Dict[Tuple[str, str], LatencyTracker] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._overall = LatencyTracker()
+
+        self.requests = 0
+        self.failed = 0
+        self.failovers = 0
+        self.hedges_launched = 0
+        self.hedges_won = 0
+        self.total_spend = 0.0
+        self.duplicate_spend = 0.0
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers[model] = CircuitBreaker(model, self.failure_threshold, self.cooldown_seconds)
+        return breaker
+
+    def tracker(self, agent: str, model: str) -> LatencyTracker:
+        tracker = self._latency.get((agent, model))
+        if tracker is None:
+            tracker = self._latency[(agent, model)] = LatencyTracker()
+        return tracker
+
+    def hedge_delay(self, agent: str, model: str) -> Optional[float]:
+        """Seconds to wait before sending a duplicate (None = don't hedge yet)"""
+        tracker = self.tracker(agent, model)
+        if not self.hedging or len(tracker.samples) < self.min_samples:
+            return None
+        return tracker.percentile(self.hedge_percentile)
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        """Call the request's model, failing over within its tier while circuits are open or calls fail"""
+        self.requests += 1
+        started = time.perf_counter()
+        last_error: Optional[Exception] = None
+
+        for model in [request.model, *TIER_PEERS.get(request.model, [])]:
+            breaker = self.breaker(model)
+            if not breaker.allow():
+                continue
+            try:
+                response = await self._hedged(request._replace(model=model))
+            except asyncio.CancelledError:
+                # Otherwise a cancelled half-open trial would block the model for good
+                breaker.release()
+                raise
+            except Exception as e:
+                last_error = e
+                continue
+
+            if model != request.model:
+                self.failovers += 1
+            self._overall.record(time.perf_counter() - started)
+            return response
+
+        self.failed += 1
+        raise last_error or LLMBackendError("resilience", f"All circuits open for '{request.model}' and its tier")
+
+    async def _attempt(self, request: LLMRequest) -> LLMResponse:
+        """One rate-limited backend call; feeds the model's breaker and latency window"""
+        breaker = self.breaker(request.model)
+        reserved = estimate_tokens(request.prompt) + request.max_tokens
+        try:
+            async with llm_rate_limiter.acquire(request.agent, request.model, reserved) as permit:
+                response = await get_backend().complete(request)
+                if permit is not None:
+                    permit.used_tokens = response.prompt_tokens + response.completion_tokens
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        self.tracker(request.agent, request.model).record(response.latency_seconds)
+        return response
+
+    async def _hedged(self, request: LLMRequest) -> LLMResponse:
+        """Send the call, plus one duplicate if it outlives the hedge delay; first success wins"""
+        pending = {asyncio.create_task(self._attempt(request))}
+        hedge = None
+        try:
+            delay = self.hedge_delay(request.agent, request.model)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    hedge = asyncio.create_task(self._attempt(request))
+                    pending.add(hedge)
+                    self.hedges_launched += 1
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = []
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    else:
+                        succeeded.append(task)
+                if not succeeded:
+                    continue
+
+                # The original wins a tie; a loser is only billed if it also completed
+                succeeded.sort(key=lambda task: task is hedge)
+                for task in succeeded:
+                    self.total_spend += response_cost(task.result())
+                for task in succeeded[1:]:
+                    self.duplicate_spend += response_cost(task.result())
+                if succeeded[0] is hedge:
+                    self.hedges_won += 1
+                return succeeded[0].result()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        overall = self._overall.samples
+        return {
+            "hedging": {
+                "enabled": self.hedging,
+                "percentile": self.hedge_percentile,
+                "minSamples": self.min_samples,
+                "hedgesLaunched": self.hedges_launched,
+                "hedgesWon": self.hedges_won,
+                "duplicateRequestRate": round(self.hedges_launched / self.requests, 4) if self.requests else 0.0,
+                "duplicateSpendUsd": round(self.duplicate_spend, 6),
+                "totalSpendUsd": round(self.total_spend, 6),
+                "duplicateSpendRatio": round(self.duplicate_spend / self.total_spend, 4) if self.total_spend else 0.0,
+            },
+            "requests": self.requests,
+            "failed": self.failed,
+            "failovers": self.failovers,
+            "latencySeconds": {
+                "p50": round(percentile(overall, 50), 4),
+                "p95": round(percentile(overall, 95), 4),
+                "p99": round(percentile(overall, 99), 4),
+            },
+            "models": [
+                {
+                    "agent": agent,
+                    "model": model,
+                    "samples": len(tracker.samples),
+                    "p50": round(tracker.percentile(50), 4),
+                    "p95": round(tracker.percentile(95), 4),
+                    "p99": round(tracker.percentile(99), 4),
+                    "hedgeDelaySeconds": self.hedge_delay(agent, model),
+                }
+                for (agent, model), tracker in self._latency.items()
+            ],
+            "circuits": [breaker.stats() for breaker in self._breakers.values()],
+        }
+
+
+# Singleton instance
+llm_client = ResilientLLMClient(
+    hedging=os.getenv("QA_AGENT_LLM_HEDGING", "1") != "0",
+    hedge_percentile=float(os.getenv("QA_AGENT_HEDGE_PERCENTILE", "95")),
+    min_samples=int(os.getenv("QA_AGENT_HEDGE_MIN_SAMPLES", "20")),
+    failure_threshold=int(os.getenv("QA_AGENT_BREAKER_FAILURES", "5")),
+    cooldown_seconds=float(os.getenv("QA_AGENT_BREAKER_COOLDOWN", "30")),
+)
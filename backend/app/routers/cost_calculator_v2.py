@@ -6,8 +6,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Mapping, NamedTuple, Tuple
 import json
+import numpy as np
 
 # Import service tier configurations
 from config.service_tiers import (
@@ -18,30 +19,19 @@ from config.service_tiers import (
     get_tier_summary,
     calculate_on_premise_cost
 )
-
-# Load LLM pricing from LLM_Pricing.json
-def load_llm_pricing():
-    """Load LLM pricing from LLM_Pricing.json file"""
-    config_path = os.path.join(os.path.dirname(__file__), '../../config/LLM_Pricing.json')
-    try:
-        with open(config_path, 'r') as f:
-            data = json.load(f)
-            # Flatten the providers structure to model_id: {input, output, ...}
-            pricing = {}
-            for provider, models in data.get('providers', {}).items():
-                for model_id, model_data in models.items():
-                    pricing[model_id] = {
-                        'input': model_data.get('input', 0.0),
-                        'output': model_data.get('output', 0.0),
-                        'cache_read': model_data.get('cachedInput', 0.0)
-                    }
-            return pricing
-    except Exception as e:
-        print(f"Error loading LLM_Pricing.json: {e}")
-        return {}
-
-# Load pricing on module import
-LLM_PRICING_USD = load_llm_pricing()
+from app.prompt_cache import prompt_cache
+from app.cost_cache import cost_cache, cost_cache_key
+from app.pricing_store import pricing_store
+from app.pricing_config import index_by
+
+def pricing_version() -> str:
+    """Version of the pricing data in use (cached cost results are tied to it)"""
+    return pricing_store.version
+
+# On-premise model id → LLM_CATEGORIES entry (GPU type lookups)
+ON_PREMISE_MODELS = index_by(
+    (model for category in LLM_CATEGORIES.values() for model in category.get("on_premise", [])), "id"
+)
 
 # ===========================
 # PRICING CONFIGURATION
@@ -161,6 +151,11 @@ class CostCalculatorRequest(BaseModel):
     cache_hit_rate: float = Field(default=0.70, ge=0.0, le=1.0)
     use_prompt_caching: bool = Field(default=True)
     use_reserved_instances: bool = Field(default=True)
+    use_measured_cache_hit_rates: bool = Field(
+        default=False,
+        description="Use the agents' per-model prompt cache hit rates (provider-reported, or estimated when the "
+                    "backend reports none) instead of cache_hit_rate"
+    )
 
     # MCP Tools (NEW - addresses user's question)
     mcp_tools: List[str] = Field(
@@ -188,6 +183,26 @@ class AgentCostResponse(BaseModel):
     llm_model: str
     deployment_type: str
 
+class AgentCostConfig(BaseModel):
+    """One agent's settings in a batch per-agent cost request"""
+    llm_model: str = Field(..., description="The LLM model used by this agent")
+    deployment_type: str = Field(default="cloud_api", description="cloud_api or on_premise")
+    avg_tokens_per_request: int = Field(default=5000, ge=100, le=100000)
+
+class AgentCostBatchRequest(BaseModel):
+    """Request model for calculating every agent's LLM costs in one call (shared global parameters)"""
+    agents: Dict[str, AgentCostConfig] = Field(..., min_length=1, max_length=100, description="Agent id → agent settings")
+    num_users: int = Field(default=100, ge=1, le=10000)
+    queries_per_user_per_month: int = Field(default=40, ge=1, le=10000)
+    cache_hit_rate: float = Field(default=0.70, ge=0.0, le=1.0)
+    use_prompt_caching: bool = Field(default=True)
+
+class AgentCostBatchResponse(BaseModel):
+    """Response model for batch per-agent costs"""
+    agents: Dict[str, AgentCostResponse]
+    total_llm_cost_monthly: float
+    total_llm_cost_annual: float
+
 class CostBreakdown(BaseModel):
     category: str
     subcategory: str
@@ -271,6 +286,11 @@ class CostCalculatorResponse(BaseModel):
     # NEW: Global Usage Parameters with detailed per-user metrics
     global_usage_metrics: GlobalUsageMetrics
 
+    # Prompt cache hit rates used per model (use_measured_cache_hit_rates), and
+    # where each came from: "measured" (provider-reported) or "estimated"
+    measured_cache_hit_rates: Optional[Dict[str, float]] = None
+    cache_hit_rate_sources: Optional[Dict[str, str]] = None
+
 # ===========================
 # COST CALCULATION FUNCTIONS
 # ===========================
@@ -365,6 +385,73 @@ def calculate_infrastructure_costs(infra: Dict[str, float], use_reserved: bool)
 
     return total, breakdown
 
+def tier_gpu_count(service_tier: str) -> int:
+    """GPUs provisioned for on-premise models per service tier"""
+    return {
+        "basic": 1,      # 1 GPU for basic tier
+        "standard": 2,   # 2 GPUs for standard tier
+        "premium": 4     # 4 GPUs for premium tier
+    }.get(service_tier.lower(), 1)
+
+def gpu_model_cost(model: str, percentage: float, gpu_count: int) -> tuple[float, str, float]:
+    """Monthly AUD cost of one on-premise model's GPU allocation. Returns (cost, gpu_type, gpu_hourly_cost)."""
+    from config.service_tiers import GPU_COSTS
+
+    # Find GPU type for this model
+    gpu_type = ON_PREMISE_MODELS.get(model, {}).get("gpu_type", "A100")  # Default A100
+
+    # Calculate GPU cost for full month (730 hours)
+    gpu_hourly_cost = GPU_COSTS[gpu_type]["hourly_cost"]
+    monthly_cost_per_gpu_usd = gpu_hourly_cost * 730
+    total_gpu_cost_usd = monthly_cost_per_gpu_usd * gpu_count * (percentage / 100)
+
+    # Convert to AUD
+    return total_gpu_cost_usd / AUD_TO_USD, gpu_type, gpu_hourly_cost
+
+def api_model_cost(
+    model: str,
+    percentage: float,
+    total_queries,
+    avg_input_tokens,
+    avg_output_tokens,
+    cache_hit_rate,
+    use_prompt_caching: bool,
+    llm_pricing: Optional[Mapping[str, Mapping[str, Any]]] = None
+):
+    """
+    Monthly AUD cost of one Cloud API model's share of the queries.
+
+    Plain arithmetic on the query and token counts, so it works element-wise
+    on NumPy arrays as well as on scalars (used by /sweep). llm_pricing pins
+    a pricing snapshot (default: the current one).
+
+    Returns (model_cost, input_tokens, output_tokens)
+    """
+    # Get pricing for this model
+    if llm_pricing is None:
+        llm_pricing = pricing_store.llm_pricing
+    pricing = llm_pricing.get(model, {"input": 2.50, "output": 10.00, "cache_read": 1.25})
+
+    # Calculate tokens for this model
+    model_queries = total_queries * (percentage / 100)
+    input_tokens = model_queries * avg_input_tokens
+    output_tokens = model_queries * avg_output_tokens
+
+    # Apply caching
+    if use_prompt_caching and "cache_read" in pricing:
+        cached_input_tokens = input_tokens * cache_hit_rate
+        fresh_input_tokens = input_tokens * (1 - cache_hit_rate)
+
+        # Cost calculation
+        input_cost = (cached_input_tokens / 1000000 * pricing["cache_read"] +
+                     fresh_input_tokens / 1000000 * pricing["input"])
+    else:
+        input_cost = input_tokens / 1000000 * pricing["input"]
+
+    output_cost = output_tokens / 1000000 * pricing["output"]
+    model_cost = (input_cost + output_cost) / AUD_TO_USD  # Convert to AUD
+    return model_cost, input_tokens, output_tokens
+
 def calculate_llm_costs(
     llm_mix: Dict[str, float],
     total_queries: int,
@@ -373,42 +460,30 @@ def calculate_llm_costs(
     cache_hit_rate: float,
     use_prompt_caching: bool,
     deployment_type: str = "cloud_api",
-    service_tier: str = "standard"
+    service_tier: str = "standard",
+    cache_hit_rates: Optional[Dict[str, float]] = None,
+    cache_hit_rate_sources: Optional[Dict[str, str]] = None
 ) -> tuple[float, List[CostBreakdown]]:
-    """Calculate LLM costs based on deployment type: Cloud API (token-based) or On-Premise (GPU-based)"""
+    """
+    Calculate LLM costs based on deployment type: Cloud API (token-based) or On-Premise (GPU-based).
+
+    cache_hit_rates overrides cache_hit_rate for the models it contains
+    (prompt cache rates); cache_hit_rate_sources labels each one "measured"
+    or "estimated" in the breakdown notes.
+    """
     breakdown = []
     total = 0.0
 
     # Handle On-Premise deployment (GPU-based pricing)
     if deployment_type == "on_premise":
-        from config.service_tiers import LLM_CATEGORIES, GPU_COSTS
-
         # Determine number of GPUs based on tier
-        gpu_count = {
-            "basic": 1,      # 1 GPU for basic tier
-            "standard": 2,   # 2 GPUs for standard tier
-            "premium": 4     # 4 GPUs for premium tier
-        }.get(service_tier.lower(), 1)
+        gpu_count = tier_gpu_count(service_tier)
 
         for model, percentage in llm_mix.items():
             if percentage <= 0:
                 continue
 
-            # Find GPU type for this model
-            gpu_type = "A100"  # Default
-            for category in LLM_CATEGORIES.values():
-                for model_info in category.get("on_premise", []):
-                    if model_info["id"] == model:
-                        gpu_type = model_info.get("gpu_type", "A100")
-                        break
-
-            # Calculate GPU cost for full month (730 hours)
-            gpu_hourly_cost = GPU_COSTS[gpu_type]["hourly_cost"]
-            monthly_cost_per_gpu_usd = gpu_hourly_cost * 730
-            total_gpu_cost_usd = monthly_cost_per_gpu_usd * gpu_count * (percentage / 100)
-
-            # Convert to AUD
-            model_cost = total_gpu_cost_usd / AUD_TO_USD
+            model_cost, gpu_type, gpu_hourly_cost = gpu_model_cost(model, percentage, gpu_count)
 
             total += model_cost
 
@@ -440,27 +515,11 @@ def calculate_llm_costs(
             if percentage <= 0:
                 continue
 
-            # Get pricing for this model
-            pricing = LLM_PRICING_USD.get(model, {"input": 2.50, "output": 10.00, "cache_read": 1.25})
-
-            # Calculate tokens for this model
-            model_queries = total_queries * (percentage / 100)
-            input_tokens = model_queries * avg_input_tokens
-            output_tokens = model_queries * avg_output_tokens
-
-            # Apply caching
-            if use_prompt_caching and "cache_read" in pricing:
-                cached_input_tokens = input_tokens * cache_hit_rate
-                fresh_input_tokens = input_tokens * (1 - cache_hit_rate)
-
-                # Cost calculation
-                input_cost = (cached_input_tokens / 1000000 * pricing["cache_read"] +
-                             fresh_input_tokens / 1000000 * pricing["input"])
-            else:
-                input_cost = input_tokens / 1000000 * pricing["input"]
-
-            output_cost = output_tokens / 1000000 * pricing["output"]
-            model_cost = (input_cost + output_cost) / AUD_TO_USD  # Convert to AUD
+            model_cache_hit_rate = (cache_hit_rates or {}).get(model, cache_hit_rate)
+            model_cost, input_tokens, output_tokens = api_model_cost(
+                model, percentage, total_queries, avg_input_tokens, avg_output_tokens,
+                model_cache_hit_rate, use_prompt_caching
+            )
 
             total += model_cost
 
@@ -471,7 +530,9 @@ def calculate_llm_costs(
                 annual_cost=model_cost * 12,
                 unit="tokens",
                 quantity=input_tokens + output_tokens,
-                notes=f"{percentage}% of queries, {cache_hit_rate*100:.0f}% cache hit rate"
+                notes=f"{percentage}% of queries, {model_cache_hit_rate*100:.0f}% cache hit rate"
+                      + (f" ({(cache_hit_rate_sources or {}).get(model, 'measured')})"
+                         if cache_hit_rates and model in cache_hit_rates else "")
             ))
 
     return total, breakdown
@@ -883,8 +944,151 @@ def apply_service_tier_config(params: CostCalculatorRequest) -> CostCalculatorRe
 # MAIN COST CALCULATION
 # ===========================
 
+class CostNode(NamedTuple):
+    """One step of the cost calculation: request fields and/or other nodes in, value out"""
+    inputs: Tuple[str, ...]
+    compute: Callable[[Dict[str, Any]], Any]
+    # Recomputed on every evaluation (reads state outside the request)
+    volatile: bool = False
+
+def _measured_cache_hit_rates(values: Dict[str, Any]) -> Dict[str, Tuple[float, str]]:
+    """(hit rate, source) from the prompt cache for the models in the mix (others keep cache_hit_rate)"""
+    if not values["use_measured_cache_hit_rates"]:
+        return {}
+    rates = {model: prompt_cache.hit_rate_with_source(model) for model in values["llm_mix"]}
+    return {model: rate for model, rate in rates.items() if rate is not None}
+
+def _rates(measured: Dict[str, Tuple[float, str]]) -> Dict[str, float]:
+    return {model: rate for model, (rate, _) in measured.items()}
+
+def _rate_sources(measured: Dict[str, Tuple[float, str]]) -> Dict[str, str]:
+    return {model: source for model, (_, source) in measured.items()}
+
+# Cost calculation as a dependency graph, in topological order. Each
+# calculate_* result is keyed by node name (distinct from request field
+# names); evaluate_cost_graph() recomputes only the nodes whose inputs
+# changed since a previous evaluation.
+COST_GRAPH: Dict[str, CostNode] = {
+    # Infrastructure configuration (tier-based)
+    "infra": CostNode(
+        ("agent_type", "service_tier", "infrastructure_scale"),
+        lambda v: get_agent_infrastructure(
+            v["agent_type"], v["service_tier"], v["infrastructure_scale"], None  # No custom infrastructure for now
+        )
+    ),
+    "measured_rates": CostNode(("use_measured_cache_hit_rates", "llm_mix"), _measured_cache_hit_rates, volatile=True),
+    # LLM costs (handles both Cloud API and On-Premise deployments)
+    "llm": CostNode(
+        ("llm_mix", "num_users", "queries_per_user_per_month", "avg_input_tokens", "avg_output_tokens",
+         "cache_hit_rate", "use_prompt_caching", "deployment_type", "service_tier", "measured_rates"),
+        lambda v: calculate_llm_costs(
+            v["llm_mix"],
+            v["num_users"] * v["queries_per_user_per_month"],
+            v["avg_input_tokens"],
+            v["avg_output_tokens"],
+            v["cache_hit_rate"],
+            v["use_prompt_caching"],
+            deployment_type=v["deployment_type"],
+            service_tier=v["service_tier"],
+            cache_hit_rates=_rates(v["measured_rates"]),
+            cache_hit_rate_sources=_rate_sources(v["measured_rates"])
+        )
+    ),
+    "infrastructure": CostNode(
+        ("infra", "use_reserved_instances"),
+        lambda v: calculate_infrastructure_costs(v["infra"], v["use_reserved_instances"])
+    ),
+    # Tier-based costs using service_tiers.py configurations
+    "data_sources": CostNode(
+        ("agent_type", "service_tier"),
+        lambda v: calculate_data_source_costs(v["agent_type"], v["service_tier"])
+    ),
+    # Data ingestion for monitoring is estimated from queries and users (base 100GB)
+    "monitoring": CostNode(
+        ("num_users", "queries_per_user_per_month", "service_tier"),
+        lambda v: calculate_monitoring_costs(
+            (v["num_users"] * v["queries_per_user_per_month"] * 0.001) + 100, v["service_tier"]
+        )
+    ),
+    "memory_system": CostNode(
+        ("memory_type", "infra", "service_tier"),
+        lambda v: calculate_memory_system_costs(
+            memory_type=v["memory_type"], infrastructure=v["infra"], service_tier=v["service_tier"]
+        )
+    ),
+    "retrieval": CostNode(("service_tier",), lambda v: calculate_retrieval_costs(v["service_tier"])),
+    "security": CostNode(("service_tier",), lambda v: calculate_security_costs(v["service_tier"])),
+    "prompt_tuning": CostNode(("service_tier",), lambda v: calculate_prompt_tuning_costs(v["service_tier"])),
+    # MCP tools (user-selected)
+    "tools": CostNode(
+        ("mcp_tools", "num_users", "queries_per_user_per_month"),
+        lambda v: calculate_mcp_tools_costs(v["mcp_tools"], v["num_users"] * v["queries_per_user_per_month"])
+    ),
+}
+
+def evaluate_cost_graph(
+    params: CostCalculatorRequest,
+    previous: Optional[Dict[str, Any]] = None
+) -> tuple[Dict[str, Any], List[str]]:
+    """
+    Evaluate COST_GRAPH for tier-applied params.
+
+    With the values of a previous evaluation, a node is recomputed only if a
+    request field or node it depends on changed (or it is volatile); other
+    nodes reuse their previous value. A recomputed node that comes out equal
+    to its previous value doesn't invalidate its dependents.
+
+    Returns (values by request field and node name, recomputed node names)
+    """
+    values: Dict[str, Any] = params.model_dump()
+    changed = {
+        field for field, value in values.items()
+        if previous is None or previous.get(field) != value
+    }
+    recomputed = []
+    for name, node in COST_GRAPH.items():
+        if previous is not None and name in previous and not node.volatile and changed.isdisjoint(node.inputs):
+            values[name] = previous[name]
+            continue
+        values[name] = node.compute(values)
+        recomputed.append(name)
+        if previous is None or previous.get(name) != values[name]:
+            changed.add(name)
+    return values, recomputed
+
 async def calculate_costs(params: CostCalculatorRequest):
-    """Calculate comprehensive costs for AI agent deployment"""
+    """
+    Calculate comprehensive costs for AI agent deployment.
+
+    Results are memoized per tier-applied request and pricing version
+    (app/cost_cache.py), except with measured cache hit rates, which change
+    with live traffic. Returned responses may be shared: treat as read-only.
+    """
+    params = prepare_cost_request(params)
+
+    key = None
+    if not params.use_measured_cache_hit_rates:
+        key = cost_cache_key(params)
+        cached = cost_cache.get(key, pricing_version())
+        if cached is not None:
+            return cached
+
+    response = compute_costs(params)
+    if key is not None:
+        cost_cache.put(key, pricing_version(), response)
+    return response
+
+def compute_costs(params: CostCalculatorRequest) -> CostCalculatorResponse:
+    """
+    Synchronous core of calculate_costs, without the result cache. Safe to
+    call from worker threads (/sweep, /monte-carlo, /optimize).
+    """
+    params = prepare_cost_request(params)
+    values, _ = evaluate_cost_graph(params)
+    return build_cost_response(params, values)
+
+def prepare_cost_request(params: CostCalculatorRequest) -> CostCalculatorRequest:
+    """Apply the service tier configuration and validate the agent type"""
 
     # Apply service tier configuration (Basic, Standard, Premium)
     params = apply_service_tier_config(params)
@@ -895,67 +1099,33 @@ async def calculate_costs(params: CostCalculatorRequest):
             status_code=400,
             detail=f"Agent type '{params.agent_type}' not supported. Available: {list(AI_AGENTS.keys())}"
         )
+    return params
 
-    # Get agent configuration
-    agent = AI_AGENTS[params.agent_type]
-
-    # Get infrastructure configuration (tier-based)
-    infra = get_agent_infrastructure(
-        params.agent_type,
-        params.service_tier,
-        params.infrastructure_scale,
-        None  # No custom infrastructure for now
-    )
+def build_cost_response(params: CostCalculatorRequest, values: Dict[str, Any]) -> CostCalculatorResponse:
+    """Totals, savings and usage metrics from evaluated COST_GRAPH values"""
+    infra = values["infra"]
+    measured_rates = _rates(values["measured_rates"])
+    llm_total, llm_breakdown = values["llm"]
+    infra_total, infra_breakdown = values["infrastructure"]
+    data_total, data_breakdown = values["data_sources"]
+    monitor_total, monitor_breakdown = values["monitoring"]
+    memory_total, memory_breakdown = values["memory_system"]
+    retrieval_total, retrieval_breakdown = values["retrieval"]
+    security_total, security_breakdown = values["security"]
+    prompt_tuning_total, prompt_tuning_breakdown = values["prompt_tuning"]
+    tools_total, tools_breakdown = values["tools"]
 
-    # Calculate costs
     total_queries = params.num_users * params.queries_per_user_per_month
     total_input_tokens = total_queries * params.avg_input_tokens
     total_output_tokens = total_queries * params.avg_output_tokens
 
-    # Calculate LLM costs (handles both Cloud API and On-Premise deployments)
-    llm_total, llm_breakdown = calculate_llm_costs(
-        params.llm_mix,
-        total_queries,
-        params.avg_input_tokens,
-        params.avg_output_tokens,
-        params.cache_hit_rate,
-        params.use_prompt_caching,
-        deployment_type=params.deployment_type,
-        service_tier=params.service_tier
-    )
-
-    # Calculate infrastructure costs
-    infra_total, infra_breakdown = calculate_infrastructure_costs(infra, params.use_reserved_instances)
-
-    # Calculate tier-based costs using service_tiers.py configurations
-    data_total, data_breakdown = calculate_data_source_costs(params.agent_type, params.service_tier)
-
-    # Estimate data ingestion for monitoring (based on queries and users)
-    estimated_data_gb = (params.num_users * params.queries_per_user_per_month * 0.001) + 100  # Base 100GB
-    monitor_total, monitor_breakdown = calculate_monitoring_costs(estimated_data_gb, params.service_tier)
-
-    # Calculate MEMORY SYSTEM costs (tier-based)
-    memory_total, memory_breakdown = calculate_memory_system_costs(
-        memory_type=params.memory_type,
-        infrastructure=infra,
-        service_tier=params.service_tier
-    )
-
-    # Calculate RETRIEVAL/RAG costs (NEW - tier-based)
-    retrieval_total, retrieval_breakdown = calculate_retrieval_costs(params.service_tier)
-
-    # Calculate SECURITY costs (NEW - tier-based)
-    security_total, security_breakdown = calculate_security_costs(params.service_tier)
-
-    # Calculate PROMPT TUNING costs (NEW - tier-based)
-    prompt_tuning_total, prompt_tuning_breakdown = calculate_prompt_tuning_costs(params.service_tier)
-
-    # Calculate MCP TOOLS costs (user-selected)
-    total_queries = params.num_users * params.queries_per_user_per_month
-    tools_total, tools_breakdown = calculate_mcp_tools_costs(
-        params.mcp_tools,
-        total_queries
-    )
+    # Report the query-weighted hit rate actually applied across the mix
+    mix_total = sum(params.llm_mix.values())
+    if measured_rates and mix_total > 0:
+        params.cache_hit_rate = sum(
+            percentage * measured_rates.get(model, params.cache_hit_rate)
+            for model, percentage in params.llm_mix.items()
+        ) / mix_total
 
     # Calculate savings
     cache_savings = llm_total * (1 - params.cache_hit_rate) if params.use_prompt_caching else 0
@@ -1027,7 +1197,9 @@ async def calculate_costs(params: CostCalculatorRequest):
         estimated_data_size_gb=infra["storage_hot_tb"] + infra["storage_cool_tb"],
         savings_from_caching=cache_savings,
         savings_from_reserved_instances=reserved_savings,
-        global_usage_metrics=global_usage_metrics  # NEW: Global Usage Parameters
+        global_usage_metrics=global_usage_metrics,  # NEW: Global Usage Parameters
+        measured_cache_hit_rates={model: round(rate, 4) for model, rate in measured_rates.items()} or None,
+        cache_hit_rate_sources=_rate_sources(values["measured_rates"]) or None
     )
 
 # ===========================
@@ -1041,6 +1213,28 @@ async def calculate_costs_endpoint(params: CostCalculatorRequest):
     """Calculate comprehensive costs for AI agent deployment"""
     return await calculate_costs(params)
 
+@router.get("/cache")
+async def cost_cache_stats():
+    """Hit/miss counters, occupancy and estimated memory of the cost result cache"""
+    return cost_cache.stats()
+
+@router.delete("/cache")
+async def clear_cost_cache():
+    """Drop all cached cost results (counters are kept)"""
+    cost_cache.clear()
+    return cost_cache.stats()
+
+@router.get("/pricing")
+async def pricing_status():
+    """Pricing snapshot versions and hot reload counters"""
+    return pricing_store.stats()
+
+@router.post("/pricing/reload")
+async def reload_pricing_files():
+    """Re-read both pricing files now and publish them if valid"""
+    published = await pricing_store.check(force=True)
+    return {"published": published, **pricing_store.stats()}
+
 @router.get("/agents")
 async def list_agents():
     """List all available AI agents"""
@@ -1115,6 +1309,48 @@ async def get_tier_models(tier_id: str, deployment_type: str = "cloud_api"):
         "models": models
     }
 
+def agent_token_split(avg_tokens_per_request):
+    """Input/output tokens per request for a single agent (70/30 split); works on NumPy arrays"""
+    if isinstance(avg_tokens_per_request, np.ndarray):
+        return (avg_tokens_per_request * 0.7).astype(np.int64), (avg_tokens_per_request * 0.3).astype(np.int64)
+    return int(avg_tokens_per_request * 0.7), int(avg_tokens_per_request * 0.3)
+
+def on_premise_agent_cost(llm_model: str, total_queries: int) -> float:
+    """Monthly AUD GPU cost for a single on-premise agent"""
+    from config.service_tiers import GPU_COSTS
+
+    # Find GPU type for this model from LLM_CATEGORIES
+    gpu_type = ON_PREMISE_MODELS.get(llm_model, {}).get("gpu_type", "A100")  # Default A100
+
+    # Calculate hours needed per month (rough estimate based on query load)
+    # Assuming 1 query takes ~2 seconds on average
+    hours_per_month = (total_queries * 2) / 3600  # Convert seconds to hours
+    hours_per_month = max(730, hours_per_month)  # Minimum of full month (730 hours)
+
+    # Use hourly GPU cost
+    monthly_cost_usd = GPU_COSTS[gpu_type]["hourly_cost"] * hours_per_month
+
+    # Convert USD to AUD
+    return monthly_cost_usd / AUD_TO_USD
+
+def agent_cost_response(
+    llm_model: str,
+    deployment_type: str,
+    monthly_cost_aud: float,
+    total_queries: int,
+    avg_input_tokens: int,
+    avg_output_tokens: int
+) -> AgentCostResponse:
+    return AgentCostResponse(
+        agent_llm_cost_monthly=monthly_cost_aud,
+        agent_llm_cost_annual=monthly_cost_aud * 12,
+        total_queries_per_month=total_queries,
+        total_input_tokens_per_month=total_queries * avg_input_tokens,
+        total_output_tokens_per_month=total_queries * avg_output_tokens,
+        llm_model=llm_model,
+        deployment_type=deployment_type
+    )
+
 @router.post("/calculate-agent", response_model=AgentCostResponse)
 async def calculate_agent_cost_endpoint(params: AgentCostRequest):
     """
@@ -1125,35 +1361,11 @@ async def calculate_agent_cost_endpoint(params: AgentCostRequest):
     total_queries = params.num_users * params.queries_per_user_per_month
 
     # Calculate input/output tokens (70/30 split)
-    avg_input_tokens = int(params.avg_tokens_per_request * 0.7)
-    avg_output_tokens = int(params.avg_tokens_per_request * 0.3)
-
-    total_input_tokens = total_queries * avg_input_tokens
-    total_output_tokens = total_queries * avg_output_tokens
+    avg_input_tokens, avg_output_tokens = agent_token_split(params.avg_tokens_per_request)
 
     # Handle on-premise deployment differently
     if params.deployment_type == "on_premise":
-        # Find GPU type for this model from LLM_CATEGORIES
-        from config.service_tiers import LLM_CATEGORIES
-
-        gpu_type = "A100"  # Default
-        for category in LLM_CATEGORIES.values():
-            for model in category.get("on_premise", []):
-                if model["id"] == params.llm_model:
-                    gpu_type = model.get("gpu_type", "A100")
-                    break
-
-        # Calculate hours needed per month (rough estimate based on query load)
-        # Assuming 1 query takes ~2 seconds on average
-        hours_per_month = (total_queries * 2) / 3600  # Convert seconds to hours
-        hours_per_month = max(730, hours_per_month)  # Minimum of full month (730 hours)
-
-        # Use hourly GPU cost
-        from config.service_tiers import GPU_COSTS
-        monthly_cost_usd = GPU_COSTS[gpu_type]["hourly_cost"] * hours_per_month
-
-        # Convert USD to AUD
-        monthly_cost_aud = monthly_cost_usd / AUD_TO_USD
+        monthly_cost_aud = on_premise_agent_cost(params.llm_model, total_queries)
     else:
         # Cloud API - Calculate LLM costs using token pricing
         llm_total, _ = calculate_llm_costs(
@@ -1166,12 +1378,47 @@ async def calculate_agent_cost_endpoint(params: AgentCostRequest):
         )
         monthly_cost_aud = llm_total
 
-    return AgentCostResponse(
-        agent_llm_cost_monthly=monthly_cost_aud,
-        agent_llm_cost_annual=monthly_cost_aud * 12,
-        total_queries_per_month=total_queries,
-        total_input_tokens_per_month=total_input_tokens,
-        total_output_tokens_per_month=total_output_tokens,
-        llm_model=params.llm_model,
-        deployment_type=params.deployment_type
+    return agent_cost_response(
+        params.llm_model, params.deployment_type, monthly_cost_aud, total_queries, avg_input_tokens, avg_output_tokens
+    )
+
+@router.post("/calculate-agents", response_model=AgentCostBatchResponse)
+async def calculate_agent_costs_batch_endpoint(params: AgentCostBatchRequest):
+    """
+    Calculate LLM costs for several agents in one call (same results as one
+    /calculate-agent call per agent). Cloud API agents sharing a model are
+    priced together in one vectorized api_model_cost call.
+    """
+    total_queries = params.num_users * params.queries_per_user_per_month
+
+    monthly_costs: Dict[str, float] = {}
+    cloud_agents_by_model: Dict[str, List[str]] = {}
+    for agent_id, agent in params.agents.items():
+        if agent.deployment_type == "on_premise":
+            monthly_costs[agent_id] = on_premise_agent_cost(agent.llm_model, total_queries)
+        else:
+            cloud_agents_by_model.setdefault(agent.llm_model, []).append(agent_id)
+
+    for model, agent_ids in cloud_agents_by_model.items():
+        avg_tokens = np.array([params.agents[agent_id].avg_tokens_per_request for agent_id in agent_ids])
+        avg_input_tokens, avg_output_tokens = agent_token_split(avg_tokens)
+        model_costs, _, _ = api_model_cost(
+            model, 100.0, total_queries, avg_input_tokens, avg_output_tokens,
+            params.cache_hit_rate, params.use_prompt_caching
+        )
+        monthly_costs.update(zip(agent_ids, model_costs.tolist()))
+
+    agents = {}
+    for agent_id, agent in params.agents.items():
+        avg_input_tokens, avg_output_tokens = agent_token_split(agent.avg_tokens_per_request)
+        agents[agent_id] = agent_cost_response(
+            agent.llm_model, agent.deployment_type, monthly_costs[agent_id],
+            total_queries, avg_input_tokens, avg_output_tokens
+        )
+
+    total_monthly = sum(monthly_costs.values())
+    return AgentCostBatchResponse(
+        agents=agents,
+        total_llm_cost_monthly=total_monthly,
+        total_llm_cost_annual=total_monthly * 12
     )
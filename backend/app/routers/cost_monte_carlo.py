@@ -0,0 +1,208 @@
+"""
+Cost Uncertainty (Monte Carlo)
+
+POST /api/cost/monte-carlo turns the /calculate point estimate into a
+distribution. Uncertain inputs (cache hit rate, users, queries per user,
+input and output tokens) are given as distributions; all draws are sampled
+at once as NumPy arrays and pushed through the same LLM cost formula as
+/calculate (api_model_cost, via vectorized_llm_costs). The response holds
+percentiles (P50/P90/P99 by default) of the monthly total, of cost per user
+and of every cost category.
+
+Categories other than LLM don't depend on the sampled inputs, so they come
+from one reference /calculate run and their percentiles are that value.
+
+Draws are reproducible: pass `seed`, or run in deterministic mode
+(QA_AGENT_SEED). Without either, a seed is generated and returned so the
+run can be repeated.
+"""
+
+import asyncio
+import os
+import secrets
+import time
+from typing import Any, Dict, List, Literal, Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from app import determinism
+from app.routers.cost_calculator_v2 import CostCalculatorRequest
+from app.routers.cost_sweep import field_bounds, tier_constants, vectorized_llm_costs
+
+router = APIRouter()
+
+# Inputs that can be given a distribution
+UNCERTAIN_INPUTS = (
+    "cache_hit_rate", "num_users", "queries_per_user_per_month", "avg_input_tokens", "avg_output_tokens"
+)
+
+CATEGORIES = (
+    "llm_costs", "infrastructure_costs", "data_source_costs", "monitoring_costs", "memory_system_costs",
+    "retrieval_costs", "security_costs", "prompt_tuning_costs", "mcp_tools_costs",
+)
+
+MAX_SAMPLES = int(os.getenv("QA_AGENT_MONTE_CARLO_MAX_SAMPLES", "1000000"))
+
+# Parameters each distribution needs
+_REQUIRED = {
+    "fixed": ("value",),
+    "uniform": ("low", "high"),
+    "normal": ("mean", "std"),
+    "lognormal": ("mean", "std"),
+    "triangular": ("low", "mode", "high"),
+    "beta": ("alpha", "beta"),
+}
+
+
+class Distribution(BaseModel):
+    """
+    Distribution of one uncertain input.
+
+    lognormal takes the mean and std of the input itself (not of its log);
+    beta is scaled to [low, high], [0, 1] by default.
+    """
+    kind: Literal["fixed", "uniform", "normal", "lognormal", "triangular", "beta"]
+    value: Optional[float] = None
+    low: Optional[float] = None
+    high: Optional[float] = None
+    mode: Optional[float] = None
+    mean: Optional[float] = None
+    std: Optional[float] = Field(default=None, ge=0)
+    alpha: Optional[float] = Field(default=None, gt=0)
+    beta: Optional[float] = Field(default=None, gt=0)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        missing = [name for name in _REQUIRED[self.kind] if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{self.kind} distribution needs {', '.join(missing)}")
+
+        if self.kind == "fixed":
+            return np.full(size, self.value, dtype=np.float64)
+        if self.kind == "uniform":
+            if self.low > self.high:
+                raise ValueError("uniform distribution needs low <= high")
+            return rng.uniform(self.low, self.high, size)
+        if self.kind == "normal":
+            return rng.normal(self.mean, self.std, size)
+        if self.kind == "lognormal":
+            if self.mean <= 0:
+                raise ValueError("lognormal distribution needs mean > 0")
+            sigma2 = np.log1p((self.std / self.mean) ** 2)
+            return rng.lognormal(np.log(self.mean) - sigma2 / 2, np.sqrt(sigma2), size)
+        if self.kind == "triangular":
+            if not self.low <= self.mode <= self.high or self.low == self.high:
+                raise ValueError("triangular distribution needs low <= mode <= high and low < high")
+            return rng.triangular(self.low, self.mode, self.high, size)
+        low = 0.0 if self.low is None else self.low
+        high = 1.0 if self.high is None else self.high
+        return low + (high - low) * rng.beta(self.alpha, self.beta, size)
+
+
+class CostMonteCarloRequest(CostCalculatorRequest):
+    """A /calculate request plus distributions for its uncertain inputs"""
+    distributions: Dict[str, Distribution] = Field(
+        default={},
+        description=f"Uncertain inputs ({', '.join(UNCERTAIN_INPUTS)}); others keep their single value"
+    )
+    samples: int = Field(default=100000, ge=100)
+    seed: Optional[int] = Field(default=None, ge=0, description="Seed for reproducible draws")
+    percentiles: List[float] = Field(default=[50, 90, 99], min_length=1)
+
+
+def summarize(values: np.ndarray, percentiles: List[float]) -> Dict[str, float]:
+    """Mean, standard deviation and requested percentiles of a sample"""
+    points = np.percentile(values, percentiles)
+    return {
+        "mean": round(float(values.mean()), 2),
+        "std": round(float(values.std()), 2),
+        **{f"P{p:g}": round(float(v), 2) for p, v in zip(percentiles, points)},
+    }
+
+
+def run_monte_carlo(request: CostMonteCarloRequest) -> Dict[str, Any]:
+    """Sample and evaluate all draws (CPU-bound, runs in a worker thread)"""
+    started = time.perf_counter()
+
+    unknown = set(request.distributions) - set(UNCERTAIN_INPUTS)
+    if unknown:
+        raise ValueError(f"No distribution allowed for {sorted(unknown)}. Uncertain inputs: {list(UNCERTAIN_INPUTS)}")
+    if request.samples > MAX_SAMPLES:
+        raise ValueError(f"{request.samples} samples exceeds the limit of {MAX_SAMPLES}")
+    if any(not 0 <= p <= 100 for p in request.percentiles):
+        raise ValueError("percentiles must be between 0 and 100")
+
+    seed = request.seed if request.seed is not None else determinism.get_seed()
+    if seed is None:
+        seed = secrets.randbits(32)
+    rng = np.random.default_rng(seed)
+
+    constants = tier_constants(request, request.service_tier)
+    params, reference = constants["params"], constants["reference"]
+
+    # Draws are clipped to the ranges /calculate accepts (cache hit rate to [0, 1])
+    inputs = {}
+    for name in UNCERTAIN_INPUTS:
+        distribution = request.distributions.get(name)
+        if distribution is None:
+            continue
+        try:
+            draws = distribution.sample(rng, request.samples)
+        except ValueError as e:
+            raise ValueError(f"Distribution for '{name}': {e}")
+        low, high = (0.0, 1.0) if name == "cache_hit_rate" else field_bounds(name)
+        inputs[name] = np.clip(draws, low, high)
+
+    num_users = inputs.get("num_users", params.num_users)
+    queries = inputs.get("queries_per_user_per_month", params.queries_per_user_per_month)
+
+    if params.deployment_type == "on_premise":
+        # GPU capacity is provisioned per tier, independent of usage
+        llm = np.full(request.samples, reference.llm_costs)
+    else:
+        llm = vectorized_llm_costs(
+            params,
+            num_users * queries,
+            inputs.get("avg_input_tokens", params.avg_input_tokens),
+            inputs.get("avg_output_tokens", params.avg_output_tokens),
+            cache_hit_rate=inputs.get("cache_hit_rate"),
+            # A sampled cache hit rate replaces measured per-model rates too
+            cache_hit_rates=None if "cache_hit_rate" in inputs else constants["cache_hit_rates"],
+        )
+        llm = np.broadcast_to(llm, (request.samples,))
+
+    total = llm + constants["fixed_costs"]
+    categories = {
+        category: summarize(
+            llm if category == "llm_costs" else np.full(1, getattr(reference, category)),
+            request.percentiles
+        )
+        for category in CATEGORIES
+    }
+
+    return {
+        "samples": request.samples,
+        "seed": seed,
+        "service_tier": params.service_tier,
+        "deployment_type": params.deployment_type,
+        "point_estimate": round(reference.total_monthly_cost, 2),
+        "total_monthly_cost": summarize(total, request.percentiles),
+        "total_annual_cost": summarize(total * 12, request.percentiles),
+        "cost_per_user": summarize(total / num_users, request.percentiles),
+        "categories": categories,
+        "elapsedSeconds": round(time.perf_counter() - started, 4),
+    }
+
+
+@router.post("/monte-carlo")
+async def cost_monte_carlo(request: CostMonteCarloRequest):
+    """
+    Monte Carlo cost estimate: percentiles of the monthly total, cost per
+    user and each cost category (monthly AUD) over `samples` draws of the
+    uncertain inputs.
+    """
+    try:
+        return await asyncio.to_thread(run_monte_carlo, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,350 @@
+"""
+Cost Optimizer
+
+POST /api/cost/optimize searches service tiers, deployment types, memory
+types and LLM mixes for the cheapest configuration that fits a monthly
+budget and a minimum quality, and returns the cost/quality Pareto set.
+
+Quality is a query-weighted capability score: models score 1 (cheap),
+2 (mid_range) or 3 (expensive) from their LLM_CATEGORIES category, or what
+the request's `model_quality` says.
+
+Candidate models are each tier's own llm_mix models, plus (for Cloud API
+deployment) any model from the LLM pricing table that the request gives a
+score in `model_quality`. Most of the pricing table has no quality rating,
+so searching all of it would just pick the cheapest model whatever it is.
+
+- LLM mix (continuous): for a given tier and deployment type, mix cost and
+  quality are both linear in the model percentages, so "cheapest mix with
+  quality >= q" is a two-constraint LP. Its optimum mixes at most two
+  models, adjacent on the lower convex hull of the models' (quality, cost)
+  points, so the LP is solved exactly by building that hull once.
+- Tier / deployment / memory (discrete): best-first branch-and-bound.
+  A tier node is first bounded by its LLM cost alone (no /calculate run),
+  then by LLM cost plus its fixed costs with the cheapest memory type.
+  Nodes over budget or dominated by the Pareto set found so far are pruned.
+
+The search stops at the time limit and reports whether it completed.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException
+from pydantic import Field
+
+from app.prompt_cache import prompt_cache
+from app.pricing_store import pricing_store
+from app.routers.cost_calculator_v2 import (
+    LLM_CATEGORIES,
+    CostCalculatorRequest,
+    api_model_cost,
+    apply_service_tier_config,
+    calculate_memory_system_costs,
+    get_agent_infrastructure,
+    gpu_model_cost,
+    tier_gpu_count,
+)
+from app.routers.cost_sweep import tier_constants
+
+router = APIRouter()
+
+CAPABILITY_SCORES = {"cheap": 1.0, "mid_range": 2.0, "expensive": 3.0}
+
+# Accepted memory_types (dash/underscore and case variants are normalized)
+MEMORY_TYPES = ("redis", "cosmos_db", "cosmosdb", "neo4j", "in_memory")
+
+MODEL_CAPABILITY = {
+    model["id"]: category
+    for category, deployments in LLM_CATEGORIES.items()
+    for models in deployments.values()
+    for model in models
+}
+
+DEFAULT_TIME_LIMIT_MS = int(os.getenv("QA_AGENT_OPTIMIZER_TIME_LIMIT_MS", "2000"))
+
+# Quality comparisons tolerate float rounding in mix percentages
+_EPSILON = 1e-9
+
+
+class CostOptimizerRequest(CostCalculatorRequest):
+    """A /calculate request plus the search space and constraints"""
+    service_tiers: List[str] = Field(default=["basic", "standard", "premium"], min_length=1)
+    deployment_types: List[Literal["cloud_api", "on_premise"]] = Field(
+        default=["cloud_api", "on_premise"], min_length=1
+    )
+    memory_types: List[str] = Field(
+        default=["redis", "cosmos-db", "neo4j"], min_length=1,
+        description="Memory types to consider (add in_memory for non-production setups)"
+    )
+    budget: Optional[float] = Field(default=None, gt=0, description="Maximum monthly cost (AUD)")
+    min_quality: float = Field(default=1.0, ge=0, description="Minimum query-weighted quality score")
+    min_capability: Optional[Literal["cheap", "mid_range", "expensive"]] = Field(
+        default=None, description="Only use models of at least this category"
+    )
+    model_quality: Dict[str, float] = Field(
+        default={}, description="Quality score per model; scored pricing-table models are also searched (Cloud API)"
+    )
+    time_limit_ms: int = Field(default=DEFAULT_TIME_LIMIT_MS, ge=10, le=60000)
+
+
+def model_quality(model: str, overrides: Dict[str, float]) -> float:
+    if model in overrides:
+        return overrides[model]
+    return CAPABILITY_SCORES[MODEL_CAPABILITY.get(model, "cheap")]
+
+
+def validate_request(request: CostOptimizerRequest):
+    """Reject memory types and scored models the calculator can't price"""
+    unknown = [m for m in request.memory_types if m.replace("-", "_").lower() not in MEMORY_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown memory types {unknown}. Known: redis, cosmos-db, neo4j, in_memory")
+
+    llm_pricing = pricing_store.llm_pricing
+    for model in request.model_quality:
+        if model in MODEL_CAPABILITY:
+            continue
+        prices = llm_pricing.get(model)
+        if prices is None:
+            raise ValueError(f"Unknown model '{model}' in model_quality")
+        if not all(isinstance(prices[name], (int, float)) for name in ("input", "output", "cache_read")):
+            raise ValueError(f"Model '{model}' has no flat per-token price and can't be optimized over")
+
+
+def efficient_frontier(points: List[Tuple[float, float, str]]) -> List[Tuple[float, float, str]]:
+    """
+    Vertices of the cheapest-mix frontier for (quality, cost, model) points:
+    drop models that a cheaper model of at least the same quality dominates,
+    then keep the lower convex hull. Returned by increasing quality and cost.
+    """
+    staircase = []
+    for quality, cost, model in sorted(points, key=lambda p: (-p[0], p[1])):
+        if not staircase or cost < staircase[-1][1]:
+            staircase.append((quality, cost, model))
+    staircase.reverse()
+
+    hull: List[Tuple[float, float, str]] = []
+    for point in staircase:
+        while len(hull) >= 2:
+            (q1, c1, _), (q2, c2, _) = hull[-2], hull[-1]
+            # Drop the middle point if it lies on or above the segment
+            if (c2 - c1) * (point[0] - q1) >= (point[1] - c1) * (q2 - q1):
+                hull.pop()
+            else:
+                break
+        hull.append(point)
+    return hull
+
+
+def cheapest_mix(frontier: List[Tuple[float, float, str]], min_quality: float) -> Optional[Tuple[float, float, Dict[str, float]]]:
+    """LP optimum: (quality, cost, mix percentages) of the cheapest mix with quality >= min_quality"""
+    if not frontier or frontier[-1][0] < min_quality - _EPSILON:
+        return None
+    if frontier[0][0] >= min_quality - _EPSILON:
+        quality, cost, model = frontier[0]
+        return quality, cost, {model: 100.0}
+    for (q1, c1, m1), (q2, c2, m2) in zip(frontier, frontier[1:]):
+        if q1 < min_quality <= q2 + _EPSILON:
+            share = (min_quality - q1) / (q2 - q1)
+            return min_quality, c1 + share * (c2 - c1), {m1: 100.0 * (1 - share), m2: 100.0 * share}
+    return None
+
+
+class ParetoSet:
+    """Non-dominated (cost, quality) solutions: lower cost and higher quality win"""
+
+    def __init__(self):
+        self.points: List[Tuple[float, float, Dict[str, Any]]] = []
+
+    def dominated(self, cost: float, quality: float) -> bool:
+        return any(c <= cost and q >= quality - _EPSILON for c, q, _ in self.points)
+
+    def add(self, cost: float, quality: float, solution: Dict[str, Any]) -> bool:
+        if self.dominated(cost, quality):
+            return False
+        self.points = [(c, q, s) for c, q, s in self.points if not (cost <= c and quality >= q - _EPSILON)]
+        self.points.append((cost, quality, solution))
+        return True
+
+    def solutions(self) -> List[Dict[str, Any]]:
+        return [solution for _, _, solution in sorted(self.points, key=lambda p: p[0])]
+
+
+class Optimizer:
+    """Best-first branch-and-bound over tier x deployment x memory type"""
+
+    def __init__(self, request: CostOptimizerRequest):
+        self.request = request
+        self.deadline = time.perf_counter() + request.time_limit_ms / 1000
+        self.pareto = ParetoSet()
+        self.best: Optional[Dict[str, Any]] = None
+        self.explored = 0
+        self.pruned = 0
+        self._order = itertools.count()
+
+    def llm_frontier(self, params: CostCalculatorRequest) -> List[Tuple[float, float, str]]:
+        """(quality, monthly LLM cost at 100%, model) frontier for a tier-applied request"""
+        request = self.request
+        measured = prompt_cache.hit_rates() if params.use_measured_cache_hit_rates else {}
+        total_queries = params.num_users * params.queries_per_user_per_month
+        minimum = CAPABILITY_SCORES[request.min_capability] if request.min_capability else 0.0
+
+        models = list(params.llm_mix)
+        if params.deployment_type == "cloud_api":
+            models += [model for model in request.model_quality if model not in params.llm_mix]
+
+        points = []
+        for model in models:
+            if CAPABILITY_SCORES[MODEL_CAPABILITY.get(model, "cheap")] < minimum:
+                continue
+            if params.deployment_type == "on_premise":
+                cost, _, _ = gpu_model_cost(model, 100.0, tier_gpu_count(params.service_tier))
+            else:
+                cost, _, _ = api_model_cost(
+                    model, 100.0, total_queries, params.avg_input_tokens, params.avg_output_tokens,
+                    measured.get(model, params.cache_hit_rate), params.use_prompt_caching
+                )
+            points.append((model_quality(model, request.model_quality), cost, model))
+        return efficient_frontier(points)
+
+    def candidates(self, frontier, offset: float) -> List[Tuple[float, float]]:
+        """(cost, quality) points a node can still reach, with costs raised by `offset`"""
+        start = cheapest_mix(frontier, self.request.min_quality)
+        if start is None:
+            return []
+        points = [(start[1] + offset, start[0])]
+        points += [(cost + offset, quality) for quality, cost, _ in frontier if quality > start[0] + _EPSILON]
+        return points
+
+    def prunable(self, points: List[Tuple[float, float]]) -> bool:
+        budget = self.request.budget
+        return all(
+            (budget is not None and cost > budget) or self.pareto.dominated(cost, quality)
+            for cost, quality in points
+        )
+
+    def push(self, queue, bound: float, stage: int, node: Dict[str, Any]):
+        heapq.heappush(queue, (bound, stage, next(self._order), node))
+
+    def run(self) -> bool:
+        """Search until done or out of time; returns whether the search completed"""
+        request = self.request
+        queue: list = []
+
+        for tier, deployment_type in itertools.product(request.service_tiers, request.deployment_types):
+            params = apply_service_tier_config(CostCalculatorRequest(**{
+                **request.model_dump(include=set(CostCalculatorRequest.model_fields)),
+                "service_tier": tier.lower(),
+                "deployment_type": deployment_type,
+            }))
+            frontier = self.llm_frontier(params)
+            points = self.candidates(frontier, 0.0)
+            if points:
+                self.push(queue, points[0][0], 0, {"params": params, "frontier": frontier, "points": points})
+
+        while queue:
+            if time.perf_counter() > self.deadline:
+                return False
+            bound, stage, _, node = heapq.heappop(queue)
+            self.explored += 1
+            if self.prunable(node["points"]):
+                self.pruned += 1
+                continue
+            if stage == 0:
+                self.bound_fixed_costs(queue, node)
+            elif stage == 1:
+                self.branch_memory(queue, node)
+            else:
+                self.accept(node)
+        return True
+
+    def bound_fixed_costs(self, queue, node: Dict[str, Any]):
+        """Tier node: add its fixed costs, with the cheapest memory type as the bound"""
+        params = node["params"]
+        constants = tier_constants(params, params.service_tier)
+        infra = get_agent_infrastructure(params.agent_type, params.service_tier, params.infrastructure_scale, None)
+        memory_costs = {
+            memory_type: calculate_memory_system_costs(memory_type, infra, params.service_tier)[0]
+            for memory_type in self.request.memory_types
+        }
+        without_memory = constants["fixed_costs"] - constants["reference"].memory_system_costs
+        node = {
+            **node,
+            "without_memory": without_memory,
+            "memory_costs": memory_costs,
+            "points": self.candidates(node["frontier"], without_memory + min(memory_costs.values())),
+        }
+        self.push(queue, node["points"][0][0], 1, node)
+
+    def branch_memory(self, queue, node: Dict[str, Any]):
+        for memory_type, memory_cost in node["memory_costs"].items():
+            fixed = node["without_memory"] + memory_cost
+            points = self.candidates(node["frontier"], fixed)
+            self.push(queue, points[0][0], 2, {**node, "memory_type": memory_type, "fixed": fixed, "points": points})
+
+    def accept(self, node: Dict[str, Any]):
+        """Leaf: every frontier vertex from the cheapest feasible mix up is a candidate solution"""
+        request = self.request
+        frontier = node["frontier"]
+        start_quality, start_cost, start_mix = cheapest_mix(frontier, request.min_quality)
+        mixes = [(start_quality, start_cost, start_mix)] + [
+            (quality, cost, {model: 100.0}) for quality, cost, model in frontier if quality > start_quality + _EPSILON
+        ]
+        for quality, llm_cost, mix in mixes:
+            total = llm_cost + node["fixed"]
+            if request.budget is not None and total > request.budget:
+                continue
+            solution = self.solution(node, quality, llm_cost, mix)
+            # Leaves are popped cheapest first, so the first feasible one is optimal
+            if self.best is None:
+                self.best = solution
+            self.pareto.add(total, quality, solution)
+
+    def solution(self, node: Dict[str, Any], quality: float, llm_cost: float, mix: Dict[str, float]) -> Dict[str, Any]:
+        params = node["params"]
+        total = llm_cost + node["fixed"]
+        return {
+            "service_tier": params.service_tier,
+            "deployment_type": params.deployment_type,
+            "memory_type": node["memory_type"],
+            "llm_mix": {model: round(percentage, 2) for model, percentage in mix.items() if percentage > 0},
+            "quality": round(quality, 4),
+            "llm_costs": round(llm_cost, 2),
+            "fixed_costs": round(node["fixed"], 2),
+            "total_monthly_cost": round(total, 2),
+            "cost_per_user": round(total / params.num_users, 2),
+        }
+
+
+def run_optimizer(request: CostOptimizerRequest) -> Dict[str, Any]:
+    started = time.perf_counter()
+    validate_request(request)
+    optimizer = Optimizer(request)
+    complete = optimizer.run()
+    return {
+        "best": optimizer.best,
+        # "measured" (provider-reported) or "estimated", per model whose prompt cache rate was used
+        "cacheHitRateSources": prompt_cache.hit_rate_sources() if request.use_measured_cache_hit_rates else None,
+        "pareto": optimizer.pareto.solutions(),
+        "complete": complete,
+        "nodesExplored": optimizer.explored,
+        "nodesPruned": optimizer.pruned,
+        "elapsedSeconds": round(time.perf_counter() - started, 4),
+    }
+
+
+@router.post("/optimize")
+async def optimize_costs(request: CostOptimizerRequest):
+    """
+    Cheapest configuration (tier, deployment, memory type, LLM mix) within
+    the budget and quality constraints, plus the cost/quality Pareto set.
+    `best` is null when nothing is feasible.
+    """
+    try:
+        return await asyncio.to_thread(run_optimizer, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
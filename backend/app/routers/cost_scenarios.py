@@ -0,0 +1,96 @@
+"""
+Cost Scenarios (incremental recalculation)
+
+POST /api/cost/scenarios calculates costs like /calculate and stores the
+scenario. POST /api/cost/scenarios/{scenario_id}/delta applies changed
+fields to a stored scenario and recomputes only the cost categories that
+depend on them (see COST_GRAPH in cost_calculator_v2.py); the other
+breakdowns are reused. Each result has its own scenario id, so a UI can
+chain deltas as the user edits. Stored values are only reused while the
+pricing version they were computed with is current: after a pricing reload
+a delta recomputes every category.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field, ValidationError
+
+from app.routers.cost_calculator_v2 import (
+    COST_GRAPH,
+    CostCalculatorRequest,
+    CostCalculatorResponse,
+    build_cost_response,
+    evaluate_cost_graph,
+    prepare_cost_request,
+    pricing_version,
+)
+from app.scenario_store import scenario_store
+
+router = APIRouter()
+
+
+class CostScenarioDelta(BaseModel):
+    changes: Dict[str, Any] = Field(..., description="CostCalculatorRequest fields to change")
+
+
+class CostScenarioResponse(BaseModel):
+    scenario_id: str
+    parent_id: Optional[str] = None
+    recomputed: List[str]
+    reused: List[str]
+    result: CostCalculatorResponse
+
+
+def evaluate_scenario(
+    request: CostCalculatorRequest,
+    previous: Optional[Dict[str, Any]] = None,
+    parent_id: Optional[str] = None
+) -> CostScenarioResponse:
+    # Stored as sent: the tier configuration is re-applied on every delta
+    request_fields = request.model_dump()
+    params = prepare_cost_request(request)
+    version = pricing_version()
+    values, recomputed = evaluate_cost_graph(params, previous)
+    result = build_cost_response(params, values)
+    return CostScenarioResponse(
+        scenario_id=scenario_store.put(request_fields, values, version),
+        parent_id=parent_id,
+        recomputed=recomputed,
+        reused=[name for name in COST_GRAPH if name not in recomputed],
+        result=result,
+    )
+
+
+@router.post("/scenarios", response_model=CostScenarioResponse)
+async def create_scenario(params: CostCalculatorRequest):
+    """Calculate costs (same result as /calculate) and store the scenario for deltas"""
+    return evaluate_scenario(params)
+
+
+@router.post("/scenarios/{scenario_id}/delta", response_model=CostScenarioResponse)
+async def scenario_delta(scenario_id: str, delta: CostScenarioDelta):
+    """Recalculate a stored scenario with some fields changed, reusing unaffected categories"""
+    scenario = scenario_store.get(scenario_id)
+    if scenario is None:
+        raise HTTPException(status_code=404, detail=f"Scenario {scenario_id} not found or expired")
+
+    unknown = set(delta.changes) - set(CostCalculatorRequest.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+
+    try:
+        request = CostCalculatorRequest(**{**scenario.request, **delta.changes})
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json()))
+
+    # Values computed with older prices can't be reused
+    previous = scenario.values if scenario.pricing_version == pricing_version() else None
+    return evaluate_scenario(request, previous, parent_id=scenario_id)
+
+
+@router.get("/scenarios/stats")
+async def scenario_store_stats():
+    """Scenario store size and hit rate"""
+    return scenario_store.stats()
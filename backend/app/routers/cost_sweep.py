@@ -0,0 +1,228 @@
+"""
+Cost Scenario Sweep
+
+POST /api/cost/sweep evaluates the cost calculator over a whole grid of
+scenarios in one pass instead of one /calculate call per point. The grid is
+the cross product of the service tiers and the swept parameters (num_users,
+queries_per_user_per_month, avg_input_tokens, avg_output_tokens); anything
+not swept keeps its /calculate value.
+
+Per tier, the tier configuration is applied exactly as /calculate does, and
+one reference calculation gives the costs that don't depend on the swept
+parameters (infrastructure, data sources, monitoring, memory, retrieval,
+security, prompt tuning, tools). The LLM cost is then evaluated for every
+point at once by running api_model_cost (the formula calculate_llm_costs
+uses) on NumPy arrays.
+
+Results are columnar: one array per column, in grid (C) order.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+
+from app.routers.cost_calculator_v2 import (
+    CostCalculatorRequest,
+    api_model_cost,
+    apply_service_tier_config,
+    compute_costs,
+)
+from app.pricing_store import pricing_store
+
+router = APIRouter()
+
+# Parameters that can be swept, in grid axis order (after service_tier)
+SWEEPABLE = ("num_users", "queries_per_user_per_month", "avg_input_tokens", "avg_output_tokens")
+
+MAX_POINTS = int(os.getenv("QA_AGENT_SWEEP_MAX_POINTS", "2000000"))
+
+
+class SweepAxis(BaseModel):
+    """Values of one swept parameter: an explicit list, or `num` points from start to stop"""
+    values: Optional[List[float]] = None
+    start: Optional[float] = Field(default=None, gt=0)
+    stop: Optional[float] = Field(default=None, gt=0)
+    num: int = Field(default=10, ge=1, le=100000)
+    log: bool = Field(default=False, description="Space the points geometrically instead of linearly")
+
+    def to_array(self) -> np.ndarray:
+        if self.values is not None:
+            points = np.asarray(self.values, dtype=np.float64)
+        elif self.start is not None and self.stop is not None:
+            spacing = np.geomspace if self.log else np.linspace
+            points = spacing(self.start, self.stop, self.num)
+        else:
+            raise ValueError("needs either 'values' or 'start' and 'stop'")
+        # Counts are integers in /calculate too
+        return np.rint(points).astype(np.int64)
+
+
+def field_bounds(name: str) -> Tuple[float, float]:
+    """The ge/le limits /calculate enforces on a parameter"""
+    low, high = -np.inf, np.inf
+    for constraint in CostCalculatorRequest.model_fields[name].metadata:
+        low = getattr(constraint, "ge", low)
+        high = getattr(constraint, "le", high)
+    return low, high
+
+
+class CostSweepRequest(CostCalculatorRequest):
+    """A /calculate request plus the tiers and parameter ranges to sweep"""
+    service_tiers: List[str] = Field(default=["basic", "standard", "premium"], min_length=1)
+    axes: Dict[str, SweepAxis] = Field(
+        default={},
+        description=f"Swept parameters ({', '.join(SWEEPABLE)}); others keep their single value"
+    )
+
+
+def tier_constants(base: CostCalculatorRequest, tier: str) -> Dict[str, Any]:
+    """Tier-applied LLM settings and the costs that don't depend on usage or token counts"""
+    params = apply_service_tier_config(CostCalculatorRequest(**{
+        **base.model_dump(include=set(CostCalculatorRequest.model_fields)),
+        "service_tier": tier,
+    }))
+    reference = compute_costs(params.model_copy())
+    return {
+        "params": params,
+        "reference": reference,
+        "infrastructure_costs": reference.infrastructure_costs,
+        "fixed_costs": reference.total_monthly_cost - reference.llm_costs,
+        "reference_llm_costs": reference.llm_costs,
+        "cache_hit_rates": reference.measured_cache_hit_rates or {},
+    }
+
+
+def vectorized_llm_costs(
+    params: CostCalculatorRequest,
+    total_queries,
+    input_tokens,
+    output_tokens,
+    cache_hit_rate=None,
+    cache_hit_rates: Optional[Dict[str, float]] = None
+):
+    """
+    Cloud API LLM cost for arrays of queries, token counts and (optionally)
+    cache hit rates, broadcast against each other. cache_hit_rate defaults to
+    the tier's; cache_hit_rates overrides it per model (measured rates).
+    All models are priced from one pricing snapshot, even if a reload is
+    published mid-run.
+    """
+    llm_pricing = pricing_store.llm_pricing
+    rate = params.cache_hit_rate if cache_hit_rate is None else cache_hit_rate
+    cache_hit_rates = cache_hit_rates or {}
+    total = np.zeros(np.broadcast_shapes(*map(np.shape, (total_queries, input_tokens, output_tokens, rate))))
+    for model, percentage in params.llm_mix.items():
+        if percentage <= 0:
+            continue
+        model_cost, _, _ = api_model_cost(
+            model, percentage, total_queries, input_tokens, output_tokens,
+            cache_hit_rates.get(model, rate), params.use_prompt_caching, llm_pricing
+        )
+        total += model_cost
+    return total
+
+
+def run_sweep(request: CostSweepRequest) -> Dict[str, Any]:
+    """Evaluate the whole grid (CPU-bound, runs in a worker thread)"""
+    started = time.perf_counter()
+
+    unknown = set(request.axes) - set(SWEEPABLE)
+    if unknown:
+        raise ValueError(f"Cannot sweep {sorted(unknown)}. Sweepable: {list(SWEEPABLE)}")
+
+    axes = {}
+    for name in SWEEPABLE:
+        axis = request.axes.get(name)
+        try:
+            axes[name] = axis.to_array() if axis else np.array([getattr(request, name)], dtype=np.int64)
+        except ValueError as e:
+            raise ValueError(f"Axis '{name}' {e}")
+        low, high = field_bounds(name)
+        if axes[name].size == 0 or axes[name].min() < low or axes[name].max() > high:
+            raise ValueError(f"Axis '{name}' needs at least one value, all between {low} and {high}")
+
+    tiers = [tier.lower() for tier in request.service_tiers]
+    shape = (len(tiers), *(axes[name].size for name in SWEEPABLE))
+    points = int(np.prod(shape))
+    if points > MAX_POINTS:
+        raise ValueError(f"Sweep of {points} points exceeds the limit of {MAX_POINTS}")
+
+    # One axis per swept parameter, so the grid is built by broadcasting
+    users, queries, input_tokens, output_tokens = (
+        axes[name].reshape([-1 if i == position else 1 for i in range(len(SWEEPABLE))])
+        for position, name in enumerate(SWEEPABLE)
+    )
+
+    llm = np.empty(shape)
+    total = np.empty(shape)
+    tier_summary = {}
+    for index, tier in enumerate(tiers):
+        constants = tier_constants(request, tier)
+        params = constants["params"]
+        if params.deployment_type == "on_premise":
+            # GPU capacity is provisioned per tier, independent of usage
+            llm[index] = constants["reference_llm_costs"]
+        else:
+            llm[index] = vectorized_llm_costs(
+                params, users * queries, input_tokens, output_tokens,
+                cache_hit_rates=constants["cache_hit_rates"]
+            )
+        total[index] = llm[index] + constants["fixed_costs"]
+        tier_summary[tier] = {
+            "llm_mix": params.llm_mix,
+            "cache_hit_rate": params.cache_hit_rate,
+            "use_prompt_caching": params.use_prompt_caching,
+            "infrastructure_costs": constants["infrastructure_costs"],
+            "fixed_costs": constants["fixed_costs"],
+        }
+
+    grid = np.indices(shape, sparse=True)
+    num_users_column = np.broadcast_to(axes["num_users"][grid[1]], shape).ravel()
+    columns = {
+        # Index into axes.service_tier
+        "service_tier": np.broadcast_to(grid[0], shape).ravel(),
+        **{
+            name: np.broadcast_to(axes[name][grid[position + 1]], shape).ravel()
+            for position, name in enumerate(SWEEPABLE)
+        },
+        "llm_costs": np.round(llm.ravel(), 4),
+        "total_monthly_cost": np.round(total.ravel(), 4),
+        "cost_per_user": np.round(total.ravel() / num_users_column, 4),
+    }
+
+    return {
+        "points": points,
+        "shape": list(shape),
+        "axes": {"service_tier": tiers, **{name: axes[name].tolist() for name in SWEEPABLE}},
+        "tiers": tier_summary,
+        "columns": {name: column.tolist() for name, column in columns.items()},
+        "elapsedSeconds": round(time.perf_counter() - started, 4),
+    }
+
+
+@router.post("/sweep")
+async def cost_sweep(request: CostSweepRequest):
+    """
+    Evaluate the cost calculator over a grid of scenarios in one call.
+
+    Returns columnar results in grid order: `columns.service_tier` holds
+    indexes into `axes.service_tier`, and every other column holds one
+    value per point (monthly AUD costs for the cost columns).
+    """
+
+    def sweep_json() -> str:
+        # Encoded here: the default response encoder is far slower on million-element lists
+        return json.dumps(run_sweep(request), separators=(",", ":"))
+
+    try:
+        body = await asyncio.to_thread(sweep_json)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=body, media_type="application/json")
@@ -1,10 +1,127 @@
 from fastapi import APIRouter, HTTPException
 from app.models import GeneratorRequest, AgentResponse
-import time
-import random
+from app.agent_runtime import ItemCompletion, execute_agent, reason_each, stream_each
+from app.prompt_cache import app_context
+from app.script_templates import get_template, list_frameworks
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import json
+from contextlib import aclosing
 
 router = APIRouter()
 
+
+def iter_test_script(request: GeneratorRequest) -> Iterator[Tuple[str, Optional[Dict[str, Any]], str]]:
+    """
+    Yield the test script block by block as (kind, test_case, chunk).
+
+    kind is "header", "testCase" or "footer". Every test case in the plan is
+    rendered; nothing is accumulated, so memory stays flat for large plans.
+    """
+    # Dummy AI logic - In real implementation, this would:
+    # 1. Parse the test plan structure
+    # 2. Use Code LLM to generate framework-specific code
+    # 3. Create executable scripts with proper selectors and assertions
+
+    template = get_template(request.automationFramework)
+    context = template.plan_context(request.testPlan, request.generationModel)
+    test_cases = request.testPlan.get('testCases', [])
+
+    yield "header", None, template.render_header(context)
+
+    for tc, chunk in zip(test_cases, template.render_cases(context, test_cases)):
+        yield "testCase", tc, chunk
+
+    footer = template.render_footer(context)
+    if footer:
+        yield "footer", None, footer
+
+
+def script_file_name(request: GeneratorRequest) -> str:
+    """File name for the generated script based on app name and framework"""
+    extension = get_template(request.automationFramework).extension
+    return f"test_{request.testPlan.get('appName', 'app').lower().replace(' ', '_')}.{extension}"
+
+
+def build_test_script(request: GeneratorRequest) -> Tuple[str, int]:
+    """Render the full test script (CPU-bound, no I/O). Returns (script, test cases rendered)."""
+    chunks = []
+    test_cases_generated = 0
+    for kind, _, chunk in iter_test_script(request):
+        chunks.append(chunk)
+        if kind == "testCase":
+            test_cases_generated += 1
+    return "".join(chunks), test_cases_generated
+
+
+def case_prompts(request: GeneratorRequest) -> List[str]:
+    """One prompt per test case for the code generation model (micro-batched by the runtime)"""
+    return [
+        f"Write the {request.automationFramework} test for "
+        f"{tc.get('id', '')} {tc.get('name', '')} ({tc.get('type', '')}, {tc.get('priority', '')} priority)"
+        for tc in request.testPlan.get('testCases', [])
+    ]
+
+
+def generation_context(request: GeneratorRequest) -> str:
+    return app_context(request.testPlan.get('appName', 'the application'), request.testPlan.get('testUrl', ''))
+
+
+async def generate_cases(request: GeneratorRequest) -> List[ItemCompletion]:
+    """The generator's reasoning phase: one batched completion per test case"""
+    return await reason_each(
+        "generator", request.generationModel, case_prompts(request),
+        discount=request.batchMode == "discount", context=generation_context(request)
+    )
+
+
+def stream_cases(request: GeneratorRequest) -> AsyncIterator[ItemCompletion]:
+    """generate_cases, yielding each test case's completion (in order) as its batch comes back"""
+    return stream_each(
+        "generator", request.generationModel, case_prompts(request),
+        discount=request.batchMode == "discount", context=generation_context(request)
+    )
+
+
+def generation_stats(request: GeneratorRequest, completions: List[ItemCompletion]) -> Dict[str, Any]:
+    """LLM calls and estimated cost of the per-test-case completions"""
+    cost = sum(completion.cost_usd for completion in completions)
+    # Batches are shared with concurrent requests, so this request's call count is fractional
+    calls = sum(1 / completion.batch_size for completion in completions)
+    return {
+        "batchMode": request.batchMode,
+        "llmCalls": round(calls, 2),
+        "avgBatchSize": round(len(completions) / calls, 2) if calls else 0.0,
+        "estimatedCostUsd": round(cost, 6),
+        "costPerTestCaseUsd": round(cost / len(completions), 8) if completions else 0.0,
+    }
+
+
+async def run_generator(request: GeneratorRequest) -> AgentResponse:
+    """Run the Generator Agent without HTTP error wrapping (shared by routes and jobs)"""
+    completions = await generate_cases(request)
+    # Reasoning already happened per test case; only the script is left to render
+    test_script, test_cases_generated = await execute_agent(
+        "generator", build_test_script, request, think_time=(0.0, 0.0)
+    )
+
+    num_test_cases = request.testPlan.get("totalTestCases", test_cases_generated)
+
+    return AgentResponse(
+        status="success",
+        message=f"Executable script written in {request.automationFramework}. {num_test_cases} test cases generated. Lines of code: {len(test_script)}.",
+        data={
+            "testScript": test_script,
+            "framework": request.automationFramework,
+            "linesOfCode": len(test_script.split('\n')),
+            "testCasesGenerated": test_cases_generated,
+            "fileName": script_file_name(request),
+            "llm": generation_stats(request, completions)
+        }
+    )
+
+
 @router.post("/generator", response_model=AgentResponse)
 async def generator_agent(request: GeneratorRequest):
     """
@@ -20,106 +137,7 @@ async def generator_agent(request: GeneratorRequest):
     """
 
     try:
-        # Simulate processing time (code generation takes time)
-        time.sleep(random.uniform(2.0, 3.0))
-
-        # Dummy AI logic - In real implementation, this would:
-        # 1. Parse the test plan structure
-        # 2. Use Code LLM to generate framework-specific code
-        # 3. Create executable scripts with proper selectors and assertions
-
-        framework = request.automationFramework.lower()
-        test_plan = request.testPlan
-        num_test_cases = test_plan.get("totalTestCases", 5)
-
-        # Generate dummy test script based on framework
-        if framework == "playwright":
-            test_script = f"""// Generated Test Script using Playwright
-// Application: {test_plan.get('appName', 'Unknown')}
-// Generated by: {request.generationModel}
-// Total Test Cases: {num_test_cases}
-
-const {{ test, expect }} = require('@playwright/test');
-
-test.describe('{test_plan.get('appName', 'Application')} - Automated Tests', () => {{
-"""
-            for i, tc in enumerate(test_plan.get('testCases', [])[:5], 1):  # First 5 test cases
-                test_script += f"""
-  test('{tc['name']}', async ({{ page }}) => {{
-    // Navigate to application
-    await page.goto('{test_plan.get('testUrl', 'https://example.com')}');
-
-    // Test steps
-    await page.waitForLoadState('networkidle');
-    // TODO: Add specific test logic for {tc['type']}
-
-    // Assertions
-    await expect(page).toHaveTitle(/{test_plan.get('appName', 'App')}/i);
-  }});
-"""
-            test_script += "});\n"
-
-        elif framework == "selenium":
-            test_script = f"""# Generated Test Script using Selenium
-# Application: {test_plan.get('appName', 'Unknown')}
-# Generated by: {request.generationModel}
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-import unittest
-
-class {test_plan.get('appName', 'App').replace(' ', '')}Tests(unittest.TestCase):
-    def setUp(self):
-        self.driver = webdriver.Chrome()
-        self.driver.get('{test_plan.get('testUrl', 'https://example.com')}')
-
-    def tearDown(self):
-        self.driver.quit()
-"""
-            for i, tc in enumerate(test_plan.get('testCases', [])[:5], 1):
-                test_script += f"""
-    def test_{i}_{tc['name'].lower().replace(' ', '_')}(self):
-        # Test: {tc['name']}
-        # Type: {tc['type']}
-        # Priority: {tc['priority']}
-        pass  # TODO: Implement test logic
-"""
-
-        else:  # Cypress
-            test_script = f"""// Generated Test Script using Cypress
-// Application: {test_plan.get('appName', 'Unknown')}
-// Generated by: {request.generationModel}
-
-describe('{test_plan.get('appName', 'Application')} - Automated Tests', () => {{
-  beforeEach(() => {{
-    cy.visit('{test_plan.get('testUrl', 'https://example.com')}');
-  }});
-"""
-            for i, tc in enumerate(test_plan.get('testCases', [])[:5], 1):
-                test_script += f"""
-  it('{tc['name']}', () => {{
-    // Test Type: {tc['type']}
-    // Priority: {tc['priority']}
-    cy.url().should('include', '{test_plan.get('testUrl', 'https://example.com')}');
-    // TODO: Add specific test assertions
-  }});
-"""
-            test_script += "});\n"
-
-        return AgentResponse(
-            status="success",
-            message=f"Executable script written in {request.automationFramework}. {num_test_cases} test cases generated. Lines of code: {len(test_script)}.",
-            data={
-                "testScript": test_script,
-                "framework": request.automationFramework,
-                "linesOfCode": len(test_script.split('\n')),
-                "testCasesGenerated": min(num_test_cases, 5),
-                "fileName": f"test_{test_plan.get('appName', 'app').lower().replace(' ', '_')}.{
-                    'spec.js' if framework in ['playwright', 'cypress'] else 'py'
-                }"
-            }
-        )
+        return await run_generator(request)
 
     except Exception as e:
         raise HTTPException(
@@ -130,3 +148,75 @@ describe('{test_plan.get('appName', 'Application')} - Automated Tests', () => {{
                 error_details=str(e)
             ).dict()
         )
+
+
+@router.get("/generator/frameworks")
+async def generator_frameworks():
+    """Automation frameworks with a registered script template"""
+    return {"frameworks": list_frameworks()}
+
+
+# Yield to the event loop after this many streamed test cases
+STREAM_YIELD_EVERY = 50
+
+
+@router.post("/generator/stream")
+async def generator_agent_stream(request: GeneratorRequest):
+    """
+    Generator Agent, streaming mode.
+
+    Emits the script as NDJSON while it is generated, one object per line:
+    - {"type": "header" | "footer", "chunk": "..."}
+    - {"type": "testCase", "testCaseId": "TC_001", "chunk": "..."}
+    - {"type": "summary", "testCasesGenerated": N, "linesOfCode": N, "fileName": "...", "llm": {...}}
+
+    The header goes out immediately and each test case as soon as its
+    completion batch is back, so the first block doesn't wait for the whole
+    plan. Every test case in the plan is emitted (no cap), and the full
+    script is never held in memory.
+    """
+
+    async def ndjson_stream():
+        test_cases_generated = 0
+        lines_of_code = 1
+        completions: List[ItemCompletion] = []
+
+        def event(kind, tc, chunk):
+            nonlocal lines_of_code
+            data = {"type": kind, "chunk": chunk}
+            if kind == "testCase":
+                data["testCaseId"] = tc.get("id")
+            lines_of_code += chunk.count("\n")
+            return json.dumps(data) + "\n"
+
+        try:
+            script = iter_test_script(request)
+            yield event(*next(script))
+
+            # One prompt per test case, so the i-th completion pairs with the i-th rendered case
+            async with aclosing(stream_cases(request)) as cases:
+                async for completion in cases:
+                    completions.append(completion)
+                    test_cases_generated += 1
+                    yield event(*next(script))
+                    if test_cases_generated % STREAM_YIELD_EVERY == 0:
+                        # Completions already back are returned without suspending
+                        await asyncio.sleep(0)
+
+            for block in script:
+                yield event(*block)
+
+        except Exception as e:
+            yield json.dumps({"type": "error", "error_details": str(e)}) + "\n"
+            return
+
+        yield json.dumps({
+            "type": "summary",
+            "framework": request.automationFramework,
+            "testCasesGenerated": test_cases_generated,
+            "linesOfCode": lines_of_code,
+            "fileName": script_file_name(request),
+            "llm": generation_stats(request, completions)
+        }) + "\n"
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
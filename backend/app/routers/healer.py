@@ -1,10 +1,221 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from app.models import HealerRequest, AgentResponse
-import time
-import random
+from app.agent_runtime import execute_agent, run_in_thread
+from app.determinism import rng_for
+from app.failure_index import failure_index
+from app.metrics import time_stage
+from app.selector_rewriter import get_selector_rewriter
+from app.log_classifier import LogClassifier, SELECTOR_CHANGE, ENVIRONMENT, TIMEOUT, ASSERTION, FAILURE
+from collections import Counter
+from itertools import chain
+from typing import Any, Dict
 
 router = APIRouter()
 
+# Root cause reported for each failure category (see app/log_classifier.py)
+ROOT_CAUSES = {
+    SELECTOR_CHANGE: "UI element locator changed (CSS selector mismatch)",
+    ENVIRONMENT: "Environment connection failure or infrastructure issue",
+    TIMEOUT: "Test step timed out waiting for the application",
+    ASSERTION: "Assertion failed: application behaviour differs from the expected result",
+    FAILURE: "Test failure without a recognised cause",
+}
+
+# Failed tests listed in the healing details (the counts cover all of them)
+MAX_REPORTED_FAILURES = 100
+
+
+def classify_execution_result(execution_result: str) -> Dict[str, Any]:
+    """Run the execution log through the streaming classifier"""
+    classifier = LogClassifier()
+    failed_tests = []
+    for result in chain(classifier.feed(execution_result), classifier.close()):
+        if result.status == "failed" and len(failed_tests) < MAX_REPORTED_FAILURES:
+            failed_tests.append(result.to_dict())
+
+    return {**classifier.summary(), "failedTests": failed_tests}
+
+
+def failure_signature_text(classification: Dict[str, Any]) -> str:
+    """What the failure index is keyed on: the category plus each distinct failure message"""
+    messages = sorted({test["evidence"] or test["test"] for test in classification["failedTests"]})
+    return "\n".join([classification["overallCategory"], *messages])
+
+
+def analyze_failures(request: HealerRequest) -> Dict[str, Any]:
+    """Classify the execution result and look for a previously analysed near-duplicate"""
+    classification = classify_execution_result(request.executionResult)
+    match = None
+    if classification["overallCategory"] is not None:
+        match = failure_index.lookup(failure_signature_text(classification))
+    return {"classification": classification, "match": match}
+
+
+def heal_test_script(request: HealerRequest, analysis: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Analyze the execution result and heal the script (CPU-bound, no I/O)"""
+    # Dummy AI logic - In real implementation, this would:
+    # 1. Perform Root Cause Analysis (RCA) on failures
+    # 2. Use Computer Vision to detect UI changes
+    # 3. Use LLM to fix code based on detected issues
+    # 4. Update scripts and commit to Git
+    # 5. Create JIRA tickets for non-auto-fixable issues
+
+    test_script = request.testScript
+    # Commit and ticket ids; reproducible per script and log in deterministic mode
+    rng = rng_for("healer", test_script, request.executionResult)
+
+    # Analyze execution result: per-test failure categories, line by line
+    analysis = analysis or analyze_failures(request)
+    classification = analysis["classification"]
+    category = classification["overallCategory"]
+
+    # A near-duplicate of an analysed failure reuses its root cause and fix
+    reused = analysis["match"]
+    previous = reused.analysis if reused else {}
+    if reused:
+        category = previous["category"]
+
+    substitutions = []
+    recorded = {}
+    if category == SELECTOR_CHANGE:
+        # Fix selectors: all known old→new mappings applied in one pass
+        rewriter = get_selector_rewriter({**previous.get("selectorFixes", {}), **(request.selectorMap or {})} or None)
+        fixed_script, substitutions = rewriter.rewrite(test_script)
+
+    if category == SELECTOR_CHANGE and substitutions:
+        # Self-healing scenario: Fix selector issues
+        healing_action = "SELF_HEALED"
+        root_cause = previous.get("rootCause", ROOT_CAUSES[category])
+
+        occurrences = Counter((sub.old, sub.new) for sub in substitutions)
+
+        healing_details = {
+            "rcaComplete": True,
+            "rootCause": root_cause,
+            "action": healing_action,
+            "fixesApplied": [
+                f"Updated CSS selector: {old} → {new} ({count} occurrence{'s' if count != 1 else ''})"
+                for (old, new), count in occurrences.items()
+            ],
+            "substitutions": [sub._asdict() for sub in substitutions],
+            "updatedScript": fixed_script,
+            "gitCommit": f"auto-heal-{rng.randint(1000, 9999)}",
+            "confidence": 0.92,
+            "needsManualReview": False
+        }
+
+        summary = "RCA complete. Root cause: UI element locator change. Script successfully self-healed and committed to Git."
+        recorded = {"selectorFixes": {old: new for old, new in occurrences}}
+
+    elif category is not None:
+        # Environment/infrastructure issue, other failure, or a selector change
+        # no known mapping fixes - create JIRA ticket
+        healing_action = "JIRA_TICKET_CREATED"
+        root_cause = previous.get("rootCause", ROOT_CAUSES[category])
+        assignee = "QA Team" if category == SELECTOR_CHANGE else "DevOps Team"
+
+        healing_details = {
+            "rcaComplete": True,
+            "rootCause": root_cause,
+            "action": healing_action,
+            "jiraTicket": previous.get("jiraTicket") or f"QA-{rng.randint(100, 999)}",
+            "jiraDetails": {
+                "title": f"Test Execution Failed - {category.replace('_', ' ').title()} Issue",
+                "priority": "High",
+                "assignee": assignee,
+                "description": f"Automated tests failed due to: {root_cause}"
+            },
+            "needsManualReview": True,
+            "updatedScript": test_script  # No changes needed
+        }
+
+        if previous.get("jiraTicket"):
+            summary = f"RCA complete. Root cause: {root_cause}. Known failure, linked to existing JIRA ticket {healing_details['jiraTicket']}."
+        else:
+            summary = f"RCA complete. Root cause: {root_cause}. JIRA ticket {healing_details['jiraTicket']} created for {assignee}."
+        recorded = {"jiraTicket": healing_details["jiraTicket"]}
+
+    else:
+        # Tests passed - update confidence model
+        healing_action = "CONFIDENCE_UPDATED"
+
+        healing_details = {
+            "rcaComplete": True,
+            "rootCause": "No issues detected",
+            "action": healing_action,
+            "testsPassed": True,
+            "confidenceScore": 0.98,
+            "learningUpdates": [
+                "Updated baseline for test stability",
+                "Reinforced successful test patterns"
+            ],
+            "updatedScript": test_script  # No changes needed
+        }
+
+        summary = "Tests passed successfully. Confidence model updated with successful test patterns."
+
+    healing_details["failureClassification"] = classification
+
+    if reused:
+        healing_details["reusedAnalysis"] = {
+            "signatureId": reused.signature_id,
+            "similarity": reused.similarity,
+            "exact": reused.exact,
+            "hits": reused.hits,
+        }
+        if recorded.get("jiraTicket") and not previous.get("jiraTicket"):
+            # First ticket for a known failure (e.g. one that was self-healed
+            # before): stored with the signature, so the next match links to it
+            healing_details["signatureId"] = failure_index.record(failure_signature_text(classification), {
+                **previous,
+                "healingAction": healing_action,
+                **recorded,
+            })
+    elif category is not None:
+        healing_details["signatureId"] = failure_index.record(failure_signature_text(classification), {
+            "category": category,
+            "healingAction": healing_action,
+            "rootCause": root_cause,
+            **recorded,
+        })
+
+    return {
+        "summary": summary,
+        "healingAction": healing_action,
+        "details": healing_details
+    }
+
+
+def healer_prompt(request: HealerRequest, analysis: Dict[str, Any]) -> str:
+    """Task sent to the root-cause analysis model (after the test script context)"""
+    classification = analysis["classification"]
+    failures = failure_signature_text(classification) if classification["overallCategory"] else "No failures detected."
+    return (
+        f"Find the root cause of these {request.automationFramework} test failures and propose a fix.\n"
+        f"{failures}"
+    )
+
+
+async def run_healer(request: HealerRequest) -> AgentResponse:
+    """Run the Healer Agent without HTTP error wrapping (shared by routes and jobs)"""
+    with time_stage("healer", "analyze"):
+        analysis = await run_in_thread(analyze_failures, request)
+
+    # Known failures skip the reasoning phase: the stored analysis is reused
+    think_time = (0.0, 0.0) if analysis["match"] else None
+    result = await execute_agent(
+        "healer", heal_test_script, request, analysis,
+        think_time=think_time, model=request.healingModel, prompt=healer_prompt(request, analysis),
+        context=f"Test script:\n{request.testScript}"
+    )
+
+    return AgentResponse(
+        status="success",
+        message=result["summary"],
+        data=result
+    )
+
+
 @router.post("/healer", response_model=AgentResponse)
 async def healer_agent(request: HealerRequest):
     """
@@ -22,94 +233,61 @@ async def healer_agent(request: HealerRequest):
     """
 
     try:
-        # Simulate processing time (analysis and healing takes time)
-        time.sleep(random.uniform(1.5, 2.5))
-
-        # Dummy AI logic - In real implementation, this would:
-        # 1. Perform Root Cause Analysis (RCA) on failures
-        # 2. Use Computer Vision to detect UI changes
-        # 3. Use LLM to fix code based on detected issues
-        # 4. Update scripts and commit to Git
-        # 5. Create JIRA tickets for non-auto-fixable issues
-
-        execution_result = request.executionResult.lower()
-        test_script = request.testScript
-
-        # Analyze execution result
-        if "css selector change" in execution_result or "selector" in execution_result:
-            # Self-healing scenario: Fix selector issues
-            healing_action = "SELF_HEALED"
-            root_cause = "UI element locator changed (CSS selector mismatch)"
-
-            # Simulate fixing selectors
-            fixed_script = test_script.replace("#old-login-btn", "#new-submit-btn")
-            fixed_script = fixed_script.replace("button.submit", "button[type='submit']")
-
-            healing_details = {
-                "rcaComplete": True,
-                "rootCause": root_cause,
-                "action": healing_action,
-                "fixesApplied": [
-                    "Updated CSS selector: #old-login-btn → #new-submit-btn",
-                    "Improved selector reliability: button.submit → button[type='submit']"
-                ],
-                "updatedScript": fixed_script,
-                "gitCommit": f"auto-heal-{random.randint(1000, 9999)}",
-                "confidence": 0.92,
-                "needsManualReview": False
-            }
-
-            summary = "RCA complete. Root cause: UI element locator change. Script successfully self-healed and committed to Git."
-
-        elif "environment issue" in execution_result or "failed" in execution_result:
-            # Environment/infrastructure issue - create JIRA ticket
-            healing_action = "JIRA_TICKET_CREATED"
-            root_cause = "Environment connection failure or infrastructure issue"
-
-            healing_details = {
-                "rcaComplete": True,
-                "rootCause": root_cause,
-                "action": healing_action,
-                "jiraTicket": f"QA-{random.randint(100, 999)}",
-                "jiraDetails": {
-                    "title": "Test Execution Failed - Environment Issue",
-                    "priority": "High",
-                    "assignee": "DevOps Team",
-                    "description": f"Automated tests failed due to: {root_cause}"
-                },
-                "needsManualReview": True,
-                "updatedScript": test_script  # No changes needed
-            }
-
-            summary = f"RCA complete. Root cause: {root_cause}. JIRA ticket {healing_details['jiraTicket']} created for DevOps team."
+        return await run_healer(request)
 
-        else:
-            # Tests passed - update confidence model
-            healing_action = "CONFIDENCE_UPDATED"
-
-            healing_details = {
-                "rcaComplete": True,
-                "rootCause": "No issues detected",
-                "action": healing_action,
-                "testsPassed": True,
-                "confidenceScore": 0.98,
-                "learningUpdates": [
-                    "Updated baseline for test stability",
-                    "Reinforced successful test patterns"
-                ],
-                "updatedScript": test_script  # No changes needed
-            }
-
-            summary = "Tests passed successfully. Confidence model updated with successful test patterns."
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=AgentResponse(
+                status="error",
+                message="Healer Agent encountered an error",
+                error_details=str(e)
+            ).dict()
+        )
 
+
+@router.get("/healer/signatures")
+async def failure_signature_stats():
+    """Size of the failure-signature index and how often analyses are reused"""
+    return failure_index.stats()
+
+
+@router.delete("/healer/signatures")
+async def clear_failure_signatures():
+    """Forget all recorded failure signatures (counters are kept)"""
+    await run_in_thread(failure_index.clear)
+    return failure_index.stats()
+
+
+@router.post("/healer/classify", response_model=AgentResponse)
+async def classify_execution_log(request: Request):
+    """
+    Classify a raw execution log as it uploads.
+
+    The request body is the plain-text log (any size). It is read chunk by
+    chunk and classified line by line as it arrives, so the log is never held
+    in memory. Returns the per-category failure counts and the first
+    MAX_REPORTED_FAILURES failed tests with their category and evidence line.
+    """
+
+    try:
+        classifier = LogClassifier()
+        failed_tests = []
+
+        def collect(results):
+            for result in results:
+                if result.status == "failed" and len(failed_tests) < MAX_REPORTED_FAILURES:
+                    failed_tests.append(result.to_dict())
+
+        async for chunk in request.stream():
+            collect(classifier.feed_bytes(chunk))
+        collect(classifier.close())
+
+        classification = {**classifier.summary(), "failedTests": failed_tests}
         return AgentResponse(
             status="success",
-            message=summary,
-            data={
-                "summary": summary,
-                "healingAction": healing_action,
-                "details": healing_details
-            }
+            message=f"Classified {classification['testsSeen']} test(s): {classification['failed']} failure(s)",
+            data=classification
         )
 
     except Exception as e:
@@ -117,7 +295,7 @@ async def healer_agent(request: HealerRequest):
             status_code=500,
             detail=AgentResponse(
                 status="error",
-                message="Healer Agent encountered an error",
+                message="Failed to classify execution log",
                 error_details=str(e)
             ).dict()
         )
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, HTTPException
+from app.models import PlannerRequest, GeneratorRequest, HealerRequest, AgentResponse, JobResponse
+from app.jobs import job_manager, JobStatus, QueueFullError
+from app.routers.planner import run_planner
+from app.routers.generator import run_generator
+from app.routers.healer import run_healer
+
+router = APIRouter()
+
+
+def _submit(agent: str, runner, request) -> JobResponse:
+    try:
+        job = job_manager.submit(agent, runner, request)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return JobResponse(**job.to_dict())
+
+
+def _get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("/jobs/planner", response_model=JobResponse, status_code=202)
+async def submit_planner_job(request: PlannerRequest):
+    """Queue a Planner Agent run and return its job id immediately"""
+    return _submit("planner", run_planner, request)
+
+
+@router.post("/jobs/generator", response_model=JobResponse, status_code=202)
+async def submit_generator_job(request: GeneratorRequest):
+    """Queue a Generator Agent run and return its job id immediately"""
+    return _submit("generator", run_generator, request)
+
+
+@router.post("/jobs/healer", response_model=JobResponse, status_code=202)
+async def submit_healer_job(request: HealerRequest):
+    """Queue a Healer Agent run and return its job id immediately"""
+    return _submit("healer", run_healer, request)
+
+
+@router.get("/jobs")
+async def job_queue_stats():
+    """Worker pool size, queue depth and job counts by status"""
+    return job_manager.stats()
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job_status(job_id: str):
+    """Poll the status of a queued agent job"""
+    return JobResponse(**_get_job(job_id).to_dict())
+
+
+@router.get("/jobs/{job_id}/result", response_model=AgentResponse)
+async def get_job_result(job_id: str):
+    """
+    Fetch the agent response of a finished job.
+
+    Returns 409 while the job is still queued or running, and 500/410 with
+    the error for failed/cancelled jobs.
+    """
+    job = _get_job(job_id)
+
+    if not job.finished:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.status.value}")
+
+    if job.status == JobStatus.CANCELLED:
+        raise HTTPException(status_code=410, detail=f"Job {job_id} was cancelled")
+
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(
+            status_code=500,
+            detail=AgentResponse(
+                status="error",
+                message=f"{job.agent.title()} Agent encountered an error",
+                error_details=job.error
+            ).dict()
+        )
+
+    return job.result
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job (no-op for finished jobs)"""
+    _get_job(job_id)
+    return JobResponse(**job_manager.cancel(job_id).to_dict())
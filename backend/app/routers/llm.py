@@ -0,0 +1,50 @@
+from fastapi import APIRouter
+from app.agent_runtime import discount_prompt_batcher, prompt_batcher
+from app.llm_backends import get_backend, list_backends, DEFAULT_MODEL
+from app.prompt_cache import prompt_cache
+from app.rate_limiter import llm_rate_limiter
+from app.resilience import llm_client
+
+router = APIRouter()
+
+
+@router.get("/llm/backends")
+async def llm_backends():
+    """Registered LLM backends with their call, retry, token and latency counters"""
+    return {
+        "active": get_backend().name,
+        "defaultModel": DEFAULT_MODEL,
+        "backends": list_backends(),
+    }
+
+
+
+@router.get("/llm/limits")
+async def llm_rate_limits():
+    """Per-model RPM/TPM limits, remaining budget, queue depth and wait times"""
+    return llm_rate_limiter.stats()
+
+
+@router.get("/llm/resilience")
+async def llm_resilience():
+    """Hedging (duplicate rate and spend), end-to-end p50/p95/p99 latency, failovers and circuit states"""
+    return llm_client.stats()
+
+
+@router.get("/llm/batching")
+async def llm_batching():
+    """Micro-batching of per-test-case prompts: batch sizes, flush reasons and send times"""
+    return {"batchers": [prompt_batcher.stats(), discount_prompt_batcher.stats()]}
+
+
+@router.get("/llm/prefix-cache")
+async def llm_prefix_cache():
+    """Prompt prefix cache: per-model requests, cached prompt tokens and measured hit rates"""
+    return prompt_cache.stats()
+
+
+@router.delete("/llm/prefix-cache")
+async def clear_llm_prefix_cache():
+    """Forget cached prefixes and reset the measured hit rates"""
+    prompt_cache.clear()
+    return prompt_cache.stats()
@@ -0,0 +1,135 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.models import PipelineRequest, PlannerRequest, GeneratorRequest, HealerRequest, AgentResponse
+from app.agent_runtime import simulate_thinking
+from app.determinism import rng_for
+from app.pipeline import PipelineStage, PipelineError, iter_pipeline_events
+from app.routers.planner import run_planner
+from app.routers.generator import run_generator
+from app.routers.healer import run_healer
+from typing import Any, Dict, List
+import json
+
+router = APIRouter()
+
+# Outcomes reported by the simulated Execution Agent (same as the frontend demo)
+SIMULATED_EXECUTION_RESULTS = [
+    (0.7, "Tests PASSED: 4/5 tests passed. One failure detected due to CSS selector change."),
+    (0.3, "Tests FAILED: 5/5 tests failed. Environment issue suspected."),
+]
+
+
+def build_pipeline(request: PipelineRequest) -> List[PipelineStage]:
+    """Wire the agents into a DAG; artifacts are handed over in memory"""
+
+    async def plan(artifacts: Dict[str, Any]) -> AgentResponse:
+        return await run_planner(PlannerRequest(
+            appName=request.appName,
+            appType=request.appType,
+            testUrl=request.testUrl,
+            scope=request.scope,
+            testTypes=request.testTypes,
+            reasoningModel=request.reasoningModel
+        ))
+
+    async def generate(artifacts: Dict[str, Any]) -> AgentResponse:
+        return await run_generator(GeneratorRequest(
+            testPlan=artifacts["planner"].data["testPlan"],
+            automationFramework=request.automationFramework,
+            generationModel=request.generationModel
+        ))
+
+    async def execute(artifacts: Dict[str, Any]) -> AgentResponse:
+        execution_result = request.executionResult
+        if execution_result is None:
+            test_script = artifacts["generator"].data["testScript"]
+            await simulate_thinking("execution", key=test_script)
+            weights, outcomes = zip(*SIMULATED_EXECUTION_RESULTS)
+            execution_result = rng_for("execution", test_script).choices(outcomes, weights=weights)[0]
+
+        return AgentResponse(
+            status="success",
+            message=execution_result,
+            data={"executionResult": execution_result}
+        )
+
+    async def heal(artifacts: Dict[str, Any]) -> AgentResponse:
+        return await run_healer(HealerRequest(
+            testScript=artifacts["generator"].data["testScript"],
+            executionResult=artifacts["execution"].data["executionResult"],
+            automationFramework=request.automationFramework
+        ))
+
+    return [
+        PipelineStage("planner", plan),
+        PipelineStage("generator", generate, depends_on=["planner"]),
+        PipelineStage("execution", execute, depends_on=["generator"]),
+        PipelineStage("healer", heal, depends_on=["generator", "execution"]),
+    ]
+
+
+def _serialize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(event.get("result"), AgentResponse):
+        event = {**event, "result": event["result"].dict()}
+    return event
+
+
+@router.post("/pipeline", response_model=AgentResponse)
+async def run_pipeline(request: PipelineRequest):
+    """
+    Run Planner → Generator → Execution → Healer in one request.
+
+    Returns every stage's data plus per-stage durations. Use
+    /pipeline/stream to receive stage progress as it happens.
+    """
+    stages_data = {}
+    durations = {}
+
+    try:
+        async for event in iter_pipeline_events(build_pipeline(request)):
+            if event["event"] == "stage_completed":
+                stages_data[event["stage"]] = event["result"].data
+                durations[event["stage"]] = event["durationSeconds"]
+            elif event["event"] == "pipeline_completed":
+                durations["total"] = event["durationSeconds"]
+
+    except PipelineError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=AgentResponse(
+                status="error",
+                message=f"Pipeline failed at stage '{e.stage}'",
+                error_details=str(e)
+            ).dict()
+        )
+
+    return AgentResponse(
+        status="success",
+        message=f"Workflow Finished. {stages_data['healer']['summary']}",
+        data={"stages": stages_data, "durationsSeconds": durations}
+    )
+
+
+@router.post("/pipeline/stream")
+async def stream_pipeline(request: PipelineRequest):
+    """
+    Run the agent pipeline and stream stage progress as Server-Sent Events.
+
+    Event types: stage_started, stage_completed (with the stage's AgentResponse),
+    stage_failed, pipeline_completed.
+    """
+
+    async def event_stream():
+        try:
+            async for event in iter_pipeline_events(build_pipeline(request)):
+                payload = json.dumps(_serialize_event(event))
+                yield f"event: {event['event']}\ndata: {payload}\n\n"
+        except PipelineError:
+            # stage_failed has already been sent
+            return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
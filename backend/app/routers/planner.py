@@ -1,10 +1,119 @@
 from fastapi import APIRouter, HTTPException
-from app.models import PlannerRequest, AgentResponse
-import time
+from fastapi.responses import StreamingResponse
+from app.models import PlannerRequest, PlannerBatchRequest, AgentResponse
+from app.agent_runtime import execute_agent, iter_bounded
+from app.plan_cache import plan_cache, plan_cache_key, normalize_planner_request, seed_for_key
+from app.prompt_cache import app_context
+from typing import Any, Dict, Optional
+import json
 import random
+import time
 
 router = APIRouter()
 
+
+def build_test_plan(request: PlannerRequest, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """Build the structured test plan for a planner request (CPU-bound, no I/O)"""
+    rng = rng or random.Random()
+
+    # Dummy AI logic - In real implementation, this would:
+    # 1. Query MCP for context about the application
+    # 2. Use LangGraph/LangChain to create structured reasoning
+    # 3. Generate test plan with priorities and risk assessment
+
+    test_cases = []
+    num_cases = len(request.testTypes) * rng.randint(3, 5)
+
+    for i in range(num_cases):
+        test_cases.append({
+            "id": f"TC_{i+1:03d}",
+            "name": f"Test case for {request.scope.split(',')[0] if ',' in request.scope else request.scope}",
+            "type": rng.choice(request.testTypes),
+            "priority": rng.choice(["High", "Medium", "Low"]),
+            "risk": rng.choice(["High", "Medium", "Low"]),
+            "steps": [
+                "Navigate to application",
+                "Perform test action",
+                "Verify expected result",
+                "Capture evidence"
+            ]
+        })
+
+    return {
+        "appName": request.appName,
+        "appType": request.appType,
+        "testUrl": request.testUrl,
+        "scope": request.scope,
+        "totalTestCases": num_cases,
+        "testCases": test_cases,
+        "coverage": {
+            "functional": "Functional Testing" in request.testTypes,
+            "regression": "Regression Testing" in request.testTypes,
+            "performance": "Performance Testing" in request.testTypes,
+            "security": "Security/Pen Testing" in request.testTypes
+        },
+        "riskAnalysis": {
+            "highRisk": sum(1 for tc in test_cases if tc["risk"] == "High"),
+            "mediumRisk": sum(1 for tc in test_cases if tc["risk"] == "Medium"),
+            "lowRisk": sum(1 for tc in test_cases if tc["risk"] == "Low")
+        },
+        "estimatedDuration": f"{num_cases * 2} minutes",
+        "reasoning": f"Using {request.reasoningModel} to analyze scope and generate {num_cases} high-priority test cases"
+    }
+
+
+def with_request_fields(test_plan: Dict[str, Any], request: PlannerRequest) -> Dict[str, Any]:
+    """The plan as this caller sent it: the cache key normalizes these fields away"""
+    return {
+        **test_plan,
+        "appName": request.appName,
+        "appType": request.appType,
+        "testUrl": request.testUrl,
+        "scope": request.scope,
+    }
+
+
+def planner_prompt(request: PlannerRequest) -> str:
+    """Task sent to the reasoning model (after the shared application context)"""
+    return (
+        f"Create a risk-based test plan for this {request.appType} application.\n"
+        f"Scope: {request.scope}\n"
+        f"Test types: {', '.join(request.testTypes)}"
+    )
+
+
+async def run_planner(request: PlannerRequest) -> AgentResponse:
+    """
+    Run the Planner Agent without HTTP error wrapping (shared by routes and jobs).
+
+    Plans are memoized on the normalized request; a cache hit skips the
+    reasoning phase entirely.
+    """
+    key = plan_cache_key(request)
+    test_plan = plan_cache.get(key)
+    cached = test_plan is not None
+
+    if not cached:
+        # Build from the normalized request with the key's seed, so a
+        # regenerated plan is identical to the one that was cached
+        canonical_request = request.model_copy(update=normalize_planner_request(request))
+        rng = random.Random(seed_for_key(key))
+        test_plan = await execute_agent(
+            "planner", build_test_plan, canonical_request, rng,
+            model=request.reasoningModel, prompt=planner_prompt(canonical_request),
+            context=app_context(request.appName, request.testUrl)
+        )
+        plan_cache.put(key, test_plan)
+
+    num_cases = test_plan["totalTestCases"]
+
+    return AgentResponse(
+        status="success",
+        message=f"Structured Test Plan generated. {num_cases} test cases identified with risk analysis complete.",
+        data={"testPlan": with_request_fields(test_plan, request), "cached": cached}
+    )
+
+
 @router.post("/planner", response_model=AgentResponse)
 async def planner_agent(request: PlannerRequest):
     """
@@ -25,59 +134,7 @@ async def planner_agent(request: PlannerRequest):
     """
 
     try:
-        # Simulate processing time (AI reasoning takes time)
-        time.sleep(random.uniform(1.5, 2.5))
-
-        # Dummy AI logic - In real implementation, this would:
-        # 1. Query MCP for context about the application
-        # 2. Use LangGraph/LangChain to create structured reasoning
-        # 3. Generate test plan with priorities and risk assessment
-
-        test_cases = []
-        num_cases = len(request.testTypes) * random.randint(3, 5)
-
-        for i in range(num_cases):
-            test_cases.append({
-                "id": f"TC_{i+1:03d}",
-                "name": f"Test case for {request.scope.split(',')[0] if ',' in request.scope else request.scope}",
-                "type": random.choice(request.testTypes),
-                "priority": random.choice(["High", "Medium", "Low"]),
-                "risk": random.choice(["High", "Medium", "Low"]),
-                "steps": [
-                    "Navigate to application",
-                    "Perform test action",
-                    "Verify expected result",
-                    "Capture evidence"
-                ]
-            })
-
-        test_plan = {
-            "appName": request.appName,
-            "appType": request.appType,
-            "testUrl": request.testUrl,
-            "scope": request.scope,
-            "totalTestCases": num_cases,
-            "testCases": test_cases,
-            "coverage": {
-                "functional": "Functional Testing" in request.testTypes,
-                "regression": "Regression Testing" in request.testTypes,
-                "performance": "Performance Testing" in request.testTypes,
-                "security": "Security/Pen Testing" in request.testTypes
-            },
-            "riskAnalysis": {
-                "highRisk": sum(1 for tc in test_cases if tc["risk"] == "High"),
-                "mediumRisk": sum(1 for tc in test_cases if tc["risk"] == "Medium"),
-                "lowRisk": sum(1 for tc in test_cases if tc["risk"] == "Low")
-            },
-            "estimatedDuration": f"{num_cases * 2} minutes",
-            "reasoning": f"Using {request.reasoningModel} to analyze scope and generate {num_cases} high-priority test cases"
-        }
-
-        return AgentResponse(
-            status="success",
-            message=f"Structured Test Plan generated. {num_cases} test cases identified with risk analysis complete.",
-            data={"testPlan": test_plan}
-        )
+        return await run_planner(request)
 
     except Exception as e:
         raise HTTPException(
@@ -88,3 +145,63 @@ async def planner_agent(request: PlannerRequest):
                 error_details=str(e)
             ).dict()
         )
+
+
+@router.post("/planner/batch")
+async def planner_agent_batch(request: PlannerBatchRequest):
+    """
+    Plan many applications in one call.
+
+    Apps are planned concurrently, at most `maxConcurrency` at a time. The
+    response is NDJSON: one {"type": "result", ...} line per app in
+    completion order, then a {"type": "summary", ...} line comparing the
+    wall-clock time with the sequential baseline (sum of per-app times).
+    """
+
+    async def ndjson_stream():
+        started = time.perf_counter()
+        sequential_baseline = 0.0
+        succeeded = 0
+
+        calls = [lambda app=app: run_planner(app) for app in request.apps]
+        async for index, outcome, elapsed in iter_bounded(calls, request.maxConcurrency):
+            sequential_baseline += elapsed
+            line = {
+                "type": "result",
+                "index": index,
+                "appName": request.apps[index].appName,
+                "durationSeconds": round(elapsed, 4),
+            }
+            if isinstance(outcome, Exception):
+                line.update(status="error", error_details=str(outcome))
+            else:
+                succeeded += 1
+                line.update(status="success", message=outcome.message, data=outcome.data)
+            yield json.dumps(line) + "\n"
+
+        wall_clock = time.perf_counter() - started
+        yield json.dumps({
+            "type": "summary",
+            "totalApps": len(request.apps),
+            "succeeded": succeeded,
+            "failed": len(request.apps) - succeeded,
+            "maxConcurrency": request.maxConcurrency,
+            "wallClockSeconds": round(wall_clock, 4),
+            "sequentialBaselineSeconds": round(sequential_baseline, 4),
+            "speedup": round(sequential_baseline / wall_clock, 2) if wall_clock > 0 else None,
+        }) + "\n"
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+
+@router.get("/planner/cache")
+async def planner_cache_stats():
+    """Hit/miss counters and occupancy of the test plan cache"""
+    return plan_cache.stats()
+
+
+@router.delete("/planner/cache")
+async def clear_planner_cache():
+    """Drop all cached test plans (counters are kept)"""
+    plan_cache.clear()
+    return plan_cache.stats()
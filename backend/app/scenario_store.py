@@ -0,0 +1,102 @@
+"""
+Cost Scenario Store
+
+Keeps recent cost scenarios so a client can change a few fields and get the
+new result without recalculating everything (POST
+/api/cost/scenarios/{scenario_id}/delta). Each scenario stores the request
+as the client sent it and the evaluated cost graph values
+(evaluate_cost_graph in app/routers/cost_calculator_v2.py); a delta merges
+the changed fields into the request and re-evaluates the graph against the
+stored values, so only the affected cost categories are recomputed.
+Each scenario also records the pricing version its values were computed
+with; a delta against a scenario priced with an older version recomputes
+everything.
+
+Scenario ids are content-addressed (a hash of the canonical request), so the
+same configuration always has the same id. Entries expire after a TTL and
+the store is bounded with LRU eviction. Stored values are shared between
+scenarios and must be treated as read-only.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+
+def scenario_id(request: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON encoding of a cost request"""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Scenario(NamedTuple):
+    request: Dict[str, Any]
+    values: Dict[str, Any]
+    pricing_version: str
+
+
+class ScenarioStore:
+    """Size-bounded LRU store with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Scenario]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, scenario = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return scenario
+
+    def put(self, request: Dict[str, Any], values: Dict[str, Any], pricing_version: str) -> str:
+        key = scenario_id(request)
+        if self.max_entries <= 0:
+            return key
+        self._entries[key] = (time.monotonic(), Scenario(request, values, pricing_version))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return key
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
+
+
+# Singleton instance
+scenario_store = ScenarioStore(
+    max_entries=int(os.getenv("QA_AGENT_SCENARIO_STORE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("QA_AGENT_SCENARIO_TTL", "3600")),
+)
@@ -0,0 +1,248 @@
+"""
+Test Script Templates
+
+Per-framework templates used by the Generator Agent. Templates are written in
+str.format syntax. When a template is registered, its test-case template is
+compiled once into a generator function built around a real f-string: plan
+fields (app name, URL, model) are bound to locals a single time per render,
+so the per-case loop does no dict lookups into the test plan.
+
+New frameworks are added by registering another ScriptTemplate:
+
+    register_template(ScriptTemplate(name="Puppeteer", extension="spec.js", ...))
+"""
+
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+_formatter = Formatter()
+
+# Plan-level fields available to every template, read once per render
+PLAN_FIELDS = ("appName", "suiteName", "titlePattern", "className", "testUrl", "totalTestCases", "generationModel")
+
+# How each per-test-case field is computed (Python expressions over `tc` and `index`)
+DEFAULT_CASE_FIELDS = {
+    "index": "index",
+    "id": "tc.get('id', '')",
+    "name": "tc.get('name', '')",
+    "type": "tc.get('type', '')",
+    "priority": "tc.get('priority', '')",
+    "risk": "tc.get('risk', '')",
+}
+
+
+def _escape(text: str) -> str:
+    """Escape literal braces so text can be embedded in a format string"""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _template_fields(source: str) -> List[str]:
+    return [field for _, field, _, _ in _formatter.parse(source) if field]
+
+
+def _as_fstring(source: str) -> str:
+    """Turn a str.format template into f-string source referencing local `v_<field>` names"""
+    parts = []
+    for literal, field, spec, conversion in _formatter.parse(source):
+        parts.append(_escape(literal))
+        if field is not None:
+            parts.append("{v_" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+    return "f" + repr("".join(parts))
+
+
+def compile_case_renderer(name: str, source: str, case_fields: Dict[str, str]) -> Callable[[Dict[str, Any], Iterable[Dict[str, Any]]], Iterator[str]]:
+    """
+    Compile a test-case template into a generator function.
+
+    The template becomes a real f-string in generated code: plan fields are
+    bound to locals once, per-case fields are computed from their expressions,
+    and each case costs one f-string evaluation.
+    """
+    fields = list(dict.fromkeys(_template_fields(source)))
+    invalid = [field for field in fields if not field.isidentifier()]
+    if invalid:
+        raise ValueError(f"Template '{name}' has unsupported field(s): {invalid}")
+    plan_fields = [field for field in fields if field in PLAN_FIELDS]
+    row_fields = [field for field in fields if field not in PLAN_FIELDS]
+
+    lines = ["def render_cases(context, test_cases):"]
+    lines += [f"    v_{field} = context[{field!r}]" for field in plan_fields]
+    lines.append("    for index, tc in enumerate(test_cases, 1):")
+    for field in row_fields:
+        expression = case_fields.get(field, f"tc.get({field!r}, '')")
+        lines.append(f"        v_{field} = {expression}")
+    lines.append(f"        yield {_as_fstring(source)}")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), f"<{name} case template>", "exec"), namespace)
+    return namespace["render_cases"]
+
+
+class ScriptTemplate:
+    """Header, per-test-case and footer templates for one framework"""
+
+    def __init__(
+        self,
+        name: str,
+        extension: str,
+        header: str,
+        case: str,
+        footer: str = "",
+        case_fields: Dict[str, str] = None
+    ):
+        self.name = name
+        self.extension = extension
+        self.header = header
+        self.footer = footer
+        self.case = case
+        self._render_cases = compile_case_renderer(name, case, {**DEFAULT_CASE_FIELDS, **(case_fields or {})})
+
+    def plan_context(self, test_plan: Dict[str, Any], generation_model: str) -> Dict[str, Any]:
+        """Plan-level fields, read from the test plan once per render"""
+        return {
+            "appName": test_plan.get('appName', 'Unknown'),
+            "suiteName": test_plan.get('appName', 'Application'),
+            "titlePattern": test_plan.get('appName', 'App'),
+            "className": test_plan.get('appName', 'App').replace(' ', ''),
+            "testUrl": test_plan.get('testUrl', 'https://example.com'),
+            "totalTestCases": test_plan.get("totalTestCases", 5),
+            "generationModel": generation_model,
+        }
+
+    def render_header(self, context: Dict[str, Any]) -> str:
+        return self.header.format_map(context)
+
+    def render_footer(self, context: Dict[str, Any]) -> str:
+        return self.footer.format_map(context)
+
+    def render_cases(self, context: Dict[str, Any], test_cases: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Render test cases in bulk, one chunk per test case"""
+        return self._render_cases(context, test_cases)
+
+
+_TEMPLATES: Dict[str, ScriptTemplate] = {}
+
+# Framework used when the requested one isn't registered
+DEFAULT_FRAMEWORK = "cypress"
+
+
+def register_template(template: ScriptTemplate):
+    """Register (or replace) the template for a framework"""
+    _TEMPLATES[template.name.lower()] = template
+
+
+def get_template(framework: str) -> ScriptTemplate:
+    return _TEMPLATES.get(framework.lower(), _TEMPLATES[DEFAULT_FRAMEWORK])
+
+
+def list_frameworks() -> List[Dict[str, str]]:
+    return [{"name": template.name, "extension": template.extension} for template in _TEMPLATES.values()]
+
+
+# ========== BUILT-IN FRAMEWORKS ==========
+
+register_template(ScriptTemplate(
+    name="Playwright",
+    extension="spec.js",
+    header="""// Generated Test Script using Playwright
+// Application: {appName}
+// Generated by: {generationModel}
+// Total Test Cases: {totalTestCases}
+
+const {{ test, expect }} = require('@playwright/test');
+
+test.describe('{suiteName} - Automated Tests', () => {{
+""",
+    case="""
+  test('{name}', async ({{ page }}) => {{
+    // Navigate to application
+    await page.goto('{testUrl}');
+
+    // Test steps
+    await page.waitForLoadState('networkidle');
+    // TODO: Add specific test logic for {type}
+
+    // Assertions
+    await expect(page).toHaveTitle(/{titlePattern}/i);
+  }});
+""",
+    footer="}});\n",
+))
+
+
+register_template(ScriptTemplate(
+    name="Selenium",
+    extension="py",
+    header="""# Generated Test Script using Selenium
+# Application: {appName}
+# Generated by: {generationModel}
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+import unittest
+
+class {className}Tests(unittest.TestCase):
+    def setUp(self):
+        self.driver = webdriver.Chrome()
+        self.driver.get('{testUrl}')
+
+    def tearDown(self):
+        self.driver.quit()
+""",
+    case="""
+    def test_{index}_{methodName}(self):
+        # Test: {name}
+        # Type: {type}
+        # Priority: {priority}
+        pass  # TODO: Implement test logic
+""",
+    case_fields={"methodName": "tc.get('name', '').lower().replace(' ', '_')"},
+))
+
+register_template(ScriptTemplate(
+    name="Cypress",
+    extension="spec.js",
+    header="""// Generated Test Script using Cypress
+// Application: {appName}
+// Generated by: {generationModel}
+
+describe('{suiteName} - Automated Tests', () => {{
+  beforeEach(() => {{
+    cy.visit('{testUrl}');
+  }});
+""",
+    case="""
+  it('{name}', () => {{
+    // Test Type: {type}
+    // Priority: {priority}
+    cy.url().should('include', '{testUrl}');
+    // TODO: Add specific test assertions
+  }});
+""",
+    footer="}});\n",
+))
+
+register_template(ScriptTemplate(
+    name="WebdriverIO",
+    extension="spec.js",
+    header="""// Generated Test Script using WebdriverIO
+// Application: {appName}
+// Generated by: {generationModel}
+// Total Test Cases: {totalTestCases}
+
+describe('{suiteName} - Automated Tests', () => {{
+  beforeEach(async () => {{
+    await browser.url('{testUrl}');
+  }});
+""",
+    case="""
+  it('{name}', async () => {{
+    // Test Type: {type}
+    // Priority: {priority}
+    await expect(browser).toHaveUrl(expect.stringContaining('{testUrl}'));
+    // TODO: Add specific test assertions
+  }});
+""",
+    footer="}});\n",
+))
@@ -0,0 +1,124 @@
+"""
+Selector Rewrite Engine
+
+Applies a (potentially very large) mapping of old selectors to new selectors
+to a test script in a single linear pass.
+
+All old selectors are compiled into one trie-shaped regular expression: at
+each position the regex engine walks the trie instead of trying every
+selector, so the cost depends on the script length, not on the number of
+mappings. At a given offset the longest matching selector wins, matches never
+overlap, and every substitution is reported with its offset in the original
+script. Boundary rules are lookarounds inside the regex, so a selector that
+is glued to an identifier ("button.submit" in "button.submit-large") is
+skipped and the engine backtracks to a shorter selector or the next offset.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Characters that continue a CSS identifier; a selector match must not be glued to one
+_IDENT_CHAR = re.compile(r"[\w-]")
+_NOT_AFTER_IDENT = r"(?<![\w-])"
+_NOT_BEFORE_IDENT = r"(?![\w-])"
+
+DEFAULT_MAPPINGS_PATH = Path(__file__).parent.parent / "config" / "selector_mappings.json"
+
+
+class Substitution(NamedTuple):
+    offset: int  # offset of the old selector in the original script
+    old: str
+    new: str
+
+
+def _trie_pattern(words: List[str], respect_boundaries: bool = False) -> str:
+    """
+    Build a regex equivalent to `word1|word2|...` that is factored as a trie.
+    With respect_boundaries, a word that starts (ends) with an identifier
+    character only matches where it isn't preceded (followed) by one.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def glued(char: str) -> bool:
+        return respect_boundaries and _IDENT_CHAR.match(char) is not None
+
+    def node_pattern(node: Dict, char: str) -> str:
+        # Longer selectors first, then the selector ending here (longest wins)
+        alternatives = [re.escape(next_char) + node_pattern(child, next_char)
+                        for next_char, child in sorted(node.items()) if next_char != ""]
+        if "" in node:
+            alternatives.append(_NOT_BEFORE_IDENT if glued(char) else "")
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")"
+
+    branches = [(_NOT_AFTER_IDENT if glued(char) else "") + re.escape(char) + node_pattern(child, char)
+                for char, child in sorted(trie.items())]
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+
+class SelectorRewriter:
+    """Compiled old→new selector mapping"""
+
+    def __init__(self, mapping: Dict[str, str], respect_boundaries: bool = True):
+        self.mapping = {old: new for old, new in mapping.items() if old}
+        self.respect_boundaries = respect_boundaries
+        self._regex = re.compile(_trie_pattern(list(self.mapping), respect_boundaries)) if self.mapping else None
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def rewrite(self, script: str) -> Tuple[str, List[Substitution]]:
+        """Return the rewritten script and the substitutions made, in order"""
+        if self._regex is None:
+            return script, []
+
+        substitutions: List[Substitution] = []
+        mapping = self.mapping
+
+        def replace(match: re.Match) -> str:
+            old = match.group(0)
+            new = mapping[old]
+            substitutions.append(Substitution(match.start(), old, new))
+            return new
+
+        return self._regex.sub(replace, script), substitutions
+
+
+def load_selector_mappings(path: Optional[str] = None) -> Dict[str, str]:
+    """Load the old→new selector mapping file (JSON with a "mappings" object)"""
+    path = Path(path or os.getenv("QA_AGENT_SELECTOR_MAPPINGS", DEFAULT_MAPPINGS_PATH))
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get("mappings", {})
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Selector mappings file not found: {path}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Error parsing selector mappings {path}: {e}")
+
+
+@lru_cache(maxsize=1)
+def get_default_rewriter() -> SelectorRewriter:
+    """Rewriter for the configured mapping file, compiled once"""
+    return SelectorRewriter(load_selector_mappings())
+
+
+@lru_cache(maxsize=32)
+def _compiled_with_overrides(overrides: Tuple[Tuple[str, str], ...]) -> SelectorRewriter:
+    return SelectorRewriter({**get_default_rewriter().mapping, **dict(overrides)})
+
+
+def get_selector_rewriter(overrides: Optional[Dict[str, str]] = None) -> SelectorRewriter:
+    """Default rewriter, or one extended with request-specific mappings (cached)"""
+    if not overrides:
+        return get_default_rewriter()
+    return _compiled_with_overrides(tuple(sorted(overrides.items())))
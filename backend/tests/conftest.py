@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the app the way uvicorn does, from the backend directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
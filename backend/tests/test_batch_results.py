@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import resilience
+from app.agent_runtime import reason_each
+from app.llm_backends import LLMResponse, count_batch_tasks, split_results
+from app.main import app
+from app.rate_limiter import llm_rate_limiter
+
+client = TestClient(app)
+
+
+class SkipsSecondResultBackend:
+    """Answers batched prompts without a '### RESULT 2' section, single prompts in full"""
+
+    def __init__(self, fail_single: bool = False):
+        self.fail_single = fail_single
+        self.single_calls = 0
+
+    async def complete(self, request):
+        count = count_batch_tasks(request.prompt)
+        if count:
+            text = "\n".join(f"### RESULT {i}\nbatched {i}" for i in range(1, count + 1) if i != 2)
+            # A renumbered header that doesn't exist in the batch
+            text += f"\n### RESULT {count + 5}\nstray"
+        else:
+            self.single_calls += 1
+            if self.fail_single:
+                raise RuntimeError("single request failed")
+            text = "single"
+        return LLMResponse(text, request.model, "fake", 100, 50, 0.01, 1)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(llm_rate_limiter, "enabled", False)
+    monkeypatch.setattr(resilience.llm_client, "hedging", False)
+    backend = SkipsSecondResultBackend()
+    monkeypatch.setattr(resilience, "get_backend", lambda: backend)
+    return backend
+
+
+def test_split_results_marks_missing_results():
+    text = "### RESULT 1\na\n### RESULT 3\nc\n### RESULT 9\nstray"
+    assert split_results(text, 3) == ["a", None, "c"]
+    assert split_results("no headers at all", 2) == [None, None]
+
+
+def test_missing_result_is_requested_on_its_own(backend):
+    completions = asyncio.run(reason_each("generator", "gpt-4o", ["one", "two", "three"], context="missing-one"))
+
+    assert [completion.text for completion in completions] == ["batched 1", "single", "batched 3"]
+    assert backend.single_calls == 1
+    assert [completion.batch_size for completion in completions] == [3, 1, 3]
+    assert completions[1].cost_usd > completions[0].cost_usd
+
+
+def test_failed_retry_fails_only_its_own_item(backend):
+    backend.fail_single = True
+
+    async def run():
+        return await asyncio.gather(
+            reason_each("generator", "gpt-4o", ["one"], context="failing-retry"),
+            reason_each("generator", "gpt-4o", ["two"], context="failing-retry"),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(run())
+    # Both prompts shared one batch: the first item's result came back
+    assert first[0].text == "batched 1"
+    assert isinstance(second, Exception)
+
+
+def test_generator_survives_a_misformatted_batch(backend):
+    response = client.post("/api/generator", json={
+        "testPlan": {
+            "appName": "Shop",
+            "testUrl": "https://shop.example.com",
+            "totalTestCases": 3,
+            "testCases": [{"id": f"TC_{i:03d}", "name": f"Case {i}", "type": "Functional", "priority": "High"}
+                          for i in range(1, 4)],
+        },
+        "automationFramework": "Playwright",
+        "generationModel": "GPT-4o",
+    })
+    assert response.status_code == 200
+    assert backend.single_calls == 1
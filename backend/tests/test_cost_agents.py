@@ -0,0 +1,37 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+SHARED = {"num_users": 350, "queries_per_user_per_month": 60, "cache_hit_rate": 0.55, "use_prompt_caching": True}
+
+AGENTS = {
+    "planner": {"llm_model": "gpt-4o", "avg_tokens_per_request": 8000},
+    "generator": {"llm_model": "gpt-4o", "avg_tokens_per_request": 3000},
+    "healer": {"llm_model": "claude-3-haiku", "avg_tokens_per_request": 1200},
+    "reviewer": {"llm_model": "llama-3-70b", "deployment_type": "on_premise", "avg_tokens_per_request": 5000},
+}
+
+
+@pytest.mark.parametrize("use_prompt_caching", [True, False])
+def test_each_row_matches_a_single_agent_call(use_prompt_caching):
+    shared = {**SHARED, "use_prompt_caching": use_prompt_caching}
+    response = client.post("/api/cost/calculate-agents", json={"agents": AGENTS, **shared})
+    assert response.status_code == 200
+    body = response.json()
+
+    assert set(body["agents"]) == set(AGENTS)
+    for agent_id, agent in AGENTS.items():
+        single = client.post("/api/cost/calculate-agent", json={**agent, **shared})
+        assert single.status_code == 200
+        row = body["agents"][agent_id]
+        expected = single.json()
+        assert row.keys() == expected.keys()
+        for key, value in expected.items():
+            assert row[key] == (pytest.approx(value, rel=1e-9) if isinstance(value, float) else value)
+
+    total = sum(row["agent_llm_cost_monthly"] for row in body["agents"].values())
+    assert body["total_llm_cost_monthly"] == pytest.approx(total)
+    assert body["total_llm_cost_annual"] == pytest.approx(total * 12)
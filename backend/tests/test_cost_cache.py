@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cost_cache import cost_cache
+from app.main import app
+from app.pricing_store import parse_llm_pricing, pricing_store
+
+client = TestClient(app)
+
+REQUEST = {"service_tier": "standard", "num_users": 800}
+
+
+@pytest.fixture(autouse=True)
+def clear_cost_cache():
+    cost_cache.clear()
+    yield
+    cost_cache.clear()
+
+
+def doubled_prices():
+    """The current LLM_Pricing.json with every flat price doubled"""
+    with open(pricing_store.llm_pricing_path) as f:
+        data = json.load(f)
+    for models in data["providers"].values():
+        for prices in models.values():
+            for name in ("input", "output", "cachedInput"):
+                if isinstance(prices.get(name), (int, float)):
+                    prices[name] *= 2
+    return parse_llm_pricing(data)
+
+
+def calculate():
+    response = client.post("/api/cost/calculate", json=REQUEST)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_repeat_request_is_served_from_cache():
+    first = calculate()
+    hits = cost_cache.hits
+    assert calculate() == first
+    assert cost_cache.hits == hits + 1
+
+
+def test_pricing_version_change_invalidates_results(monkeypatch):
+    before = calculate()
+    assert cost_cache.stats()["entries"] == 1
+
+    snapshot = doubled_prices()
+    assert snapshot.version != pricing_store.version
+    monkeypatch.setattr(pricing_store, "llm", snapshot)
+
+    hits, invalidations = cost_cache.hits, cost_cache.invalidations
+    after = calculate()
+    assert cost_cache.hits == hits
+    assert cost_cache.invalidations == invalidations + 1
+    assert cost_cache.stats()["pricingVersion"] == snapshot.version
+    assert after["llm_costs"] == pytest.approx(2 * before["llm_costs"], rel=1e-3)
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+BASE = {"service_tier": "standard", "num_users": 500}
+
+
+def monte_carlo(**fields):
+    response = client.post("/api/cost/monte-carlo", json={**BASE, "samples": 1000, **fields})
+    assert response.status_code == 200
+    return response.json()
+
+
+def calculate(**fields):
+    response = client.post("/api/cost/calculate", json={**BASE, **fields})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("deployment_type", ["cloud_api", "on_premise"])
+def test_fixed_distributions_reproduce_calculate(deployment_type):
+    fixed = {"num_users": 2500, "avg_input_tokens": 3000, "avg_output_tokens": 700}
+    body = monte_carlo(
+        deployment_type=deployment_type,
+        distributions={name: {"kind": "fixed", "value": value} for name, value in fixed.items()},
+    )
+    expected = calculate(deployment_type=deployment_type, **fixed)
+
+    total = body["total_monthly_cost"]
+    assert total["std"] == 0
+    for key in ("mean", "P50", "P90", "P99"):
+        assert total[key] == pytest.approx(expected["total_monthly_cost"], abs=0.01)
+    assert body["categories"]["llm_costs"]["P50"] == pytest.approx(expected["llm_costs"], abs=0.01)
+    assert body["cost_per_user"]["P50"] == pytest.approx(expected["total_monthly_cost"] / fixed["num_users"], abs=0.01)
+
+
+def test_without_distributions_percentiles_are_the_point_estimate():
+    body = monte_carlo()
+    assert body["point_estimate"] == pytest.approx(calculate()["total_monthly_cost"], abs=0.01)
+    assert body["total_monthly_cost"]["P99"] == body["point_estimate"]
+
+
+def test_same_seed_gives_same_percentiles():
+    distributions = {
+        "num_users": {"kind": "lognormal", "mean": 500, "std": 150},
+        "cache_hit_rate": {"kind": "beta", "alpha": 7, "beta": 3},
+        "avg_output_tokens": {"kind": "triangular", "low": 300, "mode": 500, "high": 1200},
+    }
+    first = monte_carlo(distributions=distributions, seed=42)
+    second = monte_carlo(distributions=distributions, seed=42)
+    other = monte_carlo(distributions=distributions, seed=43)
+
+    assert first["seed"] == 42
+    for key in ("total_monthly_cost", "cost_per_user", "categories"):
+        assert first[key] == second[key]
+    assert first["total_monthly_cost"] != other["total_monthly_cost"]
+    assert first["total_monthly_cost"]["P50"] < first["total_monthly_cost"]["P99"]
+
+
+def test_invalid_distribution_is_rejected():
+    response = client.post("/api/cost/monte-carlo", json={
+        **BASE, "distributions": {"num_users": {"kind": "uniform", "low": 10}},
+    })
+    assert response.status_code == 400
+    assert "high" in response.json()["detail"]
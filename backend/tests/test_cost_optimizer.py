@@ -0,0 +1,53 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.prompt_cache import app_context, prompt_cache
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_prompt_cache():
+    prompt_cache.clear()
+    yield
+    prompt_cache.clear()
+
+
+def optimize(**fields):
+    return client.post("/api/cost/optimize", json={"service_tiers": ["basic"], "deployment_types": ["cloud_api"], **fields})
+
+
+def test_measured_cache_hit_rates():
+    context = app_context("Shop", "https://shop.example.com")
+    for i in range(prompt_cache.min_requests + 5):
+        prompt_cache.build("planner", "gpt-4o-mini", context, f"task {i}")
+    assert "gpt-4o-mini" in prompt_cache.hit_rates()
+
+    response = optimize(use_measured_cache_hit_rates=True)
+    assert response.status_code == 200
+    assert response.json()["best"] is not None
+    assert response.json()["cacheHitRateSources"] == {"gpt-4o-mini": "estimated"}
+
+
+def test_unknown_memory_type_is_rejected():
+    response = optimize(memory_types=["redis", "bogus"])
+    assert response.status_code == 400
+    assert "bogus" in response.json()["detail"]
+
+
+def test_memory_type_variants_are_accepted():
+    assert optimize(memory_types=["Cosmos-DB", "in_memory"]).status_code == 200
+
+
+def test_scored_pricing_table_models_are_searched():
+    # The basic tier's own models are all "cheap" (quality 1)
+    assert optimize(min_quality=2.5).json()["best"] is None
+
+    best = optimize(min_quality=2.5, model_quality={"gpt-5": 3.0}).json()["best"]
+    assert "gpt-5" in best["llm_mix"]
+    assert best["quality"] >= 2.5
+
+
+def test_unknown_scored_model_is_rejected():
+    assert optimize(model_quality={"no-such-model": 2.0}).status_code == 400
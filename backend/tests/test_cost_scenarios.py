@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cost_cache import cost_cache
+from app.main import app
+from app.pricing_store import parse_llm_pricing, pricing_store
+
+client = TestClient(app)
+
+BASE = {"service_tier": "standard", "num_users": 500, "memory_type": "redis"}
+
+
+@pytest.fixture(autouse=True)
+def clear_cost_cache():
+    cost_cache.clear()
+    yield
+    cost_cache.clear()
+
+
+def scaled_llm_pricing(factor: float):
+    """The current LLM_Pricing.json with every flat price multiplied by factor"""
+    with open(pricing_store.llm_pricing_path) as f:
+        data = json.load(f)
+    for models in data["providers"].values():
+        for prices in models.values():
+            for name in ("input", "output", "cachedInput"):
+                if isinstance(prices.get(name), (int, float)):
+                    prices[name] *= factor
+    return parse_llm_pricing(data)
+
+
+def full_recompute(request):
+    response = client.post("/api/cost/calculate", json=request)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("changes", [
+    {"memory_type": "neo4j"},
+    {"num_users": 2500},
+    {"avg_input_tokens": 4000, "avg_output_tokens": 900},
+    {"service_tier": "premium"},
+    {"deployment_type": "on_premise"},
+])
+def test_delta_matches_full_recompute(changes):
+    created = client.post("/api/cost/scenarios", json=BASE).json()
+    assert created["result"] == full_recompute(BASE)
+
+    delta = client.post(f"/api/cost/scenarios/{created['scenario_id']}/delta", json={"changes": changes})
+    assert delta.status_code == 200
+    body = delta.json()
+    assert body["parent_id"] == created["scenario_id"]
+    assert body["result"] == full_recompute({**BASE, **changes})
+
+
+def test_chained_deltas_match_full_recompute():
+    scenario_id = client.post("/api/cost/scenarios", json=BASE).json()["scenario_id"]
+    request = dict(BASE)
+    for changes in ({"num_users": 50}, {"memory_type": "cosmos_db"}, {"service_tier": "basic"}):
+        body = client.post(f"/api/cost/scenarios/{scenario_id}/delta", json={"changes": changes}).json()
+        request.update(changes)
+        assert body["result"] == full_recompute(request)
+        scenario_id = body["scenario_id"]
+
+
+def test_memory_change_only_reruns_memory_step():
+    scenario_id = client.post("/api/cost/scenarios", json=BASE).json()["scenario_id"]
+    body = client.post(f"/api/cost/scenarios/{scenario_id}/delta", json={"changes": {"memory_type": "neo4j"}}).json()
+    # measured_rates is volatile (live prompt cache traffic): always rerun
+    assert body["recomputed"] == ["measured_rates", "memory_system"]
+    assert body["result"] == full_recompute({**BASE, "memory_type": "neo4j"})
+
+
+def test_delta_after_pricing_reload_uses_new_prices(monkeypatch):
+    scenario_id = client.post("/api/cost/scenarios", json=BASE).json()["scenario_id"]
+    monkeypatch.setattr(pricing_store, "llm", scaled_llm_pricing(10))
+
+    changes = {"mcp_tools": ["jira"]}
+    body = client.post(f"/api/cost/scenarios/{scenario_id}/delta", json={"changes": changes}).json()
+    assert body["reused"] == []
+    assert body["result"] == full_recompute({**BASE, **changes})
+
+    # The new scenario is tied to the new prices, so its deltas reuse again
+    body = client.post(f"/api/cost/scenarios/{body['scenario_id']}/delta", json={"changes": {"memory_type": "neo4j"}}).json()
+    assert "llm" in body["reused"]
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers.cost_calculator_v2 import CostCalculatorRequest, calculate_costs
+from app.routers.cost_sweep import tier_constants
+
+client = TestClient(app)
+
+
+def test_tier_constants_runs_inside_an_event_loop():
+    # Used from worker threads and must not start its own loop
+    async def inside_loop():
+        return tier_constants(CostCalculatorRequest(), "standard")
+
+    constants = asyncio.run(inside_loop())
+    assert constants["fixed_costs"] > 0
+
+
+def test_sweep_points_match_calculate():
+    users = [100, 2500]
+    response = client.post("/api/cost/sweep", json={
+        "service_tiers": ["basic", "premium"],
+        "axes": {"num_users": {"values": users}},
+    })
+    assert response.status_code == 200
+    body = response.json()
+    columns = body["columns"]
+    assert len(columns["total_monthly_cost"]) == 4
+
+    for tier_index, num_users, total in zip(columns["service_tier"], columns["num_users"], columns["total_monthly_cost"]):
+        tier = body["axes"]["service_tier"][tier_index]
+        expected = asyncio.run(calculate_costs(CostCalculatorRequest(service_tier=tier, num_users=num_users)))
+        assert total == pytest.approx(expected.total_monthly_cost, abs=1e-3)
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app import resilience
+from app.llm_backends import LLMResponse, count_batch_tasks
+from app.models import GeneratorRequest
+from app.rate_limiter import llm_rate_limiter
+from app.routers.generator import generator_agent_stream
+
+
+class SlowAfterFirstBackend:
+    """The first batch answers quickly, every later one slowly"""
+
+    def __init__(self, first: float, rest: float):
+        self.delays = [first, rest]
+        self.calls = 0
+
+    async def complete(self, request):
+        delay = self.delays[min(self.calls, 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        count = count_batch_tasks(request.prompt)
+        text = "\n".join(f"### RESULT {i}\ncode" for i in range(1, count + 1))
+        return LLMResponse(text, request.model, "fake", 100, 100, delay, 1)
+
+
+@pytest.fixture(autouse=True)
+def fake_backend(monkeypatch):
+    monkeypatch.setattr(llm_rate_limiter, "enabled", False)
+    monkeypatch.setattr(resilience.llm_client, "hedging", False)
+    backend = SlowAfterFirstBackend(0.05, 0.5)
+    monkeypatch.setattr(resilience, "get_backend", lambda: backend)
+
+
+def plan(cases: int):
+    return {
+        "appName": "Shop",
+        "testUrl": "https://shop.example.com",
+        "totalTestCases": cases,
+        "testCases": [{"id": f"TC_{i:03d}", "name": f"Case {i}", "type": "Functional", "priority": "High"}
+                      for i in range(1, cases + 1)],
+    }
+
+
+async def collect(request):
+    response = await generator_agent_stream(request)
+    started = time.perf_counter()
+    events = []
+    async for line in response.body_iterator:
+        events.append((time.perf_counter() - started, json.loads(line)))
+    return events
+
+
+def test_first_test_case_streams_before_later_batches():
+    # 48 cases → three realtime batches of 16
+    request = GeneratorRequest(testPlan=plan(48), automationFramework="Playwright", generationModel="GPT-4o")
+    events = asyncio.run(collect(request))
+
+    kinds = [event["type"] for _, event in events]
+    assert kinds[0] == "header"
+    assert kinds.count("testCase") == 48
+    assert kinds[-1] == "summary"
+    assert events[-1][1]["testCasesGenerated"] == 48
+
+    first_case = next(at for at, event in events if event["type"] == "testCase")
+    last_case = [at for at, event in events if event["type"] == "testCase"][-1]
+    assert first_case < 0.3
+    assert last_case >= 0.5
+    assert [event["testCaseId"] for _, event in events if event["type"] == "testCase"][:2] == ["TC_001", "TC_002"]
@@ -0,0 +1,71 @@
+import pytest
+
+from app.failure_index import FailureSignatureIndex
+from app.models import HealerRequest
+from app.routers import healer
+
+SELECTOR_FAILURE = "✘ 1 login works (120ms)\nError: locator('#old-login-btn') not found\n"
+
+
+@pytest.fixture(autouse=True)
+def fresh_failure_index(monkeypatch):
+    index = FailureSignatureIndex()
+    monkeypatch.setattr(healer, "failure_index", index)
+    return index
+
+
+def heal(script: str, **fields):
+    return healer.heal_test_script(HealerRequest(
+        testScript=script, executionResult=SELECTOR_FAILURE, automationFramework="playwright", **fields
+    ))
+
+
+def test_selector_change_is_self_healed(fresh_failure_index):
+    result = heal("await page.click('#old-login-btn');")
+
+    assert result["healingAction"] == "SELF_HEALED"
+    assert result["details"]["updatedScript"] == "await page.click('#new-submit-btn');"
+    stored = fresh_failure_index.lookup(healer.failure_signature_text(result["details"]["failureClassification"]))
+    assert stored.analysis["selectorFixes"] == {"#old-login-btn": "#new-submit-btn"}
+
+
+def test_selector_change_without_known_fix_needs_manual_review(fresh_failure_index):
+    script = "await page.click('#checkout');"
+    result = heal(script)
+    details = result["details"]
+
+    assert result["healingAction"] == "JIRA_TICKET_CREATED"
+    assert details["needsManualReview"] is True
+    assert details["updatedScript"] == script
+    assert "gitCommit" not in details and "confidence" not in details
+
+    stored = fresh_failure_index.lookup(healer.failure_signature_text(details["failureClassification"]))
+    assert "selectorFixes" not in stored.analysis
+    assert stored.analysis["jiraTicket"] == details["jiraTicket"]
+
+
+def test_selector_map_fixes_a_known_failure(fresh_failure_index):
+    heal("await page.click('#checkout');")
+
+    result = heal("await page.click('#checkout');", selectorMap={"#checkout": "#pay-now"})
+    assert result["healingAction"] == "SELF_HEALED"
+    assert result["details"]["updatedScript"] == "await page.click('#pay-now');"
+
+
+def test_ticket_for_a_previously_healed_failure_is_created_and_recorded(fresh_failure_index):
+    assert heal("await page.click('#old-login-btn');")["healingAction"] == "SELF_HEALED"
+
+    result = heal("await page.click('#checkout');")
+    ticket = result["details"]["jiraTicket"]
+    assert result["healingAction"] == "JIRA_TICKET_CREATED"
+    assert "reusedAnalysis" in result["details"]
+    assert f"JIRA ticket {ticket} created" in result["summary"]
+    assert "existing" not in result["summary"]
+
+    stored = fresh_failure_index.lookup(healer.failure_signature_text(result["details"]["failureClassification"]))
+    assert stored.analysis["jiraTicket"] == ticket
+    assert stored.analysis["selectorFixes"] == {"#old-login-btn": "#new-submit-btn"}
+
+    again = heal("await page.click('#checkout');")
+    assert again["details"]["jiraTicket"] == ticket
+    assert f"linked to existing JIRA ticket {ticket}" in again["summary"]
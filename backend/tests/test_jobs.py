@@ -0,0 +1,47 @@
+import asyncio
+
+from app.jobs import JobManager, JobStatus
+
+
+async def echo(request):
+    await asyncio.sleep(request)
+    return request
+
+
+def test_earliest_finished_jobs_are_evicted_first():
+    async def scenario():
+        manager = JobManager(max_workers=4, max_retained=3)
+        await manager.start()
+        try:
+            # Submitted first, finished last
+            slow = manager.submit("planner", echo, 0.2)
+            fast = [manager.submit("planner", echo, 0.01 * (i + 1)) for i in range(3)]
+            await asyncio.sleep(0.3)
+            assert all(job.finished for job in [slow, *fast])
+
+            pending = manager.submit("planner", echo, 1.0)
+            # The earliest to finish goes, not the earliest submitted
+            assert manager.get(fast[0].id) is None
+            assert manager.get(slow.id) is slow
+
+            manager.cancel(pending.id)
+            manager.submit("planner", echo, 0.0)
+            assert manager.get(fast[1].id) is None
+            assert manager.get(pending.id).status == JobStatus.CANCELLED
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_unfinished_jobs_are_never_evicted():
+    async def scenario():
+        manager = JobManager(max_workers=1, max_retained=1)
+        await manager.start()
+        try:
+            jobs = [manager.submit("planner", echo, 0.5) for _ in range(3)]
+            assert all(manager.get(job.id) is job for job in jobs)
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
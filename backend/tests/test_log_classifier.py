@@ -0,0 +1,97 @@
+from itertools import chain
+
+from fastapi.testclient import TestClient
+
+from app.log_classifier import ASSERTION, ENVIRONMENT, SELECTOR_CHANGE, TIMEOUT, LogClassifier, classify_log
+from app.main import app
+
+client = TestClient(app)
+
+LOG = (
+    "✓ 1 home page loads (120ms)\n"
+    "✘ 2 login works (300ms)\n"
+    "    Error: locator('#old-login-btn') not found\n"
+    "✘ 3 search works (5000ms)\n"
+    "    TimeoutError: page.click: Timeout 5000ms exceeded\n"
+    "✘ 4 checkout — überprüfung (10ms)\n"
+    "    Error: connect ECONNREFUSED 127.0.0.1:5432\n"
+)
+
+
+def feed_chunks(chunks, as_bytes=False):
+    classifier = LogClassifier()
+    feed = classifier.feed_bytes if as_bytes else classifier.feed
+    results = list(chain(chain.from_iterable(feed(chunk) for chunk in chunks), classifier.close()))
+    return results, classifier
+
+
+def whole_log_results():
+    return classify_log(LOG.splitlines())[0]
+
+
+def test_lines_split_across_chunks():
+    expected = whole_log_results()
+    for size in (1, 3, 7, 64):
+        chunks = [LOG[i:i + size] for i in range(0, len(LOG), size)]
+        assert feed_chunks(chunks)[0] == expected
+
+
+def test_multibyte_characters_split_across_byte_chunks():
+    data = LOG.encode("utf-8")
+    split = data.index("ü".encode("utf-8")) + 1  # between the two bytes of "ü"
+    results, _ = feed_chunks([data[:split], data[split:]], as_bytes=True)
+    assert results == whole_log_results()
+    assert results[-1].test == "checkout — überprüfung"
+
+    # One byte at a time
+    assert feed_chunks([data[i:i + 1] for i in range(len(data))], as_bytes=True)[0] == whole_log_results()
+
+
+def test_trailing_line_without_newline_is_flushed_by_close():
+    classifier = LogClassifier()
+    assert list(classifier.feed("✘ 1 login works\n    Error: locator('#a') not found")) == []
+    results = list(classifier.close())
+    assert [(result.test, result.category) for result in results] == [("login works", SELECTOR_CHANGE)]
+    assert classifier.lines_processed == 2
+
+
+def test_highest_priority_rule_wins_on_a_line():
+    classifier = LogClassifier()
+    assert classifier.rules.categorize("Timeout 5000ms exceeded waiting for selector '#a'") == SELECTOR_CHANGE
+    assert classifier.rules.categorize("expected 200 but got 503 Service Unavailable") == ENVIRONMENT
+    assert classifier.rules.categorize("all good") is None
+
+
+def test_highest_priority_evidence_wins_within_a_test():
+    results, classifier = feed_chunks([
+        "✘ 1 flaky\n"
+        "    AssertionError: expected 1 to equal 2\n"
+        "    Timeout 3000ms exceeded\n"
+        "    AssertionError: again\n"
+    ])
+    (result,) = results
+    assert result.category == TIMEOUT
+    assert result.line == 3
+    assert "Timeout" in result.evidence
+    assert classifier.summary()["overallCategory"] == TIMEOUT
+
+
+def test_overall_category_is_the_highest_priority_failure():
+    _, classifier = feed_chunks([LOG])
+    summary = classifier.summary()
+    assert summary["failuresByCategory"] == {SELECTOR_CHANGE: 1, TIMEOUT: 1, ENVIRONMENT: 1}
+    assert (summary["passed"], summary["failed"], summary["overallCategory"]) == (1, 3, SELECTOR_CHANGE)
+
+
+def test_unattributed_evidence_fails_the_run():
+    results, _ = feed_chunks(["Tests PASSED: 4/5. One failure: assertion failed on the cart total\n"])
+    assert [(result.test, result.category) for result in results] == [("(run)", ASSERTION)]
+
+
+def test_classify_endpoint_reads_chunked_upload():
+    data = LOG.encode("utf-8")
+    response = client.post("/api/healer/classify", content=(data[i:i + 5] for i in range(0, len(data), 5)))
+    assert response.status_code == 200
+    body = response.json()["data"]
+    assert body["testsSeen"] == 4
+    assert [test["test"] for test in body["failedTests"]][-1] == "checkout — überprüfung"
@@ -0,0 +1,53 @@
+import asyncio
+import copy
+
+import pytest
+
+from app import agent_runtime
+from app.jobs import JobManager
+from app.metrics import registry
+from app.pipeline import PipelineStage, iter_pipeline_events
+from app.rate_limiter import LLMRateLimiter
+
+
+def recorded():
+    """Every metric's series, to compare before and after"""
+    return {
+        name: copy.deepcopy(getattr(metric, "_series", getattr(metric, "_values", None)))
+        for name, metric in registry._metrics.items()
+    }
+
+
+async def instrumented_work():
+    async def stage(artifacts):
+        return "done"
+
+    async for _ in iter_pipeline_events([PipelineStage("plan", stage), PipelineStage("run", stage, ["plan"])]):
+        pass
+
+    manager = JobManager(max_workers=1)
+    await manager.start()
+    try:
+        job = manager.submit("planner", stage, None)
+        while not job.finished:
+            await asyncio.sleep(0.01)
+    finally:
+        await manager.stop()
+
+    async with LLMRateLimiter(limits={}).acquire("planner", "gpt-4o", 100):
+        pass
+
+    await agent_runtime.execute_agent("planner", lambda: "built", think_time=(0.0, 0.0))
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_metrics_toggle_covers_all_instrumentation(monkeypatch, enabled):
+    monkeypatch.setattr(registry, "enabled", enabled)
+    before = recorded()
+    asyncio.run(instrumented_work())
+    changed = {name for name, series in recorded().items() if series != before[name]}
+
+    if enabled:
+        assert {"qa_agent_stage_duration_seconds", "qa_agent_queue_wait_seconds"} <= changed
+    else:
+        assert changed == set()
@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.plan_cache import plan_cache
+
+client = TestClient(app)
+
+REQUEST = {
+    "appName": "Shop",
+    "appType": "Web",
+    "testUrl": "https://shop.example.com",
+    "scope": "Checkout, login",
+    "testTypes": ["Functional Testing", "Regression Testing"],
+    "reasoningModel": "gpt-4o",
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_plan_cache():
+    plan_cache.clear()
+    yield
+    plan_cache.clear()
+
+
+def plan(**fields):
+    response = client.post("/api/planner", json={**REQUEST, **fields})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+def test_hit_echoes_the_callers_own_fields():
+    first = plan()
+    second = plan(appName="  Shop ", testUrl="https://shop.example.com/",
+                  testTypes=["Regression Testing", "Functional Testing"])
+
+    assert second["cached"] is True
+    assert second["testPlan"]["appName"] == "  Shop "
+    assert second["testPlan"]["testUrl"] == "https://shop.example.com/"
+    assert second["testPlan"]["testCases"] == first["testPlan"]["testCases"]
+    assert plan()["testPlan"]["testUrl"] == "https://shop.example.com"
+
+
+def test_repeated_test_types_are_not_deduplicated():
+    single = plan(testTypes=["Functional Testing"])
+    repeated = plan(testTypes=["Functional Testing", "Functional Testing"])
+
+    assert repeated["cached"] is False
+    assert repeated["testPlan"]["totalTestCases"] >= 2 * 3
+    assert single["testPlan"]["totalTestCases"] <= 5
@@ -0,0 +1,80 @@
+import pytest
+
+from app.pricing_config import PricingConfig, build_config_snapshot
+from app.routers import cost_calculator_v2
+from config.service_tiers import GPU_COSTS, LLM_CATEGORIES
+
+
+def scan(entries, field, key, casefold=False):
+    """The linear scan the indexes replace: first entry whose field matches"""
+    for entry in entries:
+        value = entry.get(field)
+        if value is not None and (str(value).casefold() == key.casefold() if casefold else value == key):
+            return entry
+    return None
+
+
+def catalogs(config):
+    """(lookup method, entries, field, casefold) for each indexed catalog"""
+    tools = config.get('mcp_tools', {})
+    monitoring = config.get('monitoring', {})
+    yield 'get_azure_vm', config['azure']['compute']['virtual_machines'], 'sku', False
+    yield 'get_aws_ec2', config['aws']['compute']['ec2'], 'type', False
+    yield 'get_gcp_compute', config['gcp']['compute']['compute_engine'], 'type', False
+    yield 'get_mcp_tool_pricing', [*tools.get('servers', []), *tools.get('functions', [])], 'name', False
+    yield 'get_data_source_pricing', config.get('data_sources', []), 'name', True
+    yield ('get_monitoring_service_pricing',
+           [*monitoring.get('azure_monitor', []), *monitoring.get('third_party', [])], 'name', True)
+
+
+def assert_lookups_match_scans(pricing, keys):
+    for method, entries, field, casefold in catalogs(pricing.config):
+        for key in [entry[field] for entry in entries if field in entry] + keys:
+            variants = {key, key.upper(), key.lower()} if casefold else {key}
+            for variant in variants:
+                assert getattr(pricing, method)(variant) == scan(entries, field, variant, casefold), (method, variant)
+
+    for provider, provider_config in pricing.config.get('llm_providers', {}).items():
+        models = provider_config.get('models', [])
+        for name in [model['name'] for model in models] + keys:
+            assert pricing.get_llm_pricing(provider, name) == scan(models, 'name', name)
+
+
+def test_indexed_lookups_match_linear_scans():
+    pricing = PricingConfig()
+    assert_lookups_match_scans(pricing, ["missing", ""])
+
+
+def test_duplicates_and_case_variants_resolve_like_the_scan():
+    pricing = PricingConfig()
+    config = {
+        'azure': {'compute': {'virtual_machines': [{'sku': 'A', 'n': 1}, {'sku': 'A', 'n': 2}, {'n': 3}]}},
+        'aws': {'compute': {'ec2': [{'type': 't3', 'n': 1}]}},
+        'gcp': {'compute': {'compute_engine': []}},
+        'llm_providers': {'openai': {'models': [{'name': 'm', 'n': 1}, {'name': 'm', 'n': 2}]}},
+        'mcp_tools': {'servers': [{'name': 'tool', 'n': 'server'}], 'functions': [{'name': 'tool', 'n': 'fn'}]},
+        'data_sources': [{'name': 'Salesforce', 'n': 1}, {'name': 'SALESFORCE', 'n': 2}],
+        'monitoring': {'azure_monitor': [{'name': 'Logs', 'n': 1}], 'third_party': [{'name': 'logs', 'n': 2}]},
+    }
+    pricing.publish(build_config_snapshot(config))
+
+    assert_lookups_match_scans(pricing, ["missing", "a", "Tool"])
+    assert pricing.get_azure_vm('A')['n'] == 1
+    assert pricing.get_mcp_tool_pricing('tool')['n'] == 'server'
+    assert pricing.get_data_source_pricing('salesForce')['n'] == 1
+    assert pricing.get_monitoring_service_pricing('LOGS')['n'] == 1
+
+
+def test_indexes_are_read_only():
+    pricing = PricingConfig()
+    with pytest.raises(TypeError):
+        pricing.indexes['azure_vms']['new-sku'] = {}
+
+
+def test_calculator_gpu_lookups_match_scan():
+    on_premise = [model for category in LLM_CATEGORIES.values() for model in category.get("on_premise", [])]
+    for model in on_premise + [{"id": "not-on-premise"}]:
+        found = scan(on_premise, "id", model["id"])
+        gpu_type = found.get("gpu_type", "A100") if found else "A100"
+        _, calculated_gpu_type, hourly = cost_calculator_v2.gpu_model_cost(model["id"], 50, 2)
+        assert (calculated_gpu_type, hourly) == (gpu_type, GPU_COSTS[gpu_type]["hourly_cost"])
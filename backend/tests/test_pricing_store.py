@@ -0,0 +1,75 @@
+import asyncio
+import json
+import os
+import shutil
+
+import pytest
+
+from app import pricing_store as pricing_store_module
+from app.pricing_config import PricingConfig
+from app.pricing_store import PricingStore, pricing_store
+
+CONFIG_DIR = pricing_store.llm_pricing_path.parent
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A store watching copies of both pricing files"""
+    shutil.copy(CONFIG_DIR / "LLM_Pricing.json", tmp_path / "LLM_Pricing.json")
+    shutil.copy(CONFIG_DIR / "pricing.yaml", tmp_path / "pricing.yaml")
+    config = PricingConfig(tmp_path / "pricing.yaml")
+    monkeypatch.setattr(pricing_store_module, "get_pricing_config", lambda: config)
+    store = PricingStore(tmp_path / "LLM_Pricing.json", poll_seconds=0)
+    asyncio.run(store.check(force=True))
+    return store
+
+
+def rewrite(path, content: str):
+    """Replace a file's content and move its mtime on, so the poll sees a change"""
+    previous = os.stat(path).st_mtime_ns
+    path.write_text(content)
+    os.utime(path, ns=(previous + 10**9, previous + 10**9))
+
+
+def test_valid_llm_pricing_file_is_published(store):
+    data = json.loads(store.llm_pricing_path.read_text())
+    data["providers"]["test"] = {"test-model": {"input": 1.0, "output": 2.0, "cachedInput": 0.5}}
+    previous_version = store.version
+
+    rewrite(store.llm_pricing_path, json.dumps(data))
+    assert asyncio.run(store.check()) == ["llm_pricing"]
+    assert store.version != previous_version
+    assert store.llm_pricing["test-model"]["input"] == 1.0
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    json.dumps({"providers": {}}),
+    json.dumps({"providers": {"openai": {"gpt-4o": {"input": -1}}}}),
+])
+def test_invalid_llm_pricing_keeps_previous_snapshot(store, content):
+    snapshot, failures = store.llm, store.failures
+
+    rewrite(store.llm_pricing_path, content)
+    assert asyncio.run(store.check()) == []
+    assert store.llm is snapshot
+    assert store.failures == failures + 1
+    assert "LLM_Pricing.json" in store.last_error
+
+    # Reported once, not on every poll
+    assert asyncio.run(store.check()) == []
+    assert store.failures == failures + 1
+
+
+def test_invalid_pricing_config_keeps_previous_snapshot(store):
+    config = pricing_store_module.get_pricing_config()
+    snapshot = config.snapshot
+
+    rewrite(config.config_path, "azure: [unclosed\n")
+    assert asyncio.run(store.check()) == []
+    assert config.snapshot is snapshot
+    assert "pricing.yaml" in store.last_error
+
+    rewrite(config.config_path, (CONFIG_DIR / "pricing.yaml").read_text() + "\ntest_marker: 1\n")
+    assert asyncio.run(store.check()) == ["pricing_config"]
+    assert config.config["test_marker"] == 1
@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.llm_backends import LLMRequest, LLMResponse, OpenAICompatibleBackend
+from app.main import app
+from app.prompt_cache import ESTIMATED, MEASURED, PromptPrefixCache, app_context, prompt_cache
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_prompt_cache():
+    prompt_cache.clear()
+    yield
+    prompt_cache.clear()
+
+
+def response(model: str, prompt_tokens: int, cached_tokens) -> LLMResponse:
+    return LLMResponse("ok", model, "http", prompt_tokens, 10, 0.1, 1, None, cached_tokens)
+
+
+def test_provider_reported_cached_tokens_are_measured():
+    cache = PromptPrefixCache(min_requests=2)
+    cache.record_usage(response("gpt-4o", 1000, 600))
+    assert cache.hit_rate_with_source("gpt-4o") is None
+
+    cache.record_usage(response("gpt-4o", 1000, 200))
+    assert cache.hit_rate_with_source("gpt-4o") == (0.4, MEASURED)
+
+
+def test_unreported_usage_falls_back_to_estimate():
+    cache = PromptPrefixCache(min_requests=2)
+    context = app_context("Shop", "https://shop.example.com")
+    for i in range(3):
+        cache.build("planner", "gpt-4o", context, f"task {i}")
+        cache.record_usage(response("gpt-4o", 1000, None))
+
+    rate, source = cache.hit_rate_with_source("gpt-4o")
+    assert source == ESTIMATED
+    assert 0 < rate < 1
+    assert cache.stats()["models"][0]["reportedRequests"] == 0
+
+
+def test_http_backend_reads_cached_tokens():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": "done"}}],
+            "usage": {"prompt_tokens": 1200, "completion_tokens": 5, "prompt_tokens_details": {"cached_tokens": 1024}},
+        })
+
+    async def complete():
+        backend = OpenAICompatibleBackend("http", "http://llm.test/v1")
+        backend._client = httpx.AsyncClient(base_url=backend.base_url, transport=httpx.MockTransport(handler))
+        try:
+            return await backend.complete(LLMRequest(agent="planner", model="gpt-4o", prompt="hello"))
+        finally:
+            await backend.close()
+
+    result = asyncio.run(complete())
+    assert (result.prompt_tokens, result.cached_tokens) == (1200, 1024)
+
+
+def test_calculator_labels_rate_sources():
+    models = [item["subcategory"] for item in client.post("/api/cost/calculate", json={}).json()["llm_breakdown"]]
+    measured, estimated = models[0], models[1:]
+    for _ in range(prompt_cache.min_requests):
+        prompt_cache.record_usage(response(measured, 1000, 250))
+    context = app_context("Shop", "https://shop.example.com")
+    for model in estimated:
+        for i in range(prompt_cache.min_requests):
+            prompt_cache.build("planner", model, context, f"task {i}")
+
+    body = client.post("/api/cost/calculate", json={"use_measured_cache_hit_rates": True}).json()
+    assert body["measured_cache_hit_rates"][measured] == 0.25
+    assert body["cache_hit_rate_sources"] == {measured: MEASURED, **{model: ESTIMATED for model in estimated}}
+    notes = {item["subcategory"]: item["notes"] for item in body["llm_breakdown"]}
+    assert notes[measured].endswith("25% cache hit rate (measured)")
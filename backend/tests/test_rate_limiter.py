@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.rate_limiter import LLMRateLimiter, ModelRateLimiter
+
+
+def drained(rpm: int = 6000, tpm: int = 1_000_000) -> ModelRateLimiter:
+    """A limiter with no requests left: every call queues (rpm/60 grants per second)"""
+    limiter = ModelRateLimiter("gpt-4o", rpm=rpm, tpm=tpm)
+    limiter.requests.level = 0
+    return limiter
+
+
+def test_agents_are_served_round_robin():
+    async def scenario():
+        limiter = drained()
+        order = []
+
+        async def call(agent):
+            await limiter.acquire(agent, 10)
+            order.append(agent)
+
+        calls = [asyncio.create_task(call("generator")) for _ in range(4)]
+        await asyncio.sleep(0)
+        calls.append(asyncio.create_task(call("planner")))
+        await asyncio.gather(*calls)
+        return order, limiter
+
+    order, limiter = asyncio.run(scenario())
+    # The planner waits behind one generator call, not all four
+    assert order == ["generator", "planner", "generator", "generator", "generator"]
+    assert limiter.queued == 5 and limiter.queue_depth == 0
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        limiter = drained(rpm=60)
+        waiting = asyncio.create_task(limiter.acquire("generator", 10))
+        await asyncio.sleep(0.01)
+        assert limiter.queue_depth == 1
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.queue_depth == 0
+    assert limiter.granted == 0
+
+
+def test_unused_tokens_are_refunded():
+    async def scenario():
+        limiter = LLMRateLimiter(limits={"gpt-4o": {"rpm": 100, "tpm": 10_000}})
+        async with limiter.acquire("planner", "gpt-4o", 4000) as permit:
+            assert limiter.limiter("gpt-4o").tokens.level == pytest.approx(6000, abs=5)
+            permit.used_tokens = 1000
+        return limiter.limiter("gpt-4o")
+
+    model_limiter = asyncio.run(scenario())
+    assert model_limiter.tokens.level == pytest.approx(9000, abs=5)
+
+
+def test_tokens_per_minute_limit_queues_calls():
+    async def scenario():
+        limiter = ModelRateLimiter("gpt-4o", rpm=10_000, tpm=6000)
+        await limiter.acquire("planner", 6000)
+        permit = await asyncio.wait_for(limiter.acquire("planner", 60), timeout=2)
+        return permit
+
+    permit = asyncio.run(scenario())
+    # 60 tokens at 100 tokens/s
+    assert permit.waited_seconds == pytest.approx(0.6, abs=0.15)
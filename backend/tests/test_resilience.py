@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from app import resilience
+from app.llm_backends import LLMBackendError, LLMRequest, LLMResponse
+from app.rate_limiter import llm_rate_limiter
+from app.resilience import CircuitBreaker, ResilientLLMClient, response_cost
+
+MODEL = "gpt-4o-mini"
+
+
+class FakeBackend:
+    """Answers after `delays[i]` seconds on the i-th call, or raises if the delay is None"""
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.completed = 0
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        if delay is None:
+            raise LLMBackendError("fake", "boom")
+        await asyncio.sleep(delay)
+        self.completed += 1
+        return LLMResponse("ok", request.model, "fake", 1000, 1000, delay, 1)
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    monkeypatch.setattr(llm_rate_limiter, "enabled", False)
+
+
+def use_backend(monkeypatch, backend):
+    monkeypatch.setattr(resilience, "get_backend", lambda: backend)
+
+
+def request():
+    return LLMRequest("planner", MODEL, "prompt")
+
+
+def test_breaker_opens_then_half_opens_after_cooldown():
+    breaker = CircuitBreaker(MODEL, failure_threshold=2, cooldown_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one trial at a time
+    assert not breaker.allow()
+
+
+def test_failed_trial_reopens_and_successful_trial_closes():
+    breaker = CircuitBreaker(MODEL, failure_threshold=1, cooldown_seconds=0.0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opens == 2
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_cancelled_trial_frees_the_breaker(monkeypatch):
+    client = ResilientLLMClient(hedging=False, failure_threshold=1, cooldown_seconds=0.0)
+    backend = FakeBackend([None])
+    use_backend(monkeypatch, backend)
+
+    async def scenario():
+        with pytest.raises(LLMBackendError):
+            # Fails on the model and every tier peer, opening all their breakers
+            await client.complete(request())
+        assert client.breaker(MODEL).state == CircuitBreaker.OPEN
+
+        backend.delays = [10.0]
+        trial = asyncio.create_task(client.complete(request()))
+        await asyncio.sleep(0.01)
+        assert client.breaker(MODEL).trial_in_flight
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        breaker = client.breaker(MODEL)
+        assert not breaker.trial_in_flight
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        backend.delays = [0.0]
+        response = await client.complete(request())
+        assert response.model == MODEL
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_hedge_loser_is_not_charged(monkeypatch):
+    client = ResilientLLMClient(min_samples=1)
+    client.tracker("planner", MODEL).record(0.01)
+    # The original is slow; the hedge answers first and the original is cancelled
+    backend = FakeBackend([0.5, 0.0])
+    use_backend(monkeypatch, backend)
+
+    response = asyncio.run(client.complete(request()))
+    assert client.hedges_launched == 1
+    assert client.hedges_won == 1
+    assert backend.completed == 1
+    assert client.duplicate_spend == 0.0
+    assert client.total_spend == pytest.approx(response_cost(response))
+
+
+def test_failed_hedge_loser_is_not_charged(monkeypatch):
+    client = ResilientLLMClient(min_samples=1)
+    client.tracker("planner", MODEL).record(0.01)
+    use_backend(monkeypatch, FakeBackend([0.05, None]))
+
+    response = asyncio.run(client.complete(request()))
+    assert client.hedges_launched == 1
+    assert client.hedges_won == 0
+    assert client.duplicate_spend == 0.0
+    assert client.total_spend == pytest.approx(response_cost(response))
@@ -0,0 +1,106 @@
+import random
+import re
+
+import pytest
+
+from app.selector_rewriter import SelectorRewriter, get_default_rewriter, get_selector_rewriter
+
+IDENT = re.compile(r"[\w-]")
+
+
+def reference_rewrite(mapping, script, respect_boundaries=True):
+    """Plain scan: at each offset try the selectors longest first, else move on one character"""
+    selectors = sorted(mapping, key=len, reverse=True)
+    output, substitutions, position = [], [], 0
+    while position < len(script):
+        for old in selectors:
+            end = position + len(old)
+            if not script.startswith(old, position):
+                continue
+            if respect_boundaries and (
+                (IDENT.match(old[-1]) and end < len(script) and IDENT.match(script[end]))
+                or (IDENT.match(old[0]) and position > 0 and IDENT.match(script[position - 1]))
+            ):
+                continue
+            output.append(mapping[old])
+            substitutions.append((position, old, mapping[old]))
+            position = end
+            break
+        else:
+            output.append(script[position])
+            position += 1
+    return "".join(output), substitutions
+
+
+def rewrite(mapping, script, respect_boundaries=True):
+    text, substitutions = SelectorRewriter(mapping, respect_boundaries).rewrite(script)
+    return text, [tuple(sub) for sub in substitutions]
+
+
+def test_matches_chained_replace_on_independent_selectors():
+    mapping = {"#old-login-btn": "#new-submit-btn", ".nav > a": ".menu a", "input[name='q']": "#search"}
+    script = "click('#old-login-btn'); hover('.nav > a'); fill(\"input[name='q']\"); click('#old-login-btn')"
+    expected = script
+    for old, new in mapping.items():
+        expected = expected.replace(old, new)
+    assert rewrite(mapping, script)[0] == expected
+
+
+def test_longest_overlapping_prefix_wins():
+    mapping = {"button.submit": "#submit", "button.submit-2": "#submit-secondary"}
+    text, substitutions = rewrite(mapping, "click('button.submit-2'); click('button.submit')")
+    assert text == "click('#submit-secondary'); click('#submit')"
+    assert substitutions == [(7, "button.submit-2", "#submit-secondary"), (33, "button.submit", "#submit")]
+
+
+def test_regex_metacharacters_are_literal():
+    mapping = {"button[type='submit']": "#submit", "a.b": "#ab", "div(1)+span*": "#x"}
+    text, _ = rewrite(mapping, "click(\"button[type='submit']\"); axb; a.b; div(1)+span*")
+    assert text == "click(\"#submit\"); axb; #ab; #x"
+
+
+@pytest.mark.parametrize("script, expected", [
+    ("click('button.submit-large')", "click('button.submit-large')"),
+    ("click('mybutton.submit')", "click('mybutton.submit')"),
+    ("click('button.submit_2')", "click('button.submit_2')"),
+    ("click('form button.submit:hover')", "click('form #submit:hover')"),
+    # Non-identifier ends don't need a boundary
+    ("x[type='submit']y", "x#typey"),
+])
+def test_boundary_rules(script, expected):
+    mapping = {"button.submit": "#submit", "[type='submit']": "#type"}
+    assert rewrite(mapping, script)[0] == expected
+    assert rewrite(mapping, script) == reference_rewrite(mapping, script)
+
+
+def test_rejected_longer_match_falls_back_to_shorter_selector():
+    mapping = {"a": "A", "a.b": "B"}
+    assert rewrite(mapping, "a.bc a.b") == reference_rewrite(mapping, "a.bc a.b")
+    assert rewrite(mapping, "a.bc a.b")[0] == "A.bc B"
+
+
+def test_without_boundaries_selectors_match_anywhere():
+    mapping = {"button.submit": "#submit"}
+    assert rewrite(mapping, "mybutton.submit-large", respect_boundaries=False)[0] == "my#submit-large"
+
+
+@pytest.mark.parametrize("respect_boundaries", [True, False])
+def test_random_scripts_match_reference(respect_boundaries):
+    rng = random.Random(7)
+    alphabet = "ab.-#[]' "
+    for _ in range(300):
+        mapping = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))): f"<{i}>" for i in range(5)}
+        mapping = {old: new for old, new in mapping.items() if old.strip()}
+        script = "".join(rng.choice(alphabet) for _ in range(40))
+        assert rewrite(mapping, script, respect_boundaries) == reference_rewrite(mapping, script, respect_boundaries)
+
+
+def test_overrides_extend_and_replace_default_mappings():
+    default = get_default_rewriter().mapping
+    old = next(iter(default))
+    rewriter = get_selector_rewriter({old: "#overridden", ".extra": "#extra"})
+
+    assert rewriter.mapping == {**default, old: "#overridden", ".extra": "#extra"}
+    assert rewriter.rewrite(f"{old} .extra")[0] == "#overridden #extra"
+    assert get_selector_rewriter({".extra": "#extra", old: "#overridden"}) is rewriter
+    assert get_selector_rewriter() is get_default_rewriter()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the Planner, Generator and Healer agents
+
+Fires N concurrent agent runs on a single event loop (one uvicorn worker)
+and measures wall-clock time, agent runs/second, and the latency of a
+cost-calculator request issued while the agents are in flight.
+
+Usage:
+    python bench_agent_throughput.py [concurrency]
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+import asyncio
+from app.models import PlannerRequest, GeneratorRequest, HealerRequest
+from app.routers.planner import run_planner
+from app.routers.generator import run_generator
+from app.routers.healer import run_healer
+from app.routers.cost_calculator_v2 import calculate_costs, CostCalculatorRequest
+
+
+PLANNER_REQUEST = PlannerRequest(
+    appName="E-Commerce Checkout",
+    appType="Web App",
+    testUrl="https://example.com",
+    scope="Test checkout flow",
+    testTypes=["Functional Testing", "Regression Testing"],
+    reasoningModel="GPT-4 (Simulated)"
+)
+
+
+async def run_mixed_agents(concurrency: int):
+    """Run `concurrency` agent calls, cycling planner -> generator -> healer"""
+    plan = (await run_planner(PLANNER_REQUEST)).data["testPlan"]
+    generator_request = GeneratorRequest(
+        testPlan=plan,
+        automationFramework="Playwright",
+        generationModel="Claude-3 (Simulated)"
+    )
+    healer_request = HealerRequest(
+        testScript="await page.click('#old-login-btn');",
+        executionResult="Tests PASSED: 4/5 tests passed. One failure detected due to CSS selector change.",
+        automationFramework="Playwright"
+    )
+
+    calls = []
+    for i in range(concurrency):
+        if i % 3 == 0:
+            calls.append(run_planner(PLANNER_REQUEST))
+        elif i % 3 == 1:
+            calls.append(run_generator(generator_request))
+        else:
+            calls.append(run_healer(healer_request))
+
+    async def probe_cost_calculator():
+        # Issued while the agents are still "thinking"
+        await asyncio.sleep(0.1)
+        start = time.perf_counter()
+        await calculate_costs(CostCalculatorRequest())
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await asyncio.gather(probe_cost_calculator(), *calls)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, results[0], len(results) - 1
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    print("=" * 80)
+    print(f"AGENT THROUGHPUT: {concurrency} concurrent agent calls on one event loop")
+    print("=" * 80)
+
+    elapsed, probe_latency, completed = asyncio.run(run_mixed_agents(concurrency))
+
+    # Each agent run "thinks" for 1.5-3.0s; a blocking implementation would
+    # serialize them (~2.2s average per call).
+    sequential_estimate = completed * 2.2
+
+    print(f"  - Agent runs completed:        {completed}")
+    print(f"  - Wall-clock time:             {elapsed:.2f}s")
+    print(f"  - Throughput:                  {completed / elapsed:.1f} agent runs/s")
+    print(f"  - Blocking (time.sleep) est.:  {sequential_estimate:.1f}s")
+    print(f"  - Cost calculator latency:     {probe_latency * 1000:.1f}ms (while agents in flight)")
+
+
+if __name__ == "__main__":
+    main()
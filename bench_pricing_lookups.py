@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Lookup benchmark for PricingConfig catalog indexes
+
+Grows the pricing catalog (Azure VM SKUs, OpenAI models, data sources) to N
+synthetic entries per list and compares the indexed lookups against the
+previous linear scans (which also lowercased names inside the loop).
+Lookups are spread over the whole catalog, so a scan averages N/2
+comparisons.
+
+Usage:
+    python bench_pricing_lookups.py [catalog_size ...]
+"""
+
+import copy
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.pricing_config import PricingConfig, build_config_snapshot
+
+LOOKUPS = 20000
+
+
+def legacy_azure_vm(config, sku):
+    for vm in config.get('azure', {}).get('compute', {}).get('virtual_machines', []):
+        if vm.get('sku') == sku:
+            return vm
+    return None
+
+
+def legacy_llm_pricing(config, provider, model_name):
+    for model in config.get('llm_providers', {}).get(provider, {}).get('models', []):
+        if model.get('name') == model_name:
+            return model
+    return None
+
+
+def legacy_data_source(config, source_name):
+    for source in config.get('data_sources', []):
+        if source.get('name').lower() == source_name.lower():
+            return source
+    return None
+
+
+def grow_catalog(config, size):
+    """Pad each catalog list with synthetic entries up to `size`"""
+    config = copy.deepcopy(config)
+    vms = config['azure']['compute']['virtual_machines']
+    vms.extend({"sku": f"Standard_X{i}s_v9", "pricing": {"payg_per_hour_aud": 0.1 * i}}
+               for i in range(size - len(vms)))
+    models = config['llm_providers']['openai']['models']
+    models.extend({"name": f"synthetic-model-{i}", "input_per_1m_tokens_usd": 1.0}
+                  for i in range(size - len(models)))
+    sources = config['data_sources']
+    sources.extend({"name": f"Synthetic Source {i}", "estimated_cost_usd_month": 10.0}
+                   for i in range(size - len(sources)))
+    return config
+
+
+def timed(func, keys):
+    start = time.perf_counter()
+    for key in keys:
+        func(key)
+    return (time.perf_counter() - start) / len(keys)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 10000]
+    base = PricingConfig()
+    # The published config is frozen; grow a plain copy of the file instead
+    raw_config = base._load_config()
+    rng = random.Random(42)
+
+    print("=" * 80)
+    print(f"PRICING CATALOG LOOKUPS: {LOOKUPS:,} random lookups per method, catalog sizes {sizes}")
+    print("=" * 80)
+    print(f"{'entries':>8}  {'method':<26}{'linear scan':>14}{'indexed':>12}{'speedup':>10}")
+
+    for size in sizes:
+        config = grow_catalog(raw_config, size)
+        pricing = PricingConfig(base.config_path)
+        pricing.publish(build_config_snapshot(config))
+        config = pricing.config
+
+        skus = [vm['sku'] for vm in config['azure']['compute']['virtual_machines']]
+        models = [m['name'] for m in config['llm_providers']['openai']['models']]
+        sources = [s['name'].upper() for s in config['data_sources']]
+
+        cases = [
+            ("get_azure_vm", [rng.choice(skus) for _ in range(LOOKUPS)],
+             lambda sku: legacy_azure_vm(config, sku), pricing.get_azure_vm),
+            ("get_llm_pricing", [rng.choice(models) for _ in range(LOOKUPS)],
+             lambda name: legacy_llm_pricing(config, 'openai', name),
+             lambda name: pricing.get_llm_pricing('openai', name)),
+            ("get_data_source_pricing", [rng.choice(sources) for _ in range(LOOKUPS)],
+             lambda name: legacy_data_source(config, name), pricing.get_data_source_pricing),
+        ]
+        for method, keys, legacy, indexed in cases:
+            assert all(legacy(key) is indexed(key) for key in keys[:200])
+            scan_time = timed(legacy, keys)
+            index_time = timed(indexed, keys)
+            print(f"{size:>8,}  {method:<26}{scan_time * 1e6:>12.2f}us{index_time * 1e6:>10.3f}us"
+                  f"{scan_time / index_time:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Rendering throughput benchmark for the Generator Agent script templates
+
+Renders a 10k test case plan with the precompiled templates and compares it
+against the previous approach (an f-string per case with test_plan.get()
+lookups inside the loop, accumulated with +=).
+
+Usage:
+    python bench_script_templates.py [num_test_cases]
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.script_templates import get_template, list_frameworks
+
+
+def legacy_playwright(test_plan, generation_model):
+    """Baseline: the generator's original per-request f-string rendering"""
+    test_script = f"""// Generated Test Script using Playwright
+// Application: {test_plan.get('appName', 'Unknown')}
+// Generated by: {generation_model}
+// Total Test Cases: {test_plan.get("totalTestCases", 5)}
+
+const {{ test, expect }} = require('@playwright/test');
+
+test.describe('{test_plan.get('appName', 'Application')} - Automated Tests', () => {{
+"""
+    for i, tc in enumerate(test_plan.get('testCases', []), 1):
+        test_script += f"""
+  test('{tc['name']}', async ({{ page }}) => {{
+    // Navigate to application
+    await page.goto('{test_plan.get('testUrl', 'https://example.com')}');
+
+    // Test steps
+    await page.waitForLoadState('networkidle');
+    // TODO: Add specific test logic for {tc['type']}
+
+    // Assertions
+    await expect(page).toHaveTitle(/{test_plan.get('appName', 'App')}/i);
+  }});
+"""
+    test_script += "});\n"
+    return test_script
+
+
+def render_with_template(framework, test_plan, generation_model):
+    template = get_template(framework)
+    context = template.plan_context(test_plan, generation_model)
+    chunks = [template.render_header(context)]
+    chunks.extend(template.render_cases(context, test_plan['testCases']))
+    chunks.append(template.render_footer(context))
+    return "".join(chunks)
+
+
+def best_of(func, *args, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    num_cases = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    test_plan = {
+        "appName": "E-Commerce Checkout",
+        "testUrl": "https://example.com/checkout",
+        "totalTestCases": num_cases,
+        "testCases": [
+            {"id": f"TC_{i:05d}", "name": f"Checkout scenario {i}", "type": "Functional Testing", "priority": "High"}
+            for i in range(1, num_cases + 1)
+        ]
+    }
+
+    print("=" * 80)
+    print(f"SCRIPT TEMPLATE RENDERING: {num_cases:,} test cases (best of 5)")
+    print("=" * 80)
+
+    legacy_time, legacy_script = best_of(legacy_playwright, test_plan, "Claude-3")
+    template_time, template_script = best_of(render_with_template, "Playwright", test_plan, "Claude-3")
+
+    print(f"  - Legacy f-string (Playwright):   {legacy_time * 1000:8.1f}ms  ({num_cases / legacy_time:,.0f} cases/s)")
+    print(f"  - Precompiled (Playwright):       {template_time * 1000:8.1f}ms  ({num_cases / template_time:,.0f} cases/s)")
+    print(f"  - Output identical:               {legacy_script == template_script}")
+
+    for framework in list_frameworks():
+        elapsed, _ = best_of(render_with_template, framework["name"], test_plan, "Claude-3")
+        print(f"  - {framework['name']:<32}{elapsed * 1000:8.1f}ms  ({num_cases / elapsed:,.0f} cases/s)")
+
+
+if __name__ == "__main__":
+    main()
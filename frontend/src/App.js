@@ -1,14 +1,15 @@
 import React, { useState, useCallback } from 'react';
 import { RefreshCw, Play, Upload, GitBranch, Zap, Cpu, Settings, DollarSign, Briefcase } from 'lucide-react';
-import axios from 'axios';
 import CostCalculator from './CostCalculator';
 import SalesCoach from './SalesCoach';
 
 // === DATA MOCKING & CONSTANTS ===
 const AGENT_MODELS = ['GPT-4 (Simulated)', 'Claude-3 (Simulated)', 'Gemini (Simulated)', 'Custom LLM (Simulated)'];
-const AUTOMATION_FRAMEWORKS = ['Playwright', 'Selenium', 'Cypress'];
+const AUTOMATION_FRAMEWORKS = ['Playwright', 'Selenium', 'Cypress', 'WebdriverIO'];
 const TEST_TYPES = ['Functional Testing', 'Regression Testing', 'Performance Testing', 'Security/Pen Testing'];
 const REQUIREMENTS_SOURCES = ['Upload Document', 'Connect to Confluence (Simulated)', 'Connect to SharePoint (Simulated)'];
+// Maps server-side pipeline stages (/api/pipeline/stream) to workflow steps
+const PIPELINE_STAGES = { planner: 1, generator: 2, execution: 3, healer: 4 };
 
 const INITIAL_STATE = {
   appName: 'E-Commerce Checkout Service',
@@ -52,28 +53,35 @@ const App = () => {
     });
   }, []);
 
-  const runAgent = useCallback(async (agentIndex, apiEndpoint, requestData) => {
-    const agent = workflow[agentIndex];
-    updateWorkflow(agentIndex, 'RUNNING', `${agent.name} started at ${new Date().toLocaleTimeString()}.`);
-
-    try {
-      const response = await axios.post(apiEndpoint, requestData);
-      const result = response.data;
+  // Reads the Server-Sent Events stream returned by /api/pipeline/stream
+  const streamPipeline = useCallback(async (requestData, onEvent) => {
+    const response = await fetch('/api/pipeline/stream', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(requestData),
+    });
+    if (!response.ok) {
+      throw new Error(`Pipeline request failed with status ${response.status}`);
+    }
 
-      if (result.status === 'success') {
-        updateWorkflow(agentIndex, 'COMPLETE', `${agent.name} complete. ${result.message}`);
-        return { success: true, data: result.data };
-      } else {
-        updateWorkflow(agentIndex, 'FAILED', `${agent.name} failed: ${result.message}`);
-        setState(prev => ({ ...prev, status: 'FAILED' }));
-        return { success: false };
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const dataLine = rawEvent.split('\n').find(line => line.startsWith('data: '));
+        if (dataLine) onEvent(JSON.parse(dataLine.slice(6)));
       }
-    } catch (error) {
-      updateWorkflow(agentIndex, 'FAILED', `${agent.name} error: ${error.message}`);
-      setState(prev => ({ ...prev, status: 'FAILED' }));
-      return { success: false };
     }
-  }, [workflow, updateWorkflow]);
+  }, []);
 
   // === MAIN WORKFLOW ===
   const startWorkflow = async () => {
@@ -97,47 +105,49 @@ const App = () => {
     await new Promise(resolve => setTimeout(resolve, 1500));
     updateWorkflow(0, 'COMPLETE', 'Perception Agent: Vectorized 15 docs, extracted 3 tables. Ready for planning.');
 
-    // 2. Planner Agent (API Call)
-    const plannerResult = await runAgent(1, '/api/planner', {
-      appName: state.appName,
-      appType: state.appType,
-      testUrl: state.testUrl,
-      scope: state.scope,
-      testTypes: Array.from(state.testTypes),
-      reasoningModel: state.reasoningModel,
-    });
-    if (!plannerResult.success) return;
+    // 2-5. Planner → Generator → Execution → Healer (one server-side pipeline run)
+    let healerSummary = null;
+    let failed = false;
 
-    // 3. Generator Agent (API Call)
-    const generatorResult = await runAgent(2, '/api/generator', {
-      testPlan: plannerResult.data.testPlan,
-      automationFramework: state.automationFramework,
-      generationModel: state.generationModel,
-    });
-    if (!generatorResult.success) return;
-
-    // 4. Execution Agent (Simulated locally)
-    updateWorkflow(3, 'RUNNING', 'Execution Agent: Running tests...');
-    await new Promise(resolve => setTimeout(resolve, 3000));
-    const executionResult = Math.random() > 0.3
-      ? 'Tests PASSED: 4/5 tests passed. One failure detected due to CSS selector change.'
-      : 'Tests FAILED: 5/5 tests failed. Environment issue suspected.';
-    updateWorkflow(3, 'COMPLETE', `Execution Agent: ${executionResult}`);
-
-    // 5. Healer Agent (API Call)
-    const healerResult = await runAgent(4, '/api/healer', {
-      testScript: generatorResult.data.testScript,
-      executionResult: executionResult,
-      automationFramework: state.automationFramework,
-    });
+    try {
+      await streamPipeline({
+        appName: state.appName,
+        appType: state.appType,
+        testUrl: state.testUrl,
+        scope: state.scope,
+        testTypes: Array.from(state.testTypes),
+        reasoningModel: state.reasoningModel,
+        automationFramework: state.automationFramework,
+        generationModel: state.generationModel,
+      }, (event) => {
+        const agentIndex = PIPELINE_STAGES[event.stage];
+        const agentName = agentIndex !== undefined ? workflow[agentIndex].name : null;
+
+        if (event.event === 'stage_started') {
+          updateWorkflow(agentIndex, 'RUNNING', `${agentName} started at ${new Date().toLocaleTimeString()}.`);
+        } else if (event.event === 'stage_completed') {
+          updateWorkflow(agentIndex, 'COMPLETE', `${agentName} complete. ${event.result.message}`);
+          if (event.stage === 'healer') healerSummary = event.result.data.summary;
+        } else if (event.event === 'stage_failed') {
+          updateWorkflow(agentIndex, 'FAILED', `${agentName} failed: ${event.error}`);
+          failed = true;
+        }
+      });
+    } catch (error) {
+      updateWorkflow(1, 'FAILED', `Pipeline error: ${error.message}`);
+      failed = true;
+    }
 
-    if (healerResult.success) {
-      setState(prev => ({
-        ...prev,
-        status: 'COMPLETE',
-        finalReport: `Workflow Finished. ${healerResult.data.summary}`
-      }));
+    if (failed || healerSummary === null) {
+      setState(prev => ({ ...prev, status: 'FAILED' }));
+      return;
     }
+
+    setState(prev => ({
+      ...prev,
+      status: 'COMPLETE',
+      finalReport: `Workflow Finished. ${healerSummary}`
+    }));
   };
 
   const handleConfigChange = (field, value) => {
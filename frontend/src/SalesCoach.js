@@ -255,41 +255,46 @@ const SalesCoach = () => {
   // Individual agent cost calculation
   const [agentCosts, setAgentCosts] = useState({});
 
-  // Calculate individual agent cost (LLM only)
-  const calculateAgentCost = async (agentId, config) => {
-    try {
-      const response = await axios.post('/api/cost/calculate-agent', {
+  // Calculate every agent's cost (LLM only) in one request
+  const updateAgentCosts = async () => {
+    const agents = {};
+    Object.keys(agentConfigs).forEach(agentId => {
+      const config = agentConfigs[agentId];
+      agents[agentId] = {
         llm_model: config.llm,
         deployment_type: config.deployment_type || 'cloud_api',
+        avg_tokens_per_request: config.avg_tokens_per_request || 5000
+      };
+    });
+
+    try {
+      const response = await axios.post('/api/cost/calculate-agents', {
+        agents,
         num_users: globalParams.num_users,
         queries_per_user_per_month: globalParams.assessments_per_user_per_month,
-        avg_tokens_per_request: config.avg_tokens_per_request || 5000,
         cache_hit_rate: 0.70,
         use_prompt_caching: true
       });
 
-      return response.data.agent_llm_cost_monthly;
+      const costs = {};
+      Object.keys(response.data.agents).forEach(agentId => {
+        costs[agentId] = response.data.agents[agentId].agent_llm_cost_monthly;
+      });
+      setAgentCosts(costs);
     } catch (error) {
-      console.error(`Error calculating cost for ${agentId}:`, error);
-      return 0;
-    }
-  };
-
-  // Update agent cost when configuration changes
-  const updateAgentCost = async (agentId) => {
-    const config = agentConfigs[agentId];
-    if (config) {
-      const cost = await calculateAgentCost(agentId, config);
-      setAgentCosts(prev => ({ ...prev, [agentId]: cost }));
+      console.error('Error calculating agent costs:', error);
+      const costs = {};
+      Object.keys(agents).forEach(agentId => {
+        costs[agentId] = 0;
+      });
+      setAgentCosts(costs);
     }
   };
 
   // Calculate costs when agent configs or global params change
   useEffect(() => {
     const timer = setTimeout(() => {
-      Object.keys(agentConfigs).forEach(agentId => {
-        updateAgentCost(agentId);
-      });
+      updateAgentCosts();
     }, 500); // Debounce to avoid too many API calls
 
     return () => clearTimeout(timer);
@@ -523,13 +528,7 @@ const SalesCoach = () => {
         [field]: value
       }
     }));
-    
-    // Trigger cost recalculation for this agent when LLM or other key parameters change
-    if (['llm', 'deployment_type', 'memory_type', 'avg_tokens_per_request'].includes(field)) {
-      setTimeout(() => {
-        updateAgentCost(activeAgent);
-      }, 100); // Small delay to ensure state is updated
-    }
+    // Agent costs are recalculated by the debounced effect on agentConfigs
   };
 
   const handleToolToggle = (tool) => {
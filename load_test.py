@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Reproducible load test for the QA AI Agent API
+
+Replays a fixed request corpus against the FastAPI app in-process (through
+the full middleware and routing stack, no network) in deterministic mode
+(QA_AGENT_SEED), and reports requests/second and p50/p95/p99 latency per
+endpoint. Simulated think times are scaled down so a run takes seconds.
+
+The corpus, the seed and the request order are fixed, so two runs on the
+same commit do the same work. Save a run with --output and compare a later
+commit against it with --baseline: the script exits with status 1 if any
+endpoint's p95 regressed by more than --max-regression.
+
+Usage:
+    python load_test.py [--requests 30] [--concurrency 16] [--seed 42]
+                        [--think-scale 0.05] [--output run.json]
+                        [--baseline run.json] [--max-regression 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+APPS = [
+    ("E-Commerce Checkout", "Web App", "https://shop.example.com", "Checkout and payment flow"),
+    ("Banking Portal", "Web App", "https://bank.example.com", "Login, transfers and statements"),
+    ("Travel Booking", "Mobile Web", "https://travel.example.com", "Search, booking and cancellation"),
+    ("HR Self-Service", "Web App", "https://hr.example.com", "Leave requests and payslips"),
+]
+TEST_TYPES = [["Functional Testing"], ["Functional Testing", "Regression Testing"],
+              ["Security/Pen Testing", "Performance Testing"]]
+FRAMEWORKS = ["Playwright", "Selenium", "Cypress", "WebdriverIO"]
+MODELS = ["GPT-4 (Simulated)", "Claude-3 (Simulated)"]
+
+EXECUTION_RESULTS = [
+    "Tests PASSED: 4/5 tests passed. One failure detected due to CSS selector change.",
+    "Tests FAILED: 5/5 tests failed. Environment issue suspected.",
+    "\n".join([
+        "PASS checkout > add to cart",
+        "FAIL checkout > apply coupon",
+        "  Error: locator('#old-login-btn') not found: element not found",
+        "FAIL checkout > pay",
+        "  TimeoutError: waiting for selector '.pay-button' exceeded 30000ms",
+        "PASS checkout > confirm",
+    ]),
+]
+HEALER_SCRIPT = "await page.click('#old-login-btn');\nawait page.fill('#user-email', 'qa@example.com');"
+CLASSIFY_LOG = "\n".join(
+    f"PASS suite > case {i}" if i % 4 else f"FAIL suite > case {i}\n  AssertionError: expected 200 got 500"
+    for i in range(400)
+) + "\n"
+
+
+def build_corpus(requests_per_endpoint: int, seed: int):
+    """Fixed list of (endpoint, method, path, json_body, raw_body), interleaved across endpoints"""
+    import random
+    from app.models import PlannerRequest
+    from app.routers.planner import build_test_plan
+
+    per_endpoint = {}
+
+    def add(endpoint, method, path, body=None, content=None):
+        per_endpoint.setdefault(endpoint, []).append((endpoint, method, path, body, content))
+
+    for i in range(requests_per_endpoint):
+        app_name, app_type, url, scope = APPS[i % len(APPS)]
+        planner_body = {
+            "appName": app_name, "appType": app_type, "testUrl": url, "scope": f"{scope} #{i % 7}",
+            "testTypes": TEST_TYPES[i % len(TEST_TYPES)], "reasoningModel": MODELS[i % len(MODELS)],
+        }
+        plan = build_test_plan(PlannerRequest(**planner_body), random.Random(seed + i))
+
+        add("planner", "POST", "/api/planner", planner_body)
+        add("generator", "POST", "/api/generator", {
+            "testPlan": plan, "automationFramework": FRAMEWORKS[i % len(FRAMEWORKS)],
+            "generationModel": MODELS[(i + 1) % len(MODELS)],
+        })
+        add("healer", "POST", "/api/healer", {
+            "testScript": HEALER_SCRIPT, "executionResult": EXECUTION_RESULTS[i % len(EXECUTION_RESULTS)],
+            "automationFramework": FRAMEWORKS[i % len(FRAMEWORKS)],
+        })
+        add("healer/classify", "POST", "/api/healer/classify", content=CLASSIFY_LOG.encode())
+        add("pipeline", "POST", "/api/pipeline", {
+            **planner_body, "automationFramework": FRAMEWORKS[i % len(FRAMEWORKS)],
+            "generationModel": MODELS[(i + 1) % len(MODELS)],
+        })
+        add("cost/calculate", "POST", "/api/cost/calculate", {
+            "service_tier": ["basic", "standard", "premium"][i % 3],
+            "deployment_type": ["cloud_api", "on_premise"][i % 2],
+            "num_users": 50 + 25 * (i % 8),
+        })
+        add("cost/calculate-agent", "POST", "/api/cost/calculate-agent", {
+            "llm_model": ["gpt-4o", "claude-3-5-haiku", "gpt-4o-mini"][i % 3], "num_users": 100 + i,
+        })
+
+    # Round-robin across endpoints so every endpoint sees the same mix of load
+    corpus = []
+    for i in range(requests_per_endpoint):
+        for requests in per_endpoint.values():
+            corpus.append(requests[i])
+    return corpus
+
+
+async def replay(corpus, concurrency: int):
+    """Send the corpus with `concurrency` closed-loop workers; returns per-endpoint timings"""
+    import httpx
+    from app.main import app
+
+    timings = {}
+    next_index = iter(range(len(corpus)))
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+
+            async def worker():
+                for index in next_index:
+                    endpoint, method, path, body, content = corpus[index]
+                    started = time.perf_counter()
+                    try:
+                        response = await client.request(method, path, json=body, content=content)
+                        ok = response.status_code < 400
+                    except Exception:
+                        ok = False
+                    finished = time.perf_counter()
+                    timings.setdefault(endpoint, []).append((started, finished, ok))
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+
+    return timings, elapsed
+
+
+def summarize(timings):
+    from app.resilience import percentile
+
+    results = {}
+    for endpoint, samples in timings.items():
+        latencies = [finished - started for started, finished, _ in samples]
+        window = max(finished for _, finished, _ in samples) - min(started for started, _, _ in samples)
+        results[endpoint] = {
+            "requests": len(samples),
+            "errors": sum(1 for *_, ok in samples if not ok),
+            "rps": round(len(samples) / window, 2) if window else 0.0,
+            "p50Ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95Ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99Ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+    return results
+
+
+def compare(results, baseline, max_regression: float):
+    """Endpoints whose p95 got worse than the baseline by more than max_regression (and 1ms)"""
+    regressions = []
+    for endpoint, current in results.items():
+        previous = baseline.get("endpoints", {}).get(endpoint)
+        if not previous or not previous["p95Ms"]:
+            continue
+        change = (current["p95Ms"] - previous["p95Ms"]) / previous["p95Ms"]
+        if change > max_regression and current["p95Ms"] - previous["p95Ms"] > 1.0:
+            regressions.append((endpoint, previous["p95Ms"], current["p95Ms"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=30, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--think-scale", type=float, default=0.05, help="multiplier for simulated think times")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 increase (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Deterministic, self-contained run: seeded draws, no hedging (timing-dependent),
+    # in-memory failure index, simulated LLM backend
+    os.environ["QA_AGENT_SEED"] = str(args.seed)
+    os.environ["QA_AGENT_LLM_HEDGING"] = "0"
+    os.environ["QA_AGENT_FAILURE_INDEX"] = ""
+    os.environ.setdefault("QA_AGENT_LLM_BACKEND", "simulated")
+
+    import app.agent_runtime as runtime
+    for agent, (low, high) in list(runtime.AGENT_THINK_TIME.items()):
+        runtime.AGENT_THINK_TIME[agent] = (low * args.think_scale, high * args.think_scale)
+
+    corpus = build_corpus(args.requests, args.seed)
+
+    print("=" * 80)
+    print(f"LOAD TEST: {len(corpus)} requests, concurrency {args.concurrency}, seed {args.seed}, "
+          f"think time x{args.think_scale}")
+    print("=" * 80)
+
+    timings, elapsed = asyncio.run(replay(corpus, args.concurrency))
+    results = summarize(timings)
+
+    print(f"{'endpoint':<24}{'requests':>9}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, r in results.items():
+        print(f"{endpoint:<24}{r['requests']:>9}{r['errors']:>8}{r['rps']:>10.1f}"
+              f"{r['p50Ms']:>10.1f}{r['p95Ms']:>10.1f}{r['p99Ms']:>10.1f}")
+    print(f"  - Total: {len(corpus)} requests in {elapsed:.2f}s ({len(corpus) / elapsed:.1f} req/s)")
+
+    report = {
+        "seed": args.seed,
+        "requestsPerEndpoint": args.requests,
+        "concurrency": args.concurrency,
+        "thinkScale": args.think_scale,
+        "elapsedSeconds": round(elapsed, 3),
+        "endpoints": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"  - Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        for endpoint, before, after, change in regressions:
+            print(f"  ! p95 regression on {endpoint}: {before:.1f}ms -> {after:.1f}ms (+{change:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"  - No p95 regression above {args.max_regression:.0%} against {args.baseline}")
+
+    if any(r["errors"] for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()